@@ -10,7 +10,7 @@ import io
 
 import qrcode
 
-from pydglab_ws import FeedbackButton, Channel, RetCode, DGLabWSServer
+from pydglab_ws import FeedbackButton, Channel, RetCode, DGLabWSServer, PreparedPulses
 
 PULSE_DATA = {
     '呼吸': [
@@ -136,6 +136,11 @@ PULSE_DATA = {
     ]
 }
 
+# 预先编码波形数据，每份复制 5 份，以维持一段时间，之后每次发送不再重复编码
+PREPARED_PULSE_DATA = {
+    name: PreparedPulses(*(pulses * 5)) for name, pulses in PULSE_DATA.items()
+}
+
 
 def print_qrcode(data: str):
     """输出二维码到终端界面"""
@@ -160,7 +165,7 @@ async def main():
         print(f"已与 App {client.target_id} 成功绑定")
 
         # 从 App 接收数据更新，并进行远控操作
-        pulse_data_iterator = iter(PULSE_DATA.values())
+        pulse_data_iterator = iter(PREPARED_PULSE_DATA.values())
         async for data in client.data_generator(FeedbackButton, RetCode):
             # 接收 App 反馈按钮
             if isinstance(data, FeedbackButton):
@@ -172,9 +177,9 @@ async def main():
                     pulse_data_current = next(pulse_data_iterator, None)    # 当前准备发送的波形
                     # 如果波形都发送过了，则开始新一轮的发送
                     if not pulse_data_current:
-                        pulse_data_iterator = iter(PULSE_DATA.values())
+                        pulse_data_iterator = iter(PREPARED_PULSE_DATA.values())
                         continue
-                    await client.add_pulses(Channel.A, *(pulse_data_current * 5))   # 复制 5 份，以维持一段时间
+                    await client.add_pulses(Channel.A, pulse_data_current)
 
             # 接收 心跳 / App 断开通知
             elif data == RetCode.CLIENT_DISCONNECTED:
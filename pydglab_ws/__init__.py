@@ -1,7 +1,10 @@
 from .client import *
+from .codec import *
 from .enums import *
 from .exceptions import *
+from .log import *
 from .models import *
+from .pulse import *
 from .server import *
 from .typing import *
 from .utils import *
@@ -1,4 +1,13 @@
 from .base import *
+from .batch import *
 from .connect import *
+from .dispatcher import *
+from .latency import *
 from .local import *
+from .pool import *
+from .reconnect import *
+from .pulse_queue import *
+from .ramp import *
+from .state import *
+from .sync import *
 from .ws import *
@@ -1,18 +1,49 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, AsyncGenerator, Any, Union, Dict, Callable, Literal, Type, TypeVar
+from typing import Optional, AsyncGenerator, Any, Union, Dict, Callable, Literal, Type, TypeVar, Tuple, Iterable, \
+    AsyncIterable, List
 
 from pydantic import UUID4
 
-from ..enums import MessageDataHead, RetCode, StrengthOperationType, Channel, FeedbackButton, MessageType
-from ..models import StrengthData
+from .batch import DGLabBatch
+from .dispatcher import DGLabDispatcher
+from .latency import ClientLatency
+from .pulse_queue import PulseQueueModel
+from .ramp import StrengthRampEngine
+from .state import ChannelStateTracker
+from ..enums import MessageDataHead, RetCode, StrengthOperationType, Channel, FeedbackButton, MessageType, \
+    DispatchQueue, RampCurve
+from ..log import EventLogger
+from ..models import StrengthData, StrengthRecord
 from ..models import WebSocketMessage
+from ..pulse import PulseArray, PreparedPulses
 from ..typing import PulseOperation
-from ..utils import dg_lab_client_qrcode, parse_strength_data, parse_feedback_data, dump_strength_operation, \
-    dump_add_pulses, dump_clear_pulses
+from ..utils import dg_lab_client_qrcode, parse_strength_record, parse_feedback_data, dump_strength_operation, \
+    dump_add_pulses, dump_clear_pulses, PULSE_QUEUE_MAX_LENGTH, PULSE_OPERATION_DURATION, pulse_data_max_length, \
+    dump_add_pulses_chunks, _pulses_length
 
 __all__ = ["DGLabClient"]
 
-_DataType = TypeVar("_DataType", Type[StrengthData], Type[FeedbackButton], Type[RetCode])
+_log = EventLogger("pydglab_ws.client")
+
+_DataType = TypeVar("_DataType", Type[StrengthRecord], Type[StrengthData], Type[FeedbackButton], Type[RetCode])
+
+_DATA_TYPE_TO_QUEUES: Dict[type, Tuple[DispatchQueue, ...]] = {
+    StrengthData: (DispatchQueue.STRENGTH,),
+    FeedbackButton: (DispatchQueue.FEEDBACK,),
+    RetCode: (DispatchQueue.HEARTBEAT, DispatchQueue.BREAK, DispatchQueue.RET_CODE)
+}
+"""数据类型到消息分发器队列的映射"""
+_DATA_QUEUES = tuple(queue for queues in _DATA_TYPE_TO_QUEUES.values() for queue in queues)
+_DATA_TYPE_ALIASES: Dict[type, type] = {StrengthRecord: StrengthData}
+"""作为目标类型时等同的数据类型，``StrengthRecord`` 与 ``StrengthData`` 都表示强度数据"""
+
+
+async def _async_iterator(iterable: Iterable[PulseOperation]) -> AsyncGenerator[PulseOperation, Any]:
+    """将同步的可迭代对象包装为异步迭代器"""
+    for item in iterable:
+        yield item
 
 
 class DGLabClient(ABC):
@@ -38,6 +69,13 @@ class DGLabClient(ABC):
             MessageType.BREAK: self._handle_break,
             MessageType.HEARTBEAT: self._handle_heartbeat
         }
+        self._dispatcher: Optional[DGLabDispatcher] = None
+        self._channel_state = ChannelStateTracker()
+        self._pulse_queue = PulseQueueModel()
+        self._latency = ClientLatency()
+        self._strength_sent_at: Optional[float] = None
+        self._ramp = StrengthRampEngine(self)
+        self._strength_records = False
 
     @property
     def client_id(self) -> Optional[UUID4]:
@@ -59,6 +97,56 @@ class DGLabClient(ABC):
         """终端是否未完成与 App 的绑定"""
         return self._client_id is None or self.target_id is None
 
+    @property
+    def dispatcher(self) -> Optional[DGLabDispatcher]:
+        """正在运行的消息分发器，未启动时为 ``None``"""
+        if self._dispatcher is not None and self._dispatcher.running:
+            return self._dispatcher
+        return None
+
+    @property
+    def channel_state(self) -> ChannelStateTracker:
+        """
+        通道状态记录器，记录 App 确认的通道强度、强度上限和尚未发送的强度操作
+
+        设置 ``channel_state.enabled = True`` 后，:meth:`set_strength` 将跳过不会改变通道强度的操作，
+        并合并被后续操作覆盖的操作，可通过 ``channel_state.stats`` 获取统计
+        """
+        return self._channel_state
+
+    @property
+    def pulse_queue(self) -> PulseQueueModel:
+        """App 波形队列的本地模型，可估算各通道波形队列中剩余的数据量"""
+        return self._pulse_queue
+
+    @property
+    def ramp(self) -> StrengthRampEngine:
+        """强度渐变引擎，可通过 ``ramp.max_rate`` 设置每秒最多发送的刷新次数"""
+        return self._ramp
+
+    @property
+    def latency(self) -> ClientLatency:
+        """
+        终端的延迟估计，包含 WebSocket ping/pong 往返延迟（通过 :meth:`probe_latency` 采样）
+        和从发送强度操作到收到 App 返回的强度数据的往返延迟（发送强度操作时自动采样）
+        """
+        return self._latency
+
+    @property
+    def strength_records(self) -> bool:
+        """
+        收到的强度数据是否为 [`StrengthRecord`][pydglab_ws.models.StrengthRecord]，默认为 ``False``
+
+        默认情况下 :meth:`recv_data`、:meth:`data_generator` 等方法返回的强度数据为
+        [`StrengthData`][pydglab_ws.models.StrengthData]；设置为 ``True`` 后直接返回解析时缓存的不可变元组，
+        省去每条强度数据创建 Pydantic 模型的开销
+        """
+        return self._strength_records
+
+    @strength_records.setter
+    def strength_records(self, value: bool):
+        self._strength_records = value
+
     @abstractmethod
     async def _recv(self) -> WebSocketMessage:
         """
@@ -75,6 +163,28 @@ class DGLabClient(ABC):
         """
         ...
 
+    async def _ping(self) -> Optional[float]:
+        """
+        测量与 WebSocket 服务端之间的往返延迟
+
+        :return: 往返延迟（秒），不支持时返回 ``None``
+        """
+        return None
+
+    async def probe_latency(self, timeout: float = None) -> Optional[float]:
+        """
+        测量一次与 WebSocket 服务端之间的 ping/pong 往返延迟，并记录到 :attr:`latency` 中
+
+        本地终端不经过网络，因此不进行测量
+
+        :param timeout: 超时时间（秒）
+        :raise asyncio.TimeoutError: 等待 pong 超时
+        :return: 往返延迟（秒），不支持时返回 ``None``
+        """
+        if (sample := await asyncio.wait_for(self._ping(), timeout)) is not None:
+            self._latency.ping.add(sample)
+        return sample
+
     def get_qrcode(self, uri: str) -> Optional[str]:
         """
         终端二维码，二维码图像需要自行生成
@@ -91,9 +201,10 @@ class DGLabClient(ABC):
         """
         与 :meth:`_recv` 类似，但只接收目标为自身终端的消息
         """
-        message = await self._recv()
-        if message.client_id == self._client_id:
-            return message
+        while True:
+            message = await self._recv()
+            if message.client_id == self._client_id:
+                return message
 
     async def _send_owned(self, msg_type: MessageType, msg: str):
         """
@@ -110,8 +221,47 @@ class DGLabClient(ABC):
         )
         await self._send(message)
 
+    async def _send_owned_many(self, messages: List[Tuple[MessageType, str]]):
+        """
+        按顺序发送多条消息，代为设置 ``client_id``, ``target_id``
+
+        :param messages: 每条消息的 :attr:`WebSocketMessage.type` 与 :attr:`WebSocketMessage.message`
+        """
+        for msg_type, msg in messages:
+            await self._send_owned(msg_type, msg)
+
+    def _handle_message(
+            self,
+            message: WebSocketMessage
+    ) -> Optional[Union[StrengthData, StrengthRecord, FeedbackButton, RetCode]]:
+        """
+        按消息类型处理消息，收到强度数据时更新通道状态
+
+        :raise InvalidStrengthData: [`InvalidStrengthData`][pydglab_ws.exceptions.InvalidStrengthData]
+        :raise InvalidFeedbackData: [`InvalidFeedbackData`][pydglab_ws.exceptions.InvalidFeedbackData]
+        """
+        handler = self._message_type_to_handler.get(message.type)
+        if handler is None:
+            return None
+        result = handler(message)
+        if isinstance(result, StrengthRecord):
+            self._on_strength(result)
+            return self._strength_result(result)
+        return result
+
+    def _on_strength(self, data: StrengthRecord):
+        """收到强度数据时更新通道状态和强度操作的往返延迟"""
+        self._channel_state.update(data)
+        if self._strength_sent_at is not None:
+            self._latency.strength.add(time.monotonic() - self._strength_sent_at)
+            self._strength_sent_at = None
+
+    def _strength_result(self, data: StrengthRecord) -> Union[StrengthData, StrengthRecord]:
+        """交给调用方的强度数据，未设置 :attr:`strength_records` 时转换为 ``StrengthData``"""
+        return data if self._strength_records else data.to_model()
+
     @staticmethod
-    def _handle_msg(message: WebSocketMessage) -> Optional[Union[StrengthData, FeedbackButton, RetCode]]:
+    def _handle_msg(message: WebSocketMessage) -> Optional[Union[StrengthRecord, FeedbackButton, RetCode]]:
         """
         处理类型为 ``msg`` 的消息
 
@@ -120,16 +270,34 @@ class DGLabClient(ABC):
         """
         if isinstance(message.message, str):
             if message.message.startswith(MessageDataHead.STRENGTH.value):
-                return parse_strength_data(message.message)
+                return parse_strength_record(message.message)
             elif message.message.startswith(MessageDataHead.FEEDBACK.value):
                 return parse_feedback_data(message.message)
         elif isinstance(message.message, RetCode):
+            _log.warning(
+                "client.ret_code",
+                "Received response code %s",
+                message.message,
+                client_id=message.client_id,
+                target_id=message.target_id,
+                ret_code=message.message
+            )
             return message.message
         return None
 
     @staticmethod
     def _handle_break(message: WebSocketMessage) -> Optional[Literal[RetCode.CLIENT_DISCONNECTED]]:
         """处理类型为 ``break`` 的消息"""
+        _log.warning(
+            "client.break",
+            "Binding between %s and %s broken: %s",
+            message.client_id,
+            message.target_id,
+            message.message,
+            client_id=message.client_id,
+            target_id=message.target_id,
+            ret_code=message.message
+        )
         return message.message
 
     @staticmethod
@@ -142,9 +310,16 @@ class DGLabClient(ABC):
         从 WebSocket 服务端中获取 ``client_id`` 并保存
         """
         while self.not_registered:
-            message = await self._recv()
+            if dispatcher := self.dispatcher:
+                message = await dispatcher.get(
+                    DispatchQueue.BIND,
+                    predicate=lambda x: x.message == MessageDataHead.TARGET_ID
+                )
+            else:
+                message = await self._recv()
             if message.type == MessageType.BIND and message.message == MessageDataHead.TARGET_ID:
                 self._client_id = message.client_id
+                _log.info("client.register", "Registered as %s", self._client_id, client_id=self._client_id)
 
     async def ensure_bind(self):
         """确保终端已完成与 App 的绑定"""
@@ -162,10 +337,33 @@ class DGLabClient(ABC):
         :return: 响应码
         """
         while self.not_bind:
-            message = await self._recv_owned()
+            if dispatcher := self.dispatcher:
+                message = await dispatcher.get(
+                    DispatchQueue.BIND,
+                    predicate=lambda x: isinstance(x.message, RetCode)
+                )
+            else:
+                message = await self._recv_owned()
             if message.type == MessageType.BIND and isinstance(message.message, RetCode):
                 if message.message == RetCode.SUCCESS:
                     self._target_id = message.target_id
+                    _log.info(
+                        "client.bind",
+                        "Bound %s to %s",
+                        self._client_id,
+                        self._target_id,
+                        client_id=self._client_id,
+                        target_id=self._target_id
+                    )
+                else:
+                    _log.warning(
+                        "client.bind_failed",
+                        "Failed to bind %s: %s",
+                        self._client_id,
+                        message.message,
+                        client_id=self._client_id,
+                        ret_code=message.message
+                    )
                 return message.message
 
     async def rebind(self) -> RetCode:
@@ -174,20 +372,17 @@ class DGLabClient(ABC):
         :return: 响应码
         """
         self._target_id = None
-        while self.not_bind:
-            message = await self._recv_owned()
-            if message.type == MessageType.BIND and isinstance(message.message, RetCode):
-                if message.message == RetCode.SUCCESS:
-                    self._target_id = message.target_id
-                return message.message
+        self._channel_state.reset()
+        return await self.bind()
 
-    async def recv_data(self) -> Union[StrengthData, FeedbackButton, RetCode]:
+    async def recv_data(self) -> Union[StrengthData, StrengthRecord, FeedbackButton, RetCode]:
         """
         获取 WebSocket 服务端的数据
 
         注意，获取到的是队列中最早的数据，可能不是最新的
 
-        :return: 可能为 **强度数据** - [`StrengthData`][pydglab_ws.models.StrengthData]、 \
+        :return: 可能为 **强度数据** - [`StrengthData`][pydglab_ws.models.StrengthData] \
+            （设置 :attr:`strength_records` 后为 [`StrengthRecord`][pydglab_ws.models.StrengthRecord]）、 \
             **App 反馈数据** - [`FeedbackButton`][pydglab_ws.enums.FeedbackButton]、 \
             **心跳** - [`RetCode.SUCCESS`][pydglab_ws.enums.RetCode.SUCCESS]、 \
             **App 断开连接** - [`RetCode.CLIENT_DISCONNECTED`][pydglab_ws.enums.RetCode.CLIENT_DISCONNECTED]、\
@@ -196,12 +391,57 @@ class DGLabClient(ABC):
         :raise InvalidFeedbackData: [`InvalidFeedbackData`][pydglab_ws.exceptions.InvalidFeedbackData]
         """
         await self.ensure_bind()
+        if dispatcher := self.dispatcher:
+            return await dispatcher.get(*_DATA_QUEUES)
+        return await self._recv_data(())
+
+    async def _recv_data(
+            self,
+            targets: Tuple[type, ...]
+    ) -> Union[StrengthData, StrengthRecord, FeedbackButton, RetCode]:
+        """
+        未启动消息分发器时，直接接收下一条目标类型的数据，其他数据将被丢弃
+
+        子类可以重写该方法，在完整解析消息之前跳过不需要的消息
+
+        :param targets: 目标类型，为空时不进行限制
+        """
         while True:
-            message = await self._recv_owned()
-            handler = self._message_type_to_handler.get(message.type)
-            if handler and (result := handler(message)) is not None:
+            message = await self._recv()
+            if (result := self._accept_message(message, targets)) is not None:
                 return result
 
+    def _accept_message(
+            self,
+            message: WebSocketMessage,
+            targets: Tuple[type, ...]
+    ) -> Optional[Union[StrengthData, StrengthRecord, FeedbackButton, RetCode]]:
+        """
+        处理未启动消息分发器时收到的消息
+
+        :param targets: 目标类型，为空时不进行限制
+        :return: 目标类型的数据，其他消息返回 ``None``
+        """
+        if message.client_id != self._client_id:
+            return None
+        if message.type == MessageType.BIND and isinstance(message.message, RetCode):
+            # 自动重连后 App 重新绑定
+            if self.not_bind and message.message == RetCode.SUCCESS:
+                self._target_id = message.target_id
+                _log.info(
+                    "client.bind",
+                    "Bound %s to %s",
+                    self._client_id,
+                    self._target_id,
+                    client_id=self._client_id,
+                    target_id=self._target_id
+                )
+            return None
+        result = self._handle_message(message)
+        if result is not None and (not targets or _DATA_TYPE_ALIASES.get(type(result), type(result)) in targets):
+            return result
+        return None
+
     async def data_generator(
             self,
             *targets: _DataType,
@@ -216,15 +456,107 @@ class DGLabClient(ABC):
         async for data in client.data_generator(StrengthData, FeedbackButton):
             print(f"Got data from App: {data}")
         ```
-        :param targets: 目标类型，只有为目标类型的数据会被返回，为空即默认值时则不进行限制
-        :return: 可能为 **强度数据** - [`StrengthData`][pydglab_ws.models.StrengthData]、 \
+        :param targets: 目标类型，只有为目标类型的数据会被返回，为空即默认值时则不进行限制；
+            传入 ``StrengthData`` 与 ``StrengthRecord`` 相同
+        :return: 可能为 **强度数据** - [`StrengthData`][pydglab_ws.models.StrengthData] \
+            （设置 :attr:`strength_records` 后为 [`StrengthRecord`][pydglab_ws.models.StrengthRecord]）、 \
             **App 反馈数据** - [`FeedbackButton`][pydglab_ws.enums.FeedbackButton] \
             、**心跳** - ``RetCode.SUCCESS``、**App 断开连接** - ``RetCode.CLIENT_DISCONNECTED``
         """
+        targets = tuple(_DATA_TYPE_ALIASES.get(target, target) for target in targets)
+        queues = tuple(
+            queue for data_type, data_queues in _DATA_TYPE_TO_QUEUES.items()
+            if not targets or data_type in targets
+            for queue in data_queues
+        )
         while True:
-            data = await self.recv_data()
-            if not targets or type(data) in targets:
-                yield data
+            await self.ensure_bind()
+            if dispatcher := self.dispatcher:
+                yield await dispatcher.get(*queues)
+            else:
+                # 目标类型传给接收方法，不需要的消息可以不经完整解析直接跳过
+                yield await self._recv_data(targets)
+
+    def start_dispatcher(self, max_queue: int = 2 ** 5) -> DGLabDispatcher:
+        """
+        启动后台消息分发器 [`DGLabDispatcher`][pydglab_ws.client.dispatcher.DGLabDispatcher]
+
+        启动后，:meth:`register`, :meth:`bind`, :meth:`recv_data`, :meth:`data_generator`
+        等方法都将从分发器的队列中获取数据，多个消费者可以并发等待不同类型的数据
+
+        :param max_queue: 每个队列的最大长度
+        :return: 消息分发器，若已在运行则返回正在运行的分发器
+        """
+        if dispatcher := self.dispatcher:
+            return dispatcher
+        self._dispatcher = DGLabDispatcher(self, max_queue)
+        self._dispatcher.start()
+        return self._dispatcher
+
+    async def stop_dispatcher(self):
+        """停止后台消息分发器，队列中未被取出的数据将被丢弃"""
+        if self._dispatcher is not None:
+            await self._dispatcher.stop()
+            self._dispatcher = None
+
+    async def close(self):
+        """
+        停止终端的后台任务，包括强度渐变和消息分发器
+
+        尚未完成的渐变结果为 ``False``，分发器队列中未被取出的数据将被丢弃
+        """
+        await self._ramp.stop()
+        await self.stop_dispatcher()
+
+    async def wait_for_strength(self, timeout: float = None) -> Union[StrengthData, StrengthRecord]:
+        """
+        等待下一条强度数据
+
+        未启动消息分发器时，将直接从消息队列中接收数据，期间收到的其他数据将被丢弃
+
+        :param timeout: 超时时间（秒）
+        :raise asyncio.TimeoutError: 等待超时
+        """
+        return await asyncio.wait_for(self._wait_for(StrengthData), timeout)
+
+    async def wait_for_feedback(self, *buttons: FeedbackButton, timeout: float = None) -> FeedbackButton:
+        """
+        等待 App 反馈按钮被按下
+
+        未启动消息分发器时，将直接从消息队列中接收数据，期间收到的其他数据将被丢弃
+
+        :param buttons: 目标按钮，为空时等待任意按钮
+        :param timeout: 超时时间（秒）
+        :raise asyncio.TimeoutError: 等待超时
+        """
+        return await asyncio.wait_for(
+            self._wait_for(FeedbackButton, lambda x: not buttons or x in buttons),
+            timeout
+        )
+
+    async def wait_for_disconnect(self, timeout: float = None) -> Literal[RetCode.CLIENT_DISCONNECTED]:
+        """
+        等待 App 断开连接
+
+        未启动消息分发器时，将直接从消息队列中接收数据，期间收到的其他数据将被丢弃
+
+        :param timeout: 超时时间（秒）
+        :raise asyncio.TimeoutError: 等待超时
+        """
+        return await asyncio.wait_for(
+            self._wait_for(RetCode, lambda x: x == RetCode.CLIENT_DISCONNECTED),
+            timeout
+        )
+
+    async def _wait_for(self, data_type: _DataType, predicate: Callable[[Any], bool] = None) -> Any:
+        """等待满足条件的指定类型数据"""
+        await self.ensure_bind()
+        if dispatcher := self.dispatcher:
+            queues = _DATA_TYPE_TO_QUEUES[_DATA_TYPE_ALIASES.get(data_type, data_type)]
+            return await dispatcher.get(*queues, predicate=predicate)
+        async for data in self.data_generator(data_type):
+            if predicate is None or predicate(data):
+                return data
 
     async def set_strength(
             self,
@@ -238,20 +570,62 @@ class DGLabClient(ABC):
         :param channel: 通道选择
         :param operation_type: 强度变化模式
         :param value: 强度数值，范围在 [0, 200]
-        :return: 若未完成绑定操作，返回 ``False``，否则在发送后返回 ``True``
+        :return: 若未完成绑定操作，返回 ``False``，否则在发送后返回 ``True``；
+            启用了 :attr:`channel_state` 的冗余操作过滤时，被跳过或合并的操作同样返回 ``True``
+        """
+        if self.not_bind:
+            return False
+        await self._channel_state.submit(channel, operation_type, value, self._send_strength_operation)
+        return True
+
+    async def ramp_strength(
+            self,
+            channel: Channel,
+            target: int,
+            duration: float,
+            curve: RampCurve = RampCurve.LINEAR,
+            wait: bool = True
+    ) -> bool:
+        """
+        使通道强度在一段时间内从当前强度渐变到目标强度
+
+        由 :attr:`ramp` 以受限的频率发送 ``SET_TO`` 强度操作，而不是逐个发送每个中间值。
+        同一通道的新渐变会取代尚未完成的渐变，强度不会超过 App 返回的强度上限
+
+        :param channel: 通道选择
+        :param target: 目标强度，范围在 [0, 200]
+        :param duration: 持续时间（秒）
+        :param curve: 渐变曲线
+        :param wait: 是否等待渐变结束
+        :return: 若未完成绑定操作，返回 ``False``；等待时，渐变被取代或取消也返回 ``False``，否则返回 ``True``
+        :raise StrengthUnknown: [`StrengthUnknown`][pydglab_ws.exceptions.StrengthUnknown]，
+            尚未收到 App 的强度数据，也没有发送过 ``SET_TO`` 强度操作，无法确定起始强度
         """
         if self.not_bind:
             return False
+        future = self._ramp.start(channel, target, duration, curve)
+        if not wait:
+            return True
+        return await future
+
+    async def _send_strength_operation(
+            self,
+            channel: Channel,
+            operation_type: StrengthOperationType,
+            value: int
+    ):
+        """发送强度操作，并记录发送时间用于测量往返延迟"""
+        if self._strength_sent_at is None:
+            self._strength_sent_at = time.monotonic()
         await self._send_owned(
             MessageType.MSG,
             dump_strength_operation(channel, operation_type, value)
         )
-        return True
 
     async def add_pulses(
             self,
             channel: Channel,
-            *pulses: PulseOperation
+            *pulses: Union[PulseOperation, PulseArray, PreparedPulses]
     ) -> bool:
         """
         下发波形数据
@@ -262,7 +636,8 @@ class DGLabClient(ABC):
           若后接收到的数据无法全部放入波形队列，多余的部分会丢弃。所以谨慎考虑您的数据长度和数据发送间隔
 
         :param channel: 通道选择
-        :param pulses: 波形操作数据，最大长度为 100
+        :param pulses: 波形操作数据，最大长度为 100，也可以传入单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]、
+            [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
         :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
         :raise PulseDataTooLong: 波形操作数据过长，最大长度应为 [`PULSE_DATA_MAX_LENGTH`][pydglab_ws.utils.PULSE_DATA_MAX_LENGTH]
         :return: 若未完成绑定操作，返回 ``False``，否则在发送后返回 ``True``
@@ -273,8 +648,126 @@ class DGLabClient(ABC):
             MessageType.MSG,
             dump_add_pulses(channel, *pulses)
         )
+        self._pulse_queue.add(channel, _pulses_length(pulses))
         return True
 
+    async def add_pulses_chunked(
+            self,
+            channel: Channel,
+            *pulses: Union[PulseOperation, PulseArray, PreparedPulses]
+    ) -> int:
+        """
+        下发任意长度的波形数据
+
+        根据实际的 ``clientId`` 和 ``targetId`` 计算每条消息可容纳的波形操作数据数量，
+        将波形数据拆分为尽可能少的多条消息，并依次连续发送
+
+        注意 App 中的波形队列最大长度为 500，超出的部分会被丢弃，若需要持续下发更长的波形数据，
+        可使用 :meth:`stream_pulses`
+
+        :param channel: 通道选择
+        :param pulses: 波形操作数据，长度不限，也可以传入单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]、
+            [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
+        :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+        :return: 发送的消息数量，若未完成绑定操作，返回 ``0``
+        """
+        if self.not_bind:
+            return 0
+        messages = dump_add_pulses_chunks(
+            channel,
+            *pulses,
+            max_length=pulse_data_max_length(self._client_id, self._target_id)
+        )
+        for message in messages:
+            await self._send_owned(MessageType.MSG, message)
+        self._pulse_queue.add(channel, _pulses_length(pulses))
+        return len(messages)
+
+    async def stream_pulses(
+            self,
+            channel: Channel,
+            pulses: Union[Iterable[PulseOperation], AsyncIterable[PulseOperation]],
+            lead_time: float = 1.0,
+            interval: float = None,
+            adaptive: bool = False
+    ) -> int:
+        """
+        持续下发波形数据，使 App 波形队列中始终保持约 ``lead_time`` 秒的数据
+
+        根据 [`pulse_queue`][pydglab_ws.client.base.DGLabClient.pulse_queue] 估算 App 波形队列中剩余的数据量，
+        每隔 ``interval`` 秒补充一次波形数据，补充的数据不会超出 App 波形队列的最大长度。
+        调用 :meth:`clear_pulses` 清空波形队列后会立即重新补充。
+
+        波形数据耗尽后返回，若要提前停止，可取消该协程所在的任务
+
+        示例：
+        ```python3
+        task = asyncio.create_task(client.stream_pulses(Channel.A, itertools.cycle(PULSES)))
+        ...
+        task.cancel()
+        ```
+
+        :param channel: 通道选择
+        :param pulses: 波形操作数据的可迭代对象，可以是异步可迭代对象，也可以是无限长的生成器
+        :param lead_time: 提前下发的波形数据时长（秒），用于抵消网络延迟
+        :param interval: 补充波形数据的间隔（秒），默认为 ``lead_time`` 的一半
+        :param adaptive: 是否根据 :attr:`latency` 中往返延迟的 95 百分位数，自动延长提前下发的时长
+        :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+        :return: 已下发的波形操作数据数量，若未完成绑定操作，返回 ``0``
+        """
+        if interval is None:
+            interval = lead_time / 2
+        interval = max(interval, PULSE_OPERATION_DURATION)
+        if isinstance(pulses, AsyncIterable):
+            iterator = pulses.__aiter__()
+        else:
+            iterator = _async_iterator(pulses)
+        buffer: List[PulseOperation] = []
+        exhausted = False
+        sent = 0
+        while not self.not_bind:
+            max_length = pulse_data_max_length(self._client_id, self._target_id)
+            extra_lead_time = (adaptive and self._latency.rtt_percentile(95)) or 0
+            target_length = min(
+                round((lead_time + extra_lead_time + interval) / PULSE_OPERATION_DURATION),
+                PULSE_QUEUE_MAX_LENGTH
+            )
+            want = min(target_length - self._pulse_queue.length(channel), self._pulse_queue.free(channel))
+            while want > 0:
+                while len(buffer) < min(want, max_length) and not exhausted:
+                    try:
+                        buffer.append(await iterator.__anext__())
+                    except StopAsyncIteration:
+                        exhausted = True
+                if not buffer:
+                    break
+                chunk = buffer[:min(want, max_length)]
+                if not await self.add_pulses_chunked(channel, *chunk):
+                    return sent
+                del buffer[:len(chunk)]
+                sent += len(chunk)
+                want -= len(chunk)
+            if exhausted and not buffer:
+                break
+            await self._pulse_queue.wait_cleared(channel, interval)
+        return sent
+
+    def batch(self) -> DGLabBatch:
+        """
+        创建批量发送的操作集合 [`DGLabBatch`][pydglab_ws.client.batch.DGLabBatch]，
+        在异步上下文中添加的操作会在退出时一次性发送
+
+        示例：
+        ```python3
+        async with client.batch() as batch:
+            batch.clear_pulses(Channel.A)
+            batch.clear_pulses(Channel.B)
+            batch.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+            batch.set_strength(Channel.B, StrengthOperationType.SET_TO, 10)
+        ```
+        """
+        return DGLabBatch(self)
+
     async def clear_pulses(self, channel: Channel):
         """
         清空波形队列
@@ -289,4 +782,5 @@ class DGLabClient(ABC):
             MessageType.MSG,
             dump_clear_pulses(channel)
         )
+        self._pulse_queue.clear(channel)
         return True
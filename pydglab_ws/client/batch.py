@@ -0,0 +1,148 @@
+import time
+from typing import List, Tuple, Callable, Any, Union, TYPE_CHECKING
+
+from ..enums import Channel, StrengthOperationType, MessageType
+from ..pulse import PulseArray, PreparedPulses
+from ..typing import PulseOperation
+from ..utils import dump_strength_operation, dump_add_pulses, dump_clear_pulses, _pulses_length
+
+if TYPE_CHECKING:
+    from .base import DGLabClient
+
+__all__ = ["DGLabBatch"]
+
+
+class DGLabBatch:
+    """
+    批量发送的操作集合
+
+    在异步上下文中收集强度操作、波形操作等，退出异步上下文时按添加顺序编码，并一次性发送所有消息。
+    对于 WebSocket 终端，所有消息写入发送缓冲后只等待一次缓冲区排空
+
+    一般通过 [`DGLabClient.batch`][pydglab_ws.client.base.DGLabClient.batch] 创建
+
+    示例：
+    ```python3
+    async with client.batch() as batch:
+        batch.clear_pulses(Channel.A)
+        batch.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+        batch.add_pulses(Channel.A, *pulses)
+    print(batch.results)
+    ```
+
+    :param client: 发送消息的终端
+    """
+
+    def __init__(self, client: "DGLabClient"):
+        self._client = client
+        self._operations: List[Callable[[List[Tuple[MessageType, str]]], Any]] = []
+        self._after_send: List[Callable[[], Any]] = []
+        self._results: List[bool] = []
+        self._strength_sent = False
+
+    async def __aenter__(self) -> "DGLabBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.send()
+
+    @property
+    def results(self) -> List[bool]:
+        """
+        最近一次 :meth:`send` 中每个操作的结果，顺序与添加顺序一致，
+        与单独调用对应方法的返回值相同
+        """
+        return self._results.copy()
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def set_strength(
+            self,
+            channel: Channel,
+            operation_type: StrengthOperationType,
+            value: int
+    ) -> int:
+        """
+        添加强度操作，参考 [`DGLabClient.set_strength`][pydglab_ws.client.base.DGLabClient.set_strength]
+
+        :param channel: 通道选择
+        :param operation_type: 强度变化模式
+        :param value: 强度数值，范围在 [0, 200]
+        :return: 操作在 :attr:`results` 中的位置
+        """
+        async def operation(frames: List[Tuple[MessageType, str]]):
+            async def sender(sender_channel: Channel, sender_operation_type: StrengthOperationType, sender_value: int):
+                frames.append(
+                    (MessageType.MSG, dump_strength_operation(sender_channel, sender_operation_type, sender_value))
+                )
+                self._strength_sent = True
+
+            await self._client.channel_state.submit(channel, operation_type, value, sender)
+
+        self._operations.append(operation)
+        return len(self._operations) - 1
+
+    def add_pulses(self, channel: Channel, *pulses: Union[PulseOperation, PulseArray, PreparedPulses]) -> int:
+        """
+        添加波形操作，参考 [`DGLabClient.add_pulses`][pydglab_ws.client.base.DGLabClient.add_pulses]
+
+        波形数据在添加时即完成编码，数据有误时会立即抛出异常
+
+        :param channel: 通道选择
+        :param pulses: 波形操作数据，最大长度为 100，也可以传入单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]、
+            [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
+        :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+        :raise PulseDataTooLong: 波形操作数据过长
+        :return: 操作在 :attr:`results` 中的位置
+        """
+        message = dump_add_pulses(channel, *pulses)
+
+        async def operation(frames: List[Tuple[MessageType, str]]):
+            frames.append((MessageType.MSG, message))
+            self._after_send.append(lambda: self._client.pulse_queue.add(channel, _pulses_length(pulses)))
+
+        self._operations.append(operation)
+        return len(self._operations) - 1
+
+    def clear_pulses(self, channel: Channel) -> int:
+        """
+        添加清空波形队列操作，参考 [`DGLabClient.clear_pulses`][pydglab_ws.client.base.DGLabClient.clear_pulses]
+
+        :param channel: 通道选择
+        :return: 操作在 :attr:`results` 中的位置
+        """
+        message = dump_clear_pulses(channel)
+
+        async def operation(frames: List[Tuple[MessageType, str]]):
+            frames.append((MessageType.MSG, message))
+            self._after_send.append(lambda: self._client.pulse_queue.clear(channel))
+
+        self._operations.append(operation)
+        return len(self._operations) - 1
+
+    async def send(self) -> List[bool]:
+        """
+        按添加顺序编码所有操作并一次性发送，发送后清空已添加的操作
+
+        :return: 每个操作的结果，若未完成绑定操作，均为 ``False``，否则在发送后均为 ``True``
+        """
+        operations, self._operations = self._operations, []
+        self._after_send.clear()
+        self._strength_sent = False
+        if self._client.not_bind:
+            self._results = [False] * len(operations)
+            return self.results
+        frames: List[Tuple[MessageType, str]] = []
+        for operation in operations:
+            await operation(frames)
+        if self._strength_sent and self._client._strength_sent_at is None:
+            self._client._strength_sent_at = time.monotonic()
+        if frames:
+            await self._client._send_owned_many(frames)
+        for callback in self._after_send:
+            callback()
+        self._after_send.clear()
+        self._results = [True] * len(operations)
+        return self.results
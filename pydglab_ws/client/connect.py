@@ -1,5 +1,8 @@
+from typing import Optional
+
 from websockets.client import connect as ws_connect
 
+from .reconnect import ReconnectPolicy
 from .ws import DGLabWSClient
 
 __all__ = ["DGLabWSConnect"]
@@ -18,19 +21,43 @@ class DGLabWSConnect:
 
     :param uri: WebSocket 服务端 Uri
     :param register_timeout: 终端注册（获取 ``clientId``）超时时间
+    :param reconnect_policy: 自动重连策略 [`ReconnectPolicy`][pydglab_ws.client.reconnect.ReconnectPolicy]，
+        为 ``None`` 时不自动重连
     :param kwargs: :class:`websockets.client.connect` 的其他参数
     :raise asyncio.Timeout: 终端注册（获取 ``clientId``）超时
     """
 
-    def __init__(self, uri: str, register_timeout: float = None, **kwargs):
+    def __init__(
+            self,
+            uri: str,
+            register_timeout: float = None,
+            reconnect_policy: ReconnectPolicy = None,
+            **kwargs
+    ):
+        self._uri = uri
+        self._kwargs = kwargs
         self._connect = ws_connect(uri=uri, **kwargs)
         self._register_timeout = register_timeout
+        self._reconnect_policy = reconnect_policy
+        self._client: Optional[DGLabWSClient] = None
 
     async def __aenter__(self) -> DGLabWSClient:
         websocket = await self._connect.__aenter__()
-        dg_lab_ws_client = DGLabWSClient(websocket, self._register_timeout)
-        await dg_lab_ws_client.__aenter__()
-        return dg_lab_ws_client
+        self._client = DGLabWSClient(
+            websocket,
+            self._register_timeout,
+            self._reconnect_policy,
+            lambda: ws_connect(uri=self._uri, **self._kwargs)
+        )
+        try:
+            await self._client.__aenter__()
+        except BaseException as e:
+            # 注册失败时关闭连接
+            await self._connect.__aexit__(type(e), e, e.__traceback__)
+            raise
+        return self._client
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._client is not None:
+            await self._client.__aexit__(exc_type, exc_val, exc_tb)
         await self._connect.__aexit__(exc_type, exc_val, exc_tb)
@@ -0,0 +1,178 @@
+import asyncio
+from asyncio import Task
+from collections import deque
+from typing import Optional, Dict, Deque, Tuple, Any, Callable, TYPE_CHECKING
+
+from ..enums import MessageType, MessageDataHead, RetCode, DispatchQueue, FeedbackButton
+from ..exceptions import DispatcherNotRunning, InvalidStrengthData, InvalidFeedbackData
+from ..models import WebSocketMessage, StrengthData, StrengthRecord
+
+if TYPE_CHECKING:
+    from .base import DGLabClient
+
+__all__ = ["DGLabDispatcher"]
+
+_MISSING = object()
+
+
+class DGLabDispatcher:
+    """
+    DG-Lab 终端消息分发器
+
+    在后台任务中持续接收终端的消息，每条消息只解析一次，并按类型放入各自的有界队列中，
+    多个消费者可以同时等待不同类型的数据而不会互相抢占消息。
+    队列已满时会丢弃该队列中最早的数据。
+
+    一般通过 [`DGLabClient.start_dispatcher`][pydglab_ws.client.base.DGLabClient.start_dispatcher] 创建
+
+    :param client: 要接收消息的终端
+    :param max_queue: 每个队列的最大长度
+    """
+
+    def __init__(self, client: "DGLabClient", max_queue: int = 2 ** 5):
+        self._client = client
+        self._queues: Dict[DispatchQueue, Deque[Tuple[int, Any]]] = {
+            queue: deque(maxlen=max_queue) for queue in DispatchQueue
+        }
+        self._dropped: Dict[DispatchQueue, int] = {queue: 0 for queue in DispatchQueue}
+        self._sequence = 0
+        self._condition = asyncio.Condition()
+        self._task: Optional[Task] = None
+        self._exception: Optional[BaseException] = None
+
+    @property
+    def running(self) -> bool:
+        """后台接收任务是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def dropped(self) -> Dict[DispatchQueue, int]:
+        """各队列因已满而丢弃的数据数量"""
+        return self._dropped.copy()
+
+    def qsize(self, queue: DispatchQueue) -> int:
+        """
+        获取队列中当前的数据数量
+
+        :param queue: 队列类型
+        """
+        return len(self._queues[queue])
+
+    def start(self):
+        """启动后台接收任务"""
+        if not self.running:
+            self._exception = None
+            self._task = asyncio.create_task(self._receiver())
+
+    async def stop(self):
+        """停止后台接收任务，正在等待数据的消费者会收到 [`DispatcherNotRunning`][pydglab_ws.exceptions.DispatcherNotRunning]"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _route(self, message: WebSocketMessage) -> Optional[Tuple[DispatchQueue, Any]]:
+        """
+        确定消息应放入的队列，并解析数据
+
+        :return: 队列类型与数据，无需分发的消息返回 ``None``
+        """
+        client = self._client
+        if message.type == MessageType.BIND \
+                and message.message == MessageDataHead.TARGET_ID \
+                and client.not_registered:
+            return DispatchQueue.BIND, message
+        if message.client_id != client.client_id:
+            return None
+        if message.type == MessageType.BIND and isinstance(message.message, RetCode):
+            return DispatchQueue.BIND, message
+        elif message.type == MessageType.MSG:
+            try:
+                data = client._handle_message(message)
+            except (InvalidStrengthData, InvalidFeedbackData):
+                return None
+            if isinstance(data, (StrengthData, StrengthRecord)):
+                return DispatchQueue.STRENGTH, data
+            elif isinstance(data, FeedbackButton):
+                return DispatchQueue.FEEDBACK, data
+            elif isinstance(data, RetCode):
+                return DispatchQueue.RET_CODE, data
+        elif message.type == MessageType.HEARTBEAT:
+            return DispatchQueue.HEARTBEAT, message.message
+        elif message.type == MessageType.BREAK:
+            return DispatchQueue.BREAK, message.message
+        return None
+
+    async def _receiver(self):
+        """后台接收任务"""
+        try:
+            while True:
+                message = await self._client._recv()
+                if (routed := self._route(message)) is None:
+                    continue
+                queue_type, data = routed
+                queue = self._queues[queue_type]
+                async with self._condition:
+                    if len(queue) == queue.maxlen:
+                        self._dropped[queue_type] += 1
+                    queue.append((self._sequence, data))
+                    self._sequence += 1
+                    self._condition.notify_all()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._exception = e
+            async with self._condition:
+                self._condition.notify_all()
+
+    def _pop_earliest(
+            self,
+            queues: Tuple[DispatchQueue, ...],
+            predicate: Optional[Callable[[Any], bool]]
+    ) -> Any:
+        """取出所选队列中最早的、满足条件的数据，没有则返回 ``_MISSING``"""
+        earliest: Optional[Tuple[int, DispatchQueue, int]] = None
+        for queue_type in queues:
+            for index, (sequence, data) in enumerate(self._queues[queue_type]):
+                if predicate is None or predicate(data):
+                    if earliest is None or sequence < earliest[0]:
+                        earliest = sequence, queue_type, index
+                    break
+        if earliest is None:
+            return _MISSING
+        _, queue_type, index = earliest
+        queue = self._queues[queue_type]
+        _, data = queue[index]
+        del queue[index]
+        return data
+
+    async def get(
+            self,
+            *queues: DispatchQueue,
+            predicate: Callable[[Any], bool] = None
+    ) -> Any:
+        """
+        从所选队列中获取最早的一条数据，若没有数据则等待
+
+        等待期间被取消时不会丢失任何数据
+
+        :param queues: 队列类型，为空时从所有队列中获取
+        :param predicate: 数据筛选条件，不满足条件的数据会留在队列中
+        :raise DispatcherNotRunning: [`DispatcherNotRunning`][pydglab_ws.exceptions.DispatcherNotRunning]
+        :return: 数据，``BIND`` 队列中为原始的 [`WebSocketMessage`][pydglab_ws.models.WebSocketMessage]
+        """
+        queues = queues or tuple(DispatchQueue)
+        async with self._condition:
+            while True:
+                if (data := self._pop_earliest(queues, predicate)) is not _MISSING:
+                    return data
+                if self._exception is not None:
+                    raise self._exception
+                if not self.running:
+                    raise DispatcherNotRunning()
+                await self._condition.wait()
@@ -0,0 +1,115 @@
+import asyncio
+import math
+from collections import deque
+from typing import Optional, Deque, Set, AsyncGenerator, Any
+
+__all__ = ["LatencyEstimator", "ClientLatency"]
+
+
+class LatencyEstimator:
+    """
+    延迟估计器
+
+    对延迟样本计算指数加权移动平均（EWMA），并保留最近的样本用于计算百分位数
+
+    :param alpha: EWMA 中新样本的权重
+    :param window: 用于计算百分位数的最近样本数量
+    """
+
+    def __init__(self, alpha: float = 0.125, window: int = 128):
+        self._alpha = alpha
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._ewma: Optional[float] = None
+        self._count = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def count(self) -> int:
+        """已记录的样本总数"""
+        return self._count
+
+    @property
+    def last(self) -> Optional[float]:
+        """最近一次的样本（秒），没有样本时为 ``None``"""
+        return self._samples[-1] if self._samples else None
+
+    @property
+    def ewma(self) -> Optional[float]:
+        """指数加权移动平均（秒），没有样本时为 ``None``"""
+        return self._ewma
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        计算最近样本的百分位数（最近秩法）
+
+        :param percent: 百分位，范围在 [0, 100]
+        :return: 百分位数（秒），没有样本时为 ``None``
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def add(self, sample: float):
+        """
+        记录一个延迟样本
+
+        :param sample: 延迟（秒）
+        """
+        self._samples.append(sample)
+        self._count += 1
+        if self._ewma is None:
+            self._ewma = sample
+        else:
+            self._ewma += self._alpha * (sample - self._ewma)
+        for queue in self._subscribers:
+            if not queue.full():
+                queue.put_nowait(sample)
+
+    async def samples(self, max_queue: int = 2 ** 5) -> AsyncGenerator[float, Any]:
+        """
+        延迟样本异步生成器，产生此后记录的每一个样本
+
+        :param max_queue: 未被读取的样本最大数量，超出时新的样本会被丢弃
+        """
+        queue = asyncio.Queue(max_queue)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.discard(queue)
+
+
+class ClientLatency:
+    """
+    终端的延迟估计
+
+    :ivar ping: WebSocket ping/pong 往返延迟，仅 WebSocket 终端可用
+    :ivar strength: 从发送强度操作到收到 App 返回的强度数据的往返延迟
+    """
+
+    def __init__(self):
+        self.ping = LatencyEstimator()
+        self.strength = LatencyEstimator()
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """往返延迟的 EWMA（秒），优先使用强度数据的往返延迟，因为它包含了 App 的处理时间"""
+        return self.strength.ewma if self.strength.ewma is not None else self.ping.ewma
+
+    @property
+    def one_way(self) -> Optional[float]:
+        """单程延迟的估计值（秒），即往返延迟的一半"""
+        return self.rtt / 2 if self.rtt is not None else None
+
+    def rtt_percentile(self, percent: float) -> Optional[float]:
+        """
+        往返延迟的百分位数，优先使用强度数据的往返延迟
+
+        :param percent: 百分位，范围在 [0, 100]
+        """
+        if (value := self.strength.percentile(percent)) is not None:
+            return value
+        return self.ping.percentile(percent)
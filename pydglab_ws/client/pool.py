@@ -0,0 +1,189 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from .connect import DGLabWSConnect
+from .ws import DGLabWSClient
+from ..enums import ConnectionState
+
+__all__ = ["PoolHealth", "DGLabWSConnectPool"]
+
+
+@dataclass
+class PoolHealth:
+    """
+    连接池的整体状态
+
+    :ivar connecting: 正在连接或注册的终端数量
+    :ivar registered: 已注册、尚未与 App 绑定的终端数量
+    :ivar bound: 已与 App 绑定的终端数量
+    :ivar closed: 连接已关闭、尚未从连接池移除的终端数量
+    :ivar failed: 累计连接或注册失败的次数
+    """
+    connecting: int = 0
+    registered: int = 0
+    bound: int = 0
+    closed: int = 0
+    failed: int = 0
+
+    @property
+    def open(self) -> int:
+        """连接未关闭的终端数量"""
+        return self.registered + self.bound
+
+
+class DGLabWSConnectPool:
+    """
+    DG-Lab WebSocket 终端连接池
+
+    并发地创建、注册和管理多个 WebSocket 终端 [`DGLabWSClient`][pydglab_ws.client.ws.DGLabWSClient]，
+    可限制同时进行的连接数量和每秒发起的连接数量，退出异步上下文时会一并关闭所有连接
+
+    示例：
+    ```python3
+    async with DGLabWSConnectPool("ws://localhost:5678", max_concurrency=16, connect_rate=50) as pool:
+        clients = await pool.open(100)
+        print(pool.health)
+    ```
+
+    :param uri: WebSocket 服务端 Uri
+    :param max_concurrency: 同时进行连接和注册的最大数量
+    :param connect_rate: 每秒最多发起的连接数量，为 ``None`` 时不限制
+    :param register_timeout: 终端注册（获取 ``clientId``）超时时间
+    :param kwargs: [`DGLabWSConnect`][pydglab_ws.client.connect.DGLabWSConnect] 的其他参数
+    """
+
+    def __init__(
+            self,
+            uri: str,
+            max_concurrency: int = 16,
+            connect_rate: float = None,
+            register_timeout: float = None,
+            **kwargs
+    ):
+        self._uri = uri
+        self._register_timeout = register_timeout
+        self._kwargs = kwargs
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._connect_interval = 1 / connect_rate if connect_rate else 0
+        self._next_connect_time = 0.0
+        self._rate_lock = asyncio.Lock()
+        self._connects: Dict[DGLabWSClient, DGLabWSConnect] = {}
+        self._connecting = 0
+        self._failed = 0
+
+    async def __aenter__(self) -> "DGLabWSConnectPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close_all()
+
+    @property
+    def clients(self) -> List[DGLabWSClient]:
+        """连接池中的所有终端"""
+        return list(self._connects.keys())
+
+    @staticmethod
+    def state(client: DGLabWSClient) -> ConnectionState:
+        """
+        获取终端的连接状态
+
+        :param client: 终端
+        """
+        if client.websocket.closed:
+            return ConnectionState.CLOSED
+        elif client.not_registered:
+            return ConnectionState.CONNECTING
+        elif client.not_bind:
+            return ConnectionState.REGISTERED
+        else:
+            return ConnectionState.BOUND
+
+    @property
+    def states(self) -> Dict[DGLabWSClient, ConnectionState]:
+        """连接池中每个终端的连接状态"""
+        return {client: self.state(client) for client in self._connects}
+
+    @property
+    def health(self) -> PoolHealth:
+        """连接池的整体状态"""
+        health = PoolHealth(connecting=self._connecting, failed=self._failed)
+        for state in self.states.values():
+            if state == ConnectionState.REGISTERED:
+                health.registered += 1
+            elif state == ConnectionState.BOUND:
+                health.bound += 1
+            elif state == ConnectionState.CLOSED:
+                health.closed += 1
+        return health
+
+    async def _wait_rate_limit(self):
+        """按照 ``connect_rate`` 等待发起下一个连接的时机"""
+        if not self._connect_interval:
+            return
+        async with self._rate_lock:
+            now = time.monotonic()
+            delay = self._next_connect_time - now
+            self._next_connect_time = max(now, self._next_connect_time) + self._connect_interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def connect(self) -> DGLabWSClient:
+        """
+        创建一个新的终端连接并完成注册
+
+        :raise asyncio.Timeout: 终端注册（获取 ``clientId``）超时
+        :return: 已注册的终端
+        """
+        async with self._semaphore:
+            await self._wait_rate_limit()
+            self._connecting += 1
+            connect = DGLabWSConnect(self._uri, self._register_timeout, **self._kwargs)
+            try:
+                client = await connect.__aenter__()
+            except BaseException:
+                self._failed += 1
+                raise
+            finally:
+                self._connecting -= 1
+        self._connects[client] = connect
+        return client
+
+    async def open(
+            self,
+            count: int,
+            return_exceptions: bool = False
+    ) -> List[Union[DGLabWSClient, BaseException]]:
+        """
+        并发地创建多个终端连接并完成注册
+
+        :param count: 终端数量
+        :param return_exceptions: 为 ``True`` 时，失败的连接以异常对象的形式放入返回列表，
+            否则在第一个连接失败时抛出异常
+        :return: 已注册的终端
+        """
+        return await asyncio.gather(
+            *(self.connect() for _ in range(count)),
+            return_exceptions=return_exceptions
+        )
+
+    async def close(self, client: DGLabWSClient) -> bool:
+        """
+        关闭终端连接，并从连接池中移除
+
+        :param client: 终端
+        :return: 终端是否在连接池中
+        """
+        connect: Optional[DGLabWSConnect] = self._connects.pop(client, None)
+        if connect is None:
+            return False
+        await connect.__aexit__(None, None, None)
+        return True
+
+    async def close_all(self):
+        """并发地关闭所有终端连接"""
+        await asyncio.gather(
+            *(self.close(client) for client in self.clients),
+            return_exceptions=True
+        )
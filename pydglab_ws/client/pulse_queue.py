@@ -0,0 +1,86 @@
+import asyncio
+import math
+import time
+from typing import Dict
+
+from ..enums import Channel
+from ..utils import PULSE_QUEUE_MAX_LENGTH, PULSE_OPERATION_DURATION
+
+__all__ = ["PulseQueueModel"]
+
+
+class PulseQueueModel:
+    """
+    App 波形队列的本地模型
+
+    App 每 100ms 执行一条波形操作数据，此处根据已下发的波形数据和时间，估算各通道波形队列中剩余的数据量。
+    超出 [`PULSE_QUEUE_MAX_LENGTH`][pydglab_ws.utils.PULSE_QUEUE_MAX_LENGTH] 的部分会像 App 一样被丢弃
+
+    一般通过 [`DGLabClient.pulse_queue`][pydglab_ws.client.base.DGLabClient.pulse_queue] 获取
+    """
+
+    def __init__(self):
+        self._end_time: Dict[Channel, float] = {channel: 0.0 for channel in Channel}
+        self._cleared: Dict[Channel, asyncio.Event] = {channel: asyncio.Event() for channel in Channel}
+
+    def remaining(self, channel: Channel) -> float:
+        """
+        估算波形队列中剩余数据的持续时间（秒）
+
+        :param channel: 通道选择
+        """
+        return max(self._end_time[channel] - time.monotonic(), 0.0)
+
+    def length(self, channel: Channel) -> int:
+        """
+        估算波形队列中剩余的波形操作数据数量
+
+        :param channel: 通道选择
+        """
+        # 减去极小值，避免浮点误差导致多算一条
+        return math.ceil(self.remaining(channel) / PULSE_OPERATION_DURATION - 1e-9)
+
+    def free(self, channel: Channel) -> int:
+        """
+        估算波形队列中还能放入的波形操作数据数量
+
+        :param channel: 通道选择
+        """
+        return max(PULSE_QUEUE_MAX_LENGTH - self.length(channel), 0)
+
+    def add(self, channel: Channel, count: int):
+        """
+        记录已下发的波形操作数据
+
+        :param channel: 通道选择
+        :param count: 波形操作数据数量
+        """
+        count = min(count, self.free(channel))
+        now = time.monotonic()
+        self._end_time[channel] = max(self._end_time[channel], now) + count * PULSE_OPERATION_DURATION
+
+    def clear(self, channel: Channel):
+        """
+        记录波形队列已被清空，并唤醒正在等待该通道的协程
+
+        :param channel: 通道选择
+        """
+        self._end_time[channel] = 0.0
+        self._cleared[channel].set()
+
+    async def wait_cleared(self, channel: Channel, timeout: float) -> bool:
+        """
+        等待波形队列被清空
+
+        :param channel: 通道选择
+        :param timeout: 超时时间（秒）
+        :return: 期间波形队列是否被清空
+        """
+        event = self._cleared[channel]
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        else:
+            event.clear()
+            return True
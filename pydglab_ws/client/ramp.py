@@ -0,0 +1,200 @@
+import asyncio
+import math
+import time
+from asyncio import Task, Future
+from dataclasses import dataclass, field
+from typing import Optional, Dict, TYPE_CHECKING
+
+from ..enums import Channel, RampCurve, StrengthOperationType
+from ..exceptions import StrengthUnknown
+from ..log import EventLogger
+
+if TYPE_CHECKING:
+    from .base import DGLabClient
+
+__all__ = ["EXPONENTIAL_RAMP_CURVATURE", "StrengthRamp", "StrengthRampEngine"]
+
+_log = EventLogger("pydglab_ws.client")
+
+EXPONENTIAL_RAMP_CURVATURE = 4
+"""指数渐变曲线的曲率，越大则开始时变化越慢、接近目标时变化越快"""
+
+
+def _progress(curve: RampCurve, ratio: float) -> float:
+    """将时间进度 [0, 1] 映射为强度进度 [0, 1]"""
+    if curve == RampCurve.EXPONENTIAL:
+        return math.expm1(EXPONENTIAL_RAMP_CURVATURE * ratio) / math.expm1(EXPONENTIAL_RAMP_CURVATURE)
+    return ratio
+
+
+@dataclass
+class StrengthRamp:
+    """
+    单个通道的强度渐变
+
+    :ivar start: 起始强度
+    :ivar target: 目标强度
+    :ivar duration: 持续时间（秒）
+    :ivar curve: 渐变曲线
+    :ivar start_time: 开始时间，为 ``time.monotonic()`` 的值
+    """
+    start: int
+    target: int
+    duration: float
+    curve: RampCurve = RampCurve.LINEAR
+    start_time: float = field(default_factory=time.monotonic)
+
+    def value(self, now: float) -> int:
+        """
+        计算某一时刻的强度
+
+        :param now: 时刻，为 ``time.monotonic()`` 的值
+        """
+        if self.finished(now):
+            return self.target
+        ratio = max(now - self.start_time, 0) / self.duration
+        return round(self.start + (self.target - self.start) * _progress(self.curve, ratio))
+
+    def finished(self, now: float) -> bool:
+        """
+        渐变在某一时刻是否已结束
+
+        :param now: 时刻，为 ``time.monotonic()`` 的值
+        """
+        return self.duration <= 0 or now - self.start_time >= self.duration
+
+
+class StrengthRampEngine:
+    """
+    强度渐变引擎
+
+    在后台任务中按不超过 ``max_rate`` 的频率，将各通道正在进行的渐变转换为 ``SET_TO`` 强度操作，
+    强度与上次发送的值相同时不会重复发送，同一次刷新中两个通道的操作会批量发送。
+    同一通道的新渐变会取代尚未完成的渐变，并从当前强度开始，当前强度未知时不会开始渐变；
+    发送的强度不会超过 App 最近一次返回的 [`StrengthData`][pydglab_ws.models.StrengthData] 中的强度上限
+
+    一般通过 [`DGLabClient.ramp`][pydglab_ws.client.base.DGLabClient.ramp] 获取
+
+    :param client: 发送强度操作的终端
+    :param max_rate: 每秒最多发送的刷新次数
+    """
+
+    def __init__(self, client: "DGLabClient", max_rate: float = 10):
+        self._client = client
+        self.max_rate = max_rate
+        self._ramps: Dict[Channel, StrengthRamp] = {}
+        self._futures: Dict[Channel, Future] = {}
+        self._task: Optional[Task] = None
+
+    @property
+    def running(self) -> bool:
+        """后台任务是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def get(self, channel: Channel) -> Optional[StrengthRamp]:
+        """
+        获取通道正在进行的渐变
+
+        :param channel: 通道选择
+        :return: 渐变，没有正在进行的渐变时为 ``None``
+        """
+        return self._ramps.get(channel)
+
+    def start(
+            self,
+            channel: Channel,
+            target: int,
+            duration: float,
+            curve: RampCurve = RampCurve.LINEAR
+    ) -> Future:
+        """
+        开始通道强度的渐变，取代该通道尚未完成的渐变
+
+        :param channel: 通道选择
+        :param target: 目标强度，范围在 [0, 200]
+        :param duration: 持续时间（秒）
+        :param curve: 渐变曲线
+        :return: 渐变结束时结果为 ``True``，被取代或取消时结果为 ``False``
+        :raise StrengthUnknown: [`StrengthUnknown`][pydglab_ws.exceptions.StrengthUnknown]，
+            尚未收到 App 的强度数据，也没有发送过 ``SET_TO`` 强度操作，无法确定起始强度
+        """
+        # 从 0 开始可能使强度先骤降再上升，因此不猜测起始强度
+        if (start := self._client.channel_state.expected(channel)) is None:
+            raise StrengthUnknown(channel)
+        self._finish(channel, False)
+        self._ramps[channel] = StrengthRamp(start, target, duration, curve)
+        self._futures[channel] = future = asyncio.get_running_loop().create_future()
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    def cancel(self, channel: Channel) -> bool:
+        """
+        取消通道正在进行的渐变，强度停留在最后一次发送的值
+
+        :param channel: 通道选择
+        :return: 是否有正在进行的渐变
+        """
+        return self._finish(channel, False)
+
+    async def stop(self):
+        """取消所有渐变并停止后台任务"""
+        for channel in list(self._ramps):
+            self._finish(channel, False)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _finish(self, channel: Channel, result: bool) -> bool:
+        """结束通道的渐变，并设置其结果"""
+        if self._ramps.pop(channel, None) is None:
+            return False
+        future = self._futures.pop(channel)
+        if not future.done():
+            future.set_result(result)
+        return True
+
+    async def _tick(self):
+        """计算各通道当前的强度，并批量发送发生变化的值"""
+        now = time.monotonic()
+        channel_state = self._client.channel_state
+        ramps = list(self._ramps.items())
+        async with self._client.batch() as batch:
+            for channel, ramp in ramps:
+                value = ramp.value(now)
+                if (limit := channel_state.get(channel).limit) is not None:
+                    value = min(value, limit)
+                if value != channel_state.expected(channel):
+                    batch.set_strength(channel, StrengthOperationType.SET_TO, value)
+        for channel, ramp in ramps:
+            # 发送期间可能已被新的渐变取代
+            if ramp.finished(now) and self._ramps.get(channel) is ramp:
+                self._finish(channel, True)
+
+    async def _run(self):
+        """后台任务"""
+        try:
+            while self._ramps:
+                await self._tick()
+                if self._ramps:
+                    await asyncio.sleep(1 / self.max_rate)
+        except Exception as e:
+            _log.warning(
+                "client.ramp_failed",
+                "Strength ramp of %s stopped: %r",
+                self._client.client_id,
+                e,
+                client_id=self._client.client_id,
+                error=repr(e)
+            )
+            for channel, future in self._futures.items():
+                if not future.done():
+                    future.set_exception(e)
+                    # 以 wait=False 开始的渐变没有调用方等待，避免事件循环报告未取出的异常
+                    future.exception()
+            self._ramps.clear()
+            self._futures.clear()
@@ -0,0 +1,71 @@
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+__all__ = ["ReconnectPolicy", "ReconnectStats"]
+
+
+@dataclass
+class ReconnectPolicy:
+    """
+    WebSocket 终端的自动重连策略
+
+    重连的等待时间按指数增长，并加入随机抖动，避免大量终端同时重连
+
+    :ivar initial_delay: 首次重连前的等待时间（秒）
+    :ivar max_delay: 重连等待时间的上限（秒）
+    :ivar multiplier: 每次重连失败后等待时间的增长倍数
+    :ivar jitter: 随机抖动比例，实际等待时间在 ``[delay * (1 - jitter), delay]`` 之间
+    :ivar max_attempts: 每次断线后最多尝试重连的次数，为 ``None`` 时不限制
+    :ivar heartbeat_factor: 超过观测到的心跳间隔的多少倍仍未收到任何消息时，视为连接已失效
+    :ivar heartbeat_timeout: 固定的连接失效判定时间（秒），设置后不再根据观测到的心跳间隔判定
+    """
+    initial_delay: float = 0.5
+    max_delay: float = 30
+    multiplier: float = 2
+    jitter: float = 0.5
+    max_attempts: Optional[int] = None
+    heartbeat_factor: float = 3
+    heartbeat_timeout: Optional[float] = None
+
+    def delay(self, attempt: int) -> float:
+        """
+        计算重连前的等待时间
+
+        :param attempt: 本次断线后的第几次重连，从 ``0`` 开始
+        """
+        delay = min(self.initial_delay * self.multiplier ** attempt, self.max_delay)
+        return delay * (1 - self.jitter * random.random())
+
+    def dead_timeout(self, heartbeat_interval: Optional[float]) -> Optional[float]:
+        """
+        计算连接失效的判定时间
+
+        :param heartbeat_interval: 观测到的心跳间隔（秒）
+        :return: 判定时间（秒），无法判定时为 ``None``
+        """
+        if self.heartbeat_timeout is not None:
+            return self.heartbeat_timeout
+        if heartbeat_interval is not None:
+            return heartbeat_interval * self.heartbeat_factor
+        return None
+
+
+@dataclass
+class ReconnectStats:
+    """
+    WebSocket 终端的重连统计
+
+    :ivar disconnects: 检测到断线的次数
+    :ivar dead_peers: 其中因超时未收到心跳而判定连接失效的次数
+    :ivar attempts: 累计尝试重连的次数
+    :ivar reconnects: 成功重连的次数
+    :ivar last_recovery_time: 最近一次从检测到断线到重新注册完成的耗时（秒）
+    :ivar total_recovery_time: 累计恢复耗时（秒）
+    """
+    disconnects: int = 0
+    dead_peers: int = 0
+    attempts: int = 0
+    reconnects: int = 0
+    last_recovery_time: Optional[float] = None
+    total_recovery_time: float = 0
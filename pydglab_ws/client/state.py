@@ -0,0 +1,218 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Deque, Tuple, Dict, Callable, Coroutine, Any, Union
+
+from ..enums import Channel, StrengthOperationType
+from ..models import StrengthData, StrengthRecord
+
+__all__ = ["STRENGTH_MAX_VALUE", "ChannelState", "StrengthSendStats", "ChannelStateTracker"]
+
+STRENGTH_MAX_VALUE = 200
+"""通道强度最大值"""
+
+StrengthOperation = Tuple[StrengthOperationType, int]
+
+
+@dataclass
+class ChannelState:
+    """
+    单个通道的状态
+
+    :ivar strength: 最近一次由 App 确认的通道强度
+    :ivar limit: 最近一次由 App 确认的通道强度上限
+    :ivar expected: 已发送的强度操作执行后，预计的通道强度，未知时为 ``None``
+    :ivar pending: 尚未发送的强度操作
+    """
+    strength: Optional[int] = None
+    limit: Optional[int] = None
+    expected: Optional[int] = None
+    pending: Deque[StrengthOperation] = field(default_factory=deque)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+@dataclass
+class StrengthSendStats:
+    """
+    强度操作发送统计
+
+    :ivar requested: 提交的强度操作数量
+    :ivar sent: 实际发送的强度操作数量
+    :ivar suppressed: 因不会改变通道强度而跳过的操作数量
+    :ivar merged: 因被后续操作覆盖或与其合并而无需发送的操作数量
+    """
+    requested: int = 0
+    sent: int = 0
+    suppressed: int = 0
+    merged: int = 0
+
+    @property
+    def avoided(self) -> int:
+        """共避免发送的操作数量"""
+        return self.suppressed + self.merged
+
+
+def _apply_operation(
+        current: Optional[int],
+        limit: Optional[int],
+        operation_type: StrengthOperationType,
+        value: int
+) -> Optional[int]:
+    """计算强度操作执行后的通道强度，无法确定时返回 ``None``"""
+    if operation_type == StrengthOperationType.SET_TO:
+        result = value
+    elif current is None:
+        return None
+    elif operation_type == StrengthOperationType.INCREASE:
+        result = current + value
+    else:
+        result = current - value
+    result = max(min(result, STRENGTH_MAX_VALUE), 0)
+    return min(result, limit) if limit is not None else result
+
+
+class ChannelStateTracker:
+    """
+    通道状态记录器
+
+    记录每个通道最近一次由 App 确认的强度和强度上限，以及尚未发送的强度操作，
+    启用后会在操作发送前跳过不会改变通道强度的操作，并合并被后续操作覆盖的操作
+
+    一般通过 [`DGLabClient.channel_state`][pydglab_ws.client.base.DGLabClient.channel_state] 获取
+
+    :param enabled: 是否启用冗余操作过滤，通道状态的记录不受影响
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        """是否启用冗余操作过滤"""
+        self._states: Dict[Channel, ChannelState] = {channel: ChannelState() for channel in Channel}
+        self._stats = StrengthSendStats()
+
+    @property
+    def stats(self) -> StrengthSendStats:
+        """强度操作发送统计"""
+        return self._stats
+
+    def get(self, channel: Channel) -> ChannelState:
+        """
+        获取通道状态
+
+        :param channel: 通道选择
+        """
+        return self._states[channel]
+
+    def expected(self, channel: Channel) -> Optional[int]:
+        """
+        计算所有已提交的强度操作执行后，预计的通道强度
+
+        :param channel: 通道选择
+        :return: 预计的通道强度，无法确定时返回 ``None``
+        """
+        state = self._states[channel]
+        current = state.expected
+        for operation_type, value in state.pending:
+            current = _apply_operation(current, state.limit, operation_type, value)
+        return current
+
+    def update(self, data: Union[StrengthRecord, StrengthData]):
+        """
+        记录由 App 确认的强度数据
+
+        :param data: 强度数据
+        """
+        for channel, strength, limit in (
+                (Channel.A, data.a, data.a_limit),
+                (Channel.B, data.b, data.b_limit)
+        ):
+            state = self._states[channel]
+            state.strength = state.expected = strength
+            state.limit = limit
+
+    def reset(self):
+        """清除已记录的通道强度和强度上限，适合 App 重新绑定时调用"""
+        for state in self._states.values():
+            state.strength = state.limit = state.expected = None
+
+    @staticmethod
+    def _merge(state: ChannelState, operation_type: StrengthOperationType, value: int) -> int:
+        """
+        将操作放入待发送队列，并尽可能与队列中的操作合并
+
+        :return: 被合并而无需发送的操作数量
+        """
+        pending = state.pending
+        if operation_type == StrengthOperationType.SET_TO:
+            merged = len(pending)
+            pending.clear()
+            pending.append((operation_type, value))
+            return merged
+        if pending:
+            last_type, last_value = pending[-1]
+            if last_type == operation_type:
+                pending[-1] = (operation_type, min(last_value + value, STRENGTH_MAX_VALUE))
+                return 1
+            elif last_type == StrengthOperationType.SET_TO \
+                    and (operation_type == StrengthOperationType.INCREASE or state.limit is not None):
+                pending[-1] = (last_type, _apply_operation(last_value, state.limit, operation_type, value))
+                return 1
+        pending.append((operation_type, value))
+        return 0
+
+    def _requeue(self, state: ChannelState, operation_type: StrengthOperationType, value: int):
+        """将发送失败的操作放回待发送队列的开头，并与队列中的操作重新合并"""
+        queued = list(state.pending)
+        state.pending.clear()
+        state.pending.append((operation_type, value))
+        for queued_type, queued_value in queued:
+            self._stats.merged += self._merge(state, queued_type, queued_value)
+
+    async def submit(
+            self,
+            channel: Channel,
+            operation_type: StrengthOperationType,
+            value: int,
+            sender: Callable[[Channel, StrengthOperationType, int], Coroutine[Any, Any, Any]]
+    ):
+        """
+        提交强度操作，由 ``sender`` 完成实际发送
+
+        同一通道正有操作在发送时，新的操作会放入待发送队列，由正在发送的协程一并发送；
+        ``sender`` 抛出异常时，异常由正在发送的协程抛出，发送失败的操作和尚未发送的操作保留在待发送队列中，
+        由该通道下一次提交的操作一并发送
+
+        :param channel: 通道选择
+        :param operation_type: 强度变化模式
+        :param value: 强度数值，范围在 [0, 200]
+        :param sender: 发送强度操作的协程函数
+        """
+        state = self._states[channel]
+        self._stats.requested += 1
+        if not self.enabled:
+            await sender(channel, operation_type, value)
+            state.expected = _apply_operation(state.expected, state.limit, operation_type, value)
+            self._stats.sent += 1
+            return
+
+        expected = self.expected(channel)
+        if (operation_type != StrengthOperationType.SET_TO and value == 0) or (
+                expected is not None
+                and _apply_operation(expected, state.limit, operation_type, value) == expected
+        ):
+            self._stats.suppressed += 1
+            return
+        self._stats.merged += self._merge(state, operation_type, value)
+        if state.lock.locked():
+            return
+
+        async with state.lock:
+            while state.pending:
+                operation_type, value = state.pending.popleft()
+                try:
+                    await sender(channel, operation_type, value)
+                except BaseException:
+                    # 其他协程的操作已合并进待发送队列并返回，不能丢弃
+                    self._requeue(state, operation_type, value)
+                    raise
+                state.expected = _apply_operation(state.expected, state.limit, operation_type, value)
+                self._stats.sent += 1
@@ -0,0 +1,337 @@
+import asyncio
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, CancelledError
+from contextlib import asynccontextmanager
+from typing import Optional, Callable, AsyncContextManager, Deque, Tuple, Any, List, AsyncIterator, Union
+
+from pydantic import UUID4
+
+from .base import DGLabClient
+from .batch import DGLabBatch
+from .connect import DGLabWSConnect
+from ..enums import Channel, StrengthOperationType, FeedbackButton, DispatchQueue
+from ..models import StrengthData, StrengthRecord
+from ..pulse import PulseArray, PreparedPulses
+from ..typing import PulseOperation
+
+__all__ = ["DGLabSyncClient"]
+
+_Operation = Tuple[Callable[[DGLabBatch], int], Future]
+
+
+def _put_latest(data_queue: queue.Queue, item: Any):
+    """放入数据，队列已满时丢弃最早的数据"""
+    while True:
+        try:
+            data_queue.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                data_queue.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class DGLabSyncClient:
+    """
+    DG-Lab 终端的同步接口，线程安全
+
+    在独立的后台线程中运行事件循环和终端，适合无法运行 asyncio 事件循环的同步程序（例如游戏插件、GUI 工具）。
+
+    - 强度操作、波形操作等在调用后立即返回 ``concurrent.futures.Future``，
+      多个线程提交的操作会累积起来，后台线程每次被唤醒时通过 :meth:`DGLabClient.batch` 一次性发送，
+      而不是每个操作都跨线程调度一次协程
+    - 收到的强度数据和 App 反馈分别放入线程安全的队列 :attr:`strength_queue`, :attr:`feedback_queue`，
+      队列已满时丢弃最早的数据
+
+    示例：
+    ```python3
+    with DGLabSyncClient.ws("ws://192.168.1.161:5678") as client:
+        print(client.get_qrcode("ws://192.168.1.161:5678"))
+        client.bind(timeout=60)
+        client.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+        button = client.feedback_queue.get()
+    ```
+
+    :param connect: 返回终端异步上下文管理器的函数，在后台线程的事件循环中调用
+    :param max_queue: 强度数据和 App 反馈队列的最大长度
+    """
+
+    def __init__(
+            self,
+            connect: Callable[[], AsyncContextManager[DGLabClient]],
+            max_queue: int = 2 ** 5
+    ):
+        self._connect = connect
+        self.strength_queue: "queue.Queue[Union[StrengthData, StrengthRecord]]" = queue.Queue(max_queue)
+        """强度数据队列"""
+        self.feedback_queue: "queue.Queue[FeedbackButton]" = queue.Queue(max_queue)
+        """App 反馈队列"""
+        self._client: Optional[DGLabClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._bound = threading.Event()
+        self._exception: Optional[BaseException] = None
+        self._operations: Deque[_Operation] = deque()
+        self._wakeup_lock = threading.Lock()
+        self._wakeup_pending = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @classmethod
+    def ws(cls, uri: str, max_queue: int = 2 ** 5, **kwargs) -> "DGLabSyncClient":
+        """
+        创建 WebSocket 终端的同步接口
+
+        :param uri: WebSocket 服务端 Uri
+        :param max_queue: 强度数据和 App 反馈队列的最大长度
+        :param kwargs: [`DGLabWSConnect`][pydglab_ws.client.connect.DGLabWSConnect] 的其他参数
+        """
+        return cls(lambda: DGLabWSConnect(uri, **kwargs), max_queue)
+
+    @classmethod
+    def local(
+            cls,
+            host: str,
+            port: int,
+            heartbeat_interval: float = None,
+            max_queue: int = 2 ** 5,
+            **kwargs
+    ) -> "DGLabSyncClient":
+        """
+        在后台线程中运行 WebSocket 服务端，并创建本地终端的同步接口
+
+        :param host: 服务端监听地址
+        :param port: 服务端监听端口
+        :param heartbeat_interval: 心跳间隔（秒），为 ``None`` 时不发送心跳
+        :param max_queue: 强度数据和 App 反馈队列的最大长度
+        :param kwargs: [`DGLabWSServer`][pydglab_ws.server.server.DGLabWSServer] 的其他参数
+        """
+        from ..server import DGLabWSServer
+
+        @asynccontextmanager
+        async def connect() -> AsyncIterator[DGLabClient]:
+            async with DGLabWSServer(host, port, heartbeat_interval, **kwargs) as server:
+                yield server.new_local_client(max_queue)
+
+        return cls(connect, max_queue)
+
+    def __enter__(self) -> "DGLabSyncClient":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def client(self) -> Optional[DGLabClient]:
+        """后台线程中的终端，只应在后台线程的事件循环中使用"""
+        return self._client
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """后台线程中的事件循环"""
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        """后台线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def client_id(self) -> Optional[UUID4]:
+        """DG-Lab 终端 ID"""
+        return self._client.client_id if self._client is not None else None
+
+    @property
+    def target_id(self) -> Optional[UUID4]:
+        """DG-Lab App ID"""
+        return self._client.target_id if self._client is not None else None
+
+    @property
+    def not_bind(self) -> bool:
+        """终端是否未完成与 App 的绑定"""
+        return self._client is None or self._client.not_bind
+
+    def get_qrcode(self, uri: str = None) -> Optional[str]:
+        """
+        终端二维码，参考 [`DGLabClient.get_qrcode`][pydglab_ws.client.base.DGLabClient.get_qrcode]
+
+        :param uri: WebSocket 服务端 URI
+        """
+        if self._client is None:
+            return None
+        return self._client.get_qrcode(uri)
+
+    def start(self, timeout: float = None):
+        """
+        启动后台线程，并等待终端完成连接和注册
+
+        :param timeout: 超时时间（秒）
+        :raise TimeoutError: 等待超时
+        """
+        if self.running:
+            return
+        self._ready.clear()
+        self._bound.clear()
+        self._exception = None
+        self._thread = threading.Thread(target=self._run, name="DGLabSyncClient", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise TimeoutError("DGLabSyncClient start timed out")
+        if self._exception is not None:
+            raise self._exception
+
+    def close(self, timeout: float = None):
+        """
+        关闭终端并停止后台线程，尚未发送的操作不再发送
+
+        :param timeout: 等待后台线程结束的超时时间（秒）
+        """
+        if not self.running:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """后台线程"""
+        try:
+            asyncio.run(self._main())
+        except BaseException as e:
+            self._exception = e
+        finally:
+            while self._operations:
+                _, future = self._operations.popleft()
+                future.cancel()
+            self._ready.set()
+
+    async def _main(self):
+        """后台线程中的事件循环入口"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stop = asyncio.Event()
+        async with self._connect() as client:
+            self._client = client
+            client.start_dispatcher()
+            tasks = [
+                asyncio.create_task(self._sender()),
+                asyncio.create_task(self._receiver()),
+                asyncio.create_task(self._binder())
+            ]
+            self._ready.set()
+            try:
+                await self._stop.wait()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await client.stop_dispatcher()
+
+    async def _binder(self):
+        """等待与 App 的关系绑定"""
+        while self._client.not_bind:
+            await self._client.bind()
+        self._bound.set()
+
+    async def _receiver(self):
+        """将收到的数据放入线程安全的队列"""
+        dispatcher = self._client.dispatcher
+        while True:
+            data = await dispatcher.get(DispatchQueue.STRENGTH, DispatchQueue.FEEDBACK)
+            if isinstance(data, (StrengthData, StrengthRecord)):
+                _put_latest(self.strength_queue, data)
+            else:
+                _put_latest(self.feedback_queue, data)
+
+    async def _sender(self):
+        """每次被唤醒时，取出所有已提交的操作并批量发送"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._wakeup_lock:
+                self._wakeup_pending = False
+            operations: List[_Operation] = []
+            while self._operations:
+                operations.append(self._operations.popleft())
+            batch = self._client.batch()
+            indexes: List[Tuple[int, Future]] = []
+            for add, future in operations:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    indexes.append((add(batch), future))
+                except Exception as e:
+                    future.set_exception(e)
+            try:
+                results = await batch.send()
+            except asyncio.CancelledError:
+                # 已开始执行的 Future 无法取消
+                for _, future in indexes:
+                    future.set_exception(CancelledError())
+                raise
+            except Exception as e:
+                for _, future in indexes:
+                    future.set_exception(e)
+            else:
+                for index, future in indexes:
+                    future.set_result(results[index])
+
+    def _submit(self, add: Callable[[DGLabBatch], int]) -> "Future[bool]":
+        """提交操作，后台线程未被唤醒时才跨线程唤醒一次"""
+        if not self.running:
+            raise RuntimeError("DGLabSyncClient is not running")
+        future = Future()
+        self._operations.append((add, future))
+        with self._wakeup_lock:
+            if not self._wakeup_pending:
+                self._wakeup_pending = True
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+        return future
+
+    def set_strength(
+            self,
+            channel: Channel,
+            operation_type: StrengthOperationType,
+            value: int
+    ) -> "Future[bool]":
+        """
+        设置强度，参考 [`DGLabClient.set_strength`][pydglab_ws.client.base.DGLabClient.set_strength]
+
+        :param channel: 通道选择
+        :param operation_type: 强度变化模式
+        :param value: 强度数值，范围在 [0, 200]
+        :return: 结果与 [`DGLabClient.set_strength`][pydglab_ws.client.base.DGLabClient.set_strength] 相同
+        """
+        return self._submit(lambda batch: batch.set_strength(channel, operation_type, value))
+
+    def add_pulses(self, channel: Channel, *pulses: Union[PulseOperation, PulseArray, PreparedPulses]) -> "Future[bool]":
+        """
+        下发波形数据，参考 [`DGLabClient.add_pulses`][pydglab_ws.client.base.DGLabClient.add_pulses]
+
+        :param channel: 通道选择
+        :param pulses: 波形操作数据，最大长度为 100
+        :return: 结果与 [`DGLabClient.add_pulses`][pydglab_ws.client.base.DGLabClient.add_pulses] 相同，
+            波形数据有误时会设置对应的异常
+        """
+        return self._submit(lambda batch: batch.add_pulses(channel, *pulses))
+
+    def clear_pulses(self, channel: Channel) -> "Future[bool]":
+        """
+        清空波形队列，参考 [`DGLabClient.clear_pulses`][pydglab_ws.client.base.DGLabClient.clear_pulses]
+
+        :param channel: 通道选择
+        :return: 结果与 [`DGLabClient.clear_pulses`][pydglab_ws.client.base.DGLabClient.clear_pulses] 相同
+        """
+        return self._submit(lambda batch: batch.clear_pulses(channel))
+
+    def bind(self, timeout: float = None) -> bool:
+        """
+        等待与 DG-Lab App 的关系绑定，后台线程启动后会自动等待 App 扫码绑定
+
+        :param timeout: 超时时间（秒）
+        :return: 是否已完成绑定，超时返回 ``False``
+        """
+        return self._bound.wait(timeout)
@@ -1,29 +1,91 @@
 import asyncio
 import ipaddress
+import time
 from ssl import SSLSocket
-from typing import Optional
+from typing import Optional, Callable, Awaitable, Set, Any, Coroutine, List, Tuple, Union
 
-from websockets import WebSocketClientProtocol
+from pydantic import UUID4
+from websockets import WebSocketClientProtocol, ConnectionClosed
+from websockets.frames import OP_TEXT
 
 from .base import DGLabClient
-from ..models import WebSocketMessage
+from .reconnect import ReconnectPolicy, ReconnectStats
+from ..codec import get_json_codec
+from ..enums import MessageType, MessageDataHead, RetCode, FeedbackButton
+from ..log import EventLogger
+from ..models import WebSocketMessage, StrengthData, StrengthRecord
+from ..utils import dump_message_prefix, dump_message, parse_strength_record, parse_feedback_data
 
 __all__ = ["DGLabWSClient"]
 
+_log = EventLogger("pydglab_ws.client")
+
+_RET_CODES = {str(code.value): code for code in RetCode}
+"""``message`` 中的响应码文本到响应码的映射"""
+_HEARTBEAT = MessageType.HEARTBEAT.value
+_MSG = MessageType.MSG.value
+_STRENGTH_PREFIX = f"{MessageDataHead.STRENGTH.value}-"
+_FEEDBACK_PREFIX = f"{MessageDataHead.FEEDBACK.value}-"
+
+
+def _sniff_message(raw_message: Union[str, bytes], client_id: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    不经 Pydantic 校验，快速取出消息的 ``type`` 和 ``message``
+
+    :param client_id: 自身终端 ID 的文本
+    :return: 消息不是发给该终端、格式不符合预期时返回 ``None``，此时应完整解析消息
+    """
+    try:
+        message = get_json_codec().loads(raw_message)
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or client_id is None or message.get("clientId") != client_id:
+        return None
+    msg_type, msg = message.get("type"), message.get("message")
+    if isinstance(msg_type, str) and isinstance(msg, str):
+        return msg_type, msg
+    return None
+
 
 class DGLabWSClient(DGLabClient):
     """
     DG-Lab WebSocket 终端
 
+    提供 ``reconnect_policy`` 和 ``connector`` 后将启用自动重连：
+    连接断开，或超过一定时间（根据观测到的心跳间隔判定）未收到任何消息时，
+    按照重连策略重新建立连接并注册，正在接收数据的协程（例如 ``data_generator``）不会因此中断。
+    注意重连后 ``clientId`` 会发生变化，需要 App 重新扫码绑定，可通过 :meth:`add_reconnect_callback` 获取通知
+
     :param websocket: 与 WebSocket 服务端的连接
     :param register_timeout: 终端注册（获取 ``clientId``）超时时间
+    :param reconnect_policy: 自动重连策略
+    :param connector: 用于建立新连接的协程函数
     :raise asyncio.Timeout: 终端注册（获取 ``clientId``）超时
     """
 
-    def __init__(self, websocket: WebSocketClientProtocol, register_timeout: float = None):
+    def __init__(
+            self,
+            websocket: WebSocketClientProtocol,
+            register_timeout: float = None,
+            reconnect_policy: ReconnectPolicy = None,
+            connector: Callable[[], Awaitable[WebSocketClientProtocol]] = None
+    ):
         super().__init__()
         self._websocket = websocket
         self._register_timeout = register_timeout
+        self._reconnect_policy = reconnect_policy if connector is not None else None
+        self._connector = connector
+        self._reconnect_lock = asyncio.Lock()
+        self._reconnect_stats = ReconnectStats()
+        self._reconnect_callbacks: Set[Callable[["DGLabWSClient"], Any]] = set()
+        self._reconnected_websockets: List[WebSocketClientProtocol] = []
+        self._last_heartbeat_time: Optional[float] = None
+        self._heartbeat_interval: Optional[float] = None
+        self._closing = False
+        self._message_prefix_key: Optional[Tuple[MessageType, Optional[UUID4], Optional[UUID4]]] = None
+        self._message_prefix = ""
+        self._client_id_text_key: Optional[UUID4] = None
+        self._client_id_text: Optional[str] = None
 
     async def __aenter__(self) -> "DGLabWSClient":
         if self._register_timeout is not None:
@@ -33,14 +95,230 @@ class DGLabWSClient(DGLabClient):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
+        self._closing = True
+        await self.close()
+        # 最初的连接由调用方关闭，此处只关闭重连时建立的连接
+        for websocket in self._reconnected_websockets:
+            await websocket.close()
+        self._reconnected_websockets.clear()
+
+    @property
+    def reconnect_enabled(self) -> bool:
+        """是否启用了自动重连"""
+        return self._reconnect_policy is not None
+
+    @property
+    def reconnect_stats(self) -> ReconnectStats:
+        """重连统计，包含断线次数、重连次数和恢复耗时等"""
+        return self._reconnect_stats
+
+    @property
+    def heartbeat_interval(self) -> Optional[float]:
+        """观测到的服务端心跳间隔（秒），尚未收到两次心跳时为 ``None``"""
+        return self._heartbeat_interval
 
     async def _recv(self) -> WebSocketMessage:
-        raw_message = await self._websocket.recv()
-        return WebSocketMessage.model_validate_json(raw_message)
+        return self._validate(await self._recv_raw())
+
+    def _validate(self, raw_message: Union[str, bytes]) -> WebSocketMessage:
+        """完整解析消息，并记录心跳间隔"""
+        message = get_json_codec().load_message(raw_message)
+        if message.type == MessageType.HEARTBEAT:
+            self._record_heartbeat()
+        return message
+
+    def _record_heartbeat(self):
+        now = time.monotonic()
+        if self._last_heartbeat_time is not None:
+            self._heartbeat_interval = now - self._last_heartbeat_time
+        self._last_heartbeat_time = now
+
+    async def _recv_raw(self) -> Union[str, bytes]:
+        """接收一条原始消息，连接断开或失效时按照重连策略重连"""
+        while True:
+            websocket = self._websocket
+            timeout = self._reconnect_policy.dead_timeout(self._heartbeat_interval) \
+                if self.reconnect_enabled else None
+            try:
+                raw_message = await asyncio.wait_for(websocket.recv(), timeout)
+            except asyncio.TimeoutError:
+                # 长时间未收到任何消息，视为连接已失效
+                self._reconnect_stats.dead_peers += 1
+                websocket.transport.abort()
+                await self._reconnect(websocket)
+            except ConnectionClosed:
+                if not self.reconnect_enabled or self._closing:
+                    raise
+                await self._reconnect(websocket)
+            else:
+                return raw_message
+
+    async def _recv_data(
+            self,
+            targets: Tuple[type, ...]
+    ) -> Union[StrengthData, StrengthRecord, FeedbackButton, RetCode]:
+        # 先快速取出 type 和 message，心跳、强度和反馈数据不经 Pydantic 校验，
+        # 不需要的反馈数据和心跳直接跳过，其他消息完整解析
+        want_strength = not targets or StrengthData in targets
+        want_feedback = not targets or FeedbackButton in targets
+        want_ret_code = not targets or RetCode in targets
+        while True:
+            raw_message = await self._recv_raw()
+            if self._client_id_text_key != self._client_id:
+                self._client_id_text_key = self._client_id
+                self._client_id_text = str(self._client_id) if self._client_id is not None else None
+            if (sniffed := _sniff_message(raw_message, self._client_id_text)) is not None:
+                msg_type, msg = sniffed
+                if msg_type == _HEARTBEAT and msg in _RET_CODES:
+                    self._record_heartbeat()
+                    if want_ret_code:
+                        return _RET_CODES[msg]
+                    continue
+                if msg_type == _MSG:
+                    if msg.startswith(_STRENGTH_PREFIX):
+                        # 即使不需要强度数据，也要更新通道状态
+                        data = parse_strength_record(msg)
+                        self._on_strength(data)
+                        if want_strength:
+                            return self._strength_result(data)
+                        continue
+                    if msg.startswith(_FEEDBACK_PREFIX):
+                        if want_feedback:
+                            return parse_feedback_data(msg)
+                        continue
+            if (result := self._accept_message(self._validate(raw_message), targets)) is not None:
+                return result
+
+    async def _register_websocket(self, websocket: WebSocketClientProtocol):
+        """直接从新的连接中读取消息，完成注册"""
+        while True:
+            message = get_json_codec().load_message(await websocket.recv())
+            if message.type == MessageType.BIND and message.message == MessageDataHead.TARGET_ID:
+                self._client_id = message.client_id
+                return
+
+    async def _reconnect(self, broken: WebSocketClientProtocol):
+        """
+        按照重连策略重新建立连接并注册
+
+        :param broken: 已断开的连接，若其他协程已完成了重连，则直接返回
+        :raise ConnectionClosed: 重连次数达到上限
+        """
+        async with self._reconnect_lock:
+            if self._websocket is not broken:
+                return
+            start = time.monotonic()
+            self._reconnect_stats.disconnects += 1
+            _log.warning(
+                "client.disconnect",
+                "Connection of %s lost, reconnecting",
+                self._client_id,
+                client_id=self._client_id,
+                target_id=self._target_id
+            )
+            self._client_id = self._target_id = None
+            self._channel_state.reset()
+            self._last_heartbeat_time = self._heartbeat_interval = None
+            attempt = 0
+            while True:
+                if self._closing or (
+                        self._reconnect_policy.max_attempts is not None
+                        and attempt >= self._reconnect_policy.max_attempts
+                ):
+                    _log.warning(
+                        "client.reconnect_failed",
+                        "Gave up reconnecting after %d attempts",
+                        attempt,
+                        attempts=attempt
+                    )
+                    raise ConnectionClosed(broken.close_rcvd, broken.close_sent)
+                await asyncio.sleep(self._reconnect_policy.delay(attempt))
+                attempt += 1
+                self._reconnect_stats.attempts += 1
+                try:
+                    websocket = await self._connector()
+                except (OSError, asyncio.TimeoutError, ConnectionClosed):
+                    continue
+                try:
+                    await asyncio.wait_for(self._register_websocket(websocket), self._register_timeout)
+                except (asyncio.TimeoutError, ConnectionClosed):
+                    await websocket.close()
+                    continue
+                break
+            self._websocket = websocket
+            if broken in self._reconnected_websockets:
+                self._reconnected_websockets.remove(broken)
+            self._reconnected_websockets.append(websocket)
+            recovery_time = time.monotonic() - start
+            self._reconnect_stats.reconnects += 1
+            self._reconnect_stats.last_recovery_time = recovery_time
+            self._reconnect_stats.total_recovery_time += recovery_time
+            _log.info(
+                "client.reconnect",
+                "Reconnected as %s after %d attempts in %.3f seconds",
+                self._client_id,
+                attempt,
+                recovery_time,
+                client_id=self._client_id,
+                attempts=attempt,
+                recovery_time=recovery_time
+            )
+
+        for callback in self._reconnect_callbacks:
+            callback_ret = callback(self)
+            if isinstance(callback_ret, Coroutine):
+                await callback_ret
+
+    def add_reconnect_callback(self, func: Callable[["DGLabWSClient"], Any]):
+        """
+        添加回调函数，在自动重连并重新注册完成后调用，可用于重新生成二维码
+
+        :param func: 回调函数，传入终端对象，支持异步函数
+        """
+        self._reconnect_callbacks.add(func)
+
+    def remove_reconnect_callback(self, func: Callable[["DGLabWSClient"], Any]) -> bool:
+        """
+        移除在自动重连完成后调用的回调函数
+
+        :param func: 回调函数
+        :return: 是否找到了回调函数
+        """
+        try:
+            self._reconnect_callbacks.remove(func)
+        except KeyError:
+            return False
+        else:
+            return True
 
     async def _send(self, message: WebSocketMessage):
-        await self._websocket.send(message.model_dump_json(by_alias=True, context={"separators": (",", ":")}))
+        await self._websocket.send(get_json_codec().dump_message(message))
+
+    def _dump_owned(self, msg_type: MessageType, msg: str) -> str:
+        """序列化消息，绑定后 type, clientId, targetId 不再变化，缓存消息前缀，每次只序列化 message"""
+        key = msg_type, self._client_id, self._target_id
+        if key != self._message_prefix_key:
+            self._message_prefix = dump_message_prefix(*key)
+            self._message_prefix_key = key
+        return dump_message(self._message_prefix, msg)
+
+    async def _send_owned(self, msg_type: MessageType, msg: str):
+        await self._websocket.send(self._dump_owned(msg_type, msg))
+
+    async def _send_owned_many(self, messages: List[Tuple[MessageType, str]]):
+        # 与 websockets 的 send 相同，先确认连接未关闭，再逐帧写入传输层，最后只等待一次缓冲区排空
+        websocket = self._websocket
+        data = [self._dump_owned(msg_type, msg).encode() for msg_type, msg in messages]
+        await websocket.ensure_open()
+        for frame in data:
+            websocket.write_frame_sync(True, OP_TEXT, frame)
+        await websocket.drain()
+
+    async def _ping(self) -> Optional[float]:
+        start = time.monotonic()
+        pong_waiter = await self._websocket.ping()
+        await pong_waiter
+        return time.monotonic() - start
 
     def get_qrcode(self, uri: str = None) -> Optional[str]:
         if uri is None and (remote_address := self._websocket.remote_address):
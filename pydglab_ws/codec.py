@@ -0,0 +1,213 @@
+"""
+JSON 编解码后端
+
+WebSocket 消息的编码和解码都通过 [`JSONCodec`][pydglab_ws.codec.JSONCodec] 进行，
+默认按 ``orjson``、``msgspec`` 的顺序自动选用已安装的可选依赖，都未安装时使用标准库 ``json`` 和 pydantic-core。
+所有后端生成的消息完全相同：紧凑格式（无空格）、非 ASCII 字符不转义
+
+示例：
+```python3
+from pydglab_ws import set_json_codec, get_json_codec
+
+print(get_json_codec().name)
+set_json_codec("stdlib")
+```
+"""
+import json
+from abc import ABC, abstractmethod
+from enum import Enum, IntEnum
+from typing import Any, Union, Dict, Type
+
+from .models import WebSocketMessage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+__all__ = (
+    "JSONCodec",
+    "StdlibJSONCodec",
+    "OrjsonJSONCodec",
+    "MsgspecJSONCodec",
+    "available_json_codecs",
+    "get_json_codec",
+    "set_json_codec"
+)
+
+
+class JSONCodec(ABC):
+    """
+    JSON 编解码后端
+
+    子类需要实现 :meth:`dumps` 和 :meth:`loads`，
+    编码结果需要与 ``json.dumps(obj, separators=(",", ":"), ensure_ascii=False)`` 完全相同
+    """
+    name: str = ""
+    """后端名称"""
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> str:
+        """
+        编码为紧凑格式的 JSON 文本，非 ASCII 字符不转义
+
+        :param obj: 由 ``dict``、``list``、``str``、``int``、``bool``、``None`` 组成的对象
+        """
+        ...
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        解码 JSON 文本
+
+        :param data: JSON 文本
+        :raise ValueError: 不是合法的 JSON
+        """
+        ...
+
+    def dump_message(self, message: WebSocketMessage) -> str:
+        """
+        编码 WebSocket 消息，结果与 ``message.model_dump_json(by_alias=True)`` 相同
+
+        :param message: WebSocket 消息
+        """
+        value = message.message
+        if isinstance(value, IntEnum):
+            value = str(value.value)
+        elif isinstance(value, Enum):
+            value = value.value
+        return self.dumps({
+            "type": message.type.value,
+            "clientId": str(message.client_id) if message.client_id else "",
+            "targetId": str(message.target_id) if message.target_id else "",
+            "message": value
+        })
+
+    def load_message(self, data: Union[str, bytes]) -> WebSocketMessage:
+        """
+        解码并校验 WebSocket 消息
+
+        :param data: JSON 文本
+        :raise ValueError: 不是合法的 JSON，或不是合法的 WebSocket 消息（``pydantic.ValidationError``）
+        """
+        return WebSocketMessage.model_validate(self.loads(data))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    标准库 ``json`` 后端，总是可用
+
+    完整的 WebSocket 消息直接通过 pydantic-core 编码和校验，比经过标准库更快
+    """
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dump_message(self, message: WebSocketMessage) -> str:
+        return message.model_dump_json(by_alias=True)
+
+    def load_message(self, data: Union[str, bytes]) -> WebSocketMessage:
+        return WebSocketMessage.model_validate_json(data)
+
+
+class OrjsonJSONCodec(JSONCodec):
+    """
+    ``orjson`` 后端，需要安装可选依赖 ``orjson``
+
+    :raise ImportError: 未安装 ``orjson``
+    """
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonJSONCodec requires orjson, install it with: pip install pydglab-ws[orjson]")
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecJSONCodec(JSONCodec):
+    """
+    ``msgspec`` 后端，需要安装可选依赖 ``msgspec``
+
+    :raise ImportError: 未安装 ``msgspec``
+    """
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("MsgspecJSONCodec requires msgspec, install it with: pip install pydglab-ws[msgspec]")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+
+# 自动选用时的优先顺序
+_CODEC_TYPES: Dict[str, Type[JSONCodec]] = {
+    OrjsonJSONCodec.name: OrjsonJSONCodec,
+    MsgspecJSONCodec.name: MsgspecJSONCodec,
+    StdlibJSONCodec.name: StdlibJSONCodec
+}
+
+
+def available_json_codecs() -> Dict[str, Type[JSONCodec]]:
+    """当前环境中可用的后端，按自动选用时的优先顺序排列"""
+    modules = {OrjsonJSONCodec.name: orjson, MsgspecJSONCodec.name: msgspec}
+    return {
+        name: codec_type for name, codec_type in _CODEC_TYPES.items()
+        if modules.get(name, json) is not None
+    }
+
+
+def _auto_codec() -> JSONCodec:
+    return next(iter(available_json_codecs().values()))()
+
+
+_codec: JSONCodec = _auto_codec()
+
+
+def get_json_codec() -> JSONCodec:
+    """获取当前使用的后端"""
+    return _codec
+
+
+def set_json_codec(codec: Union[JSONCodec, str, None] = None) -> JSONCodec:
+    """
+    设置全局使用的后端，之后编码和解码的消息都将使用该后端
+
+    :param codec: 后端对象，或后端名称 ``"orjson"``、``"msgspec"``、``"stdlib"``，为 ``None`` 时自动选用
+    :return: 设置后使用的后端
+    :raise KeyError: 后端名称不存在
+    :raise ImportError: 后端所需的可选依赖未安装
+    """
+    global _codec
+    if codec is None:
+        _codec = _auto_codec()
+    elif isinstance(codec, str):
+        _codec = _CODEC_TYPES[codec]()
+    else:
+        _codec = codec
+    return _codec
@@ -10,7 +10,10 @@ __all__ = (
     "MessageDataHead",
     "StrengthOperationType",
     "FeedbackButton",
-    "Channel"
+    "Channel",
+    "DispatchQueue",
+    "ConnectionState",
+    "RampCurve"
 )
 
 
@@ -142,3 +145,51 @@ class Channel(IntEnum):
     """
     A = 1
     B = 2
+
+
+@enum.unique
+class DispatchQueue(str, Enum):
+    """
+    终端消息分发器中的队列类型
+
+    :ivar STRENGTH: 强度数据
+    :ivar FEEDBACK: App 反馈按钮
+    :ivar HEARTBEAT: 心跳
+    :ivar BREAK: App 断开连接
+    :ivar BIND: 终端注册与关系绑定结果
+    :ivar RET_CODE: 其他 ``msg`` 类型消息中的响应码，例如消息长度大于 1950
+    """
+    STRENGTH = "strength"
+    FEEDBACK = "feedback"
+    HEARTBEAT = "heartbeat"
+    BREAK = "break"
+    BIND = "bind"
+    RET_CODE = "ret_code"
+
+
+@enum.unique
+class ConnectionState(str, Enum):
+    """
+    WebSocket 终端的连接状态
+
+    :ivar CONNECTING: 正在连接或注册
+    :ivar REGISTERED: 已注册（获取到 ``clientId``），尚未与 App 绑定
+    :ivar BOUND: 已与 App 绑定
+    :ivar CLOSED: 连接已关闭
+    """
+    CONNECTING = "connecting"
+    REGISTERED = "registered"
+    BOUND = "bound"
+    CLOSED = "closed"
+
+
+@enum.unique
+class RampCurve(str, Enum):
+    """
+    强度渐变曲线
+
+    :ivar LINEAR: 线性变化
+    :ivar EXPONENTIAL: 指数变化，开始时变化较慢，越接近目标变化越快
+    """
+    LINEAR = "linear"
+    EXPONENTIAL = "exponential"
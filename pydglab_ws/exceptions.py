@@ -1,7 +1,8 @@
 """
 此处定义了一些异常类
 """
-__all__ = ("InvalidStrengthData", "InvalidFeedbackData", "InvalidPulseOperation", "PulseDataTooLong")
+__all__ = ("InvalidStrengthData", "InvalidFeedbackData", "InvalidPulseOperation", "PulseDataTooLong", "DispatcherNotRunning",
+           "InvalidPulseLibrary", "StrengthUnknown")
 
 from typing import Any
 
@@ -32,3 +33,24 @@ class PulseDataTooLong(Exception):
 
     def __init__(self, length: int):
         super().__init__(f"Pulse data too long: {length}")
+
+
+class DispatcherNotRunning(Exception):
+    """终端消息分发器未在运行"""
+
+    def __init__(self):
+        super().__init__("Dispatcher is not running")
+
+
+class InvalidPulseLibrary(Exception):
+    """波形库文件不合法"""
+
+    def __init__(self, path: Any, reason: str):
+        super().__init__(f"Invalid pulse library {path}: {reason}")
+
+
+class StrengthUnknown(Exception):
+    """通道强度未知，尚未收到 App 的强度数据"""
+
+    def __init__(self, channel: Any):
+        super().__init__(f"Strength of channel {channel} is unknown")
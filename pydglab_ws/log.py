@@ -0,0 +1,301 @@
+"""
+结构化日志
+
+服务端和终端在关键位置记录结构化日志事件，日志记录器均位于 ``pydglab_ws`` 之下
+（服务端为 ``pydglab_ws.server``，终端为 ``pydglab_ws.client``），默认不输出，需要按 :mod:`logging` 的方式配置。
+
+- 每条日志带有事件名称 ``record.event``（例如 ``server.bind``）和字段 ``record.fields``，
+  字段保存原始对象，只在日志真正输出时才格式化
+- 可按事件名称设置 [`EventPolicy`][pydglab_ws.log.EventPolicy]，进行采样和速率限制，
+  被丢弃的事件在判断日志级别之后、创建日志记录之前就会返回，开销很小
+- [`QueueLogging`][pydglab_ws.log.QueueLogging] 将日志放入有界队列，由后台线程输出，
+  队列已满时丢弃而不会阻塞事件循环
+
+示例：
+```python3
+import logging
+from pydglab_ws import EventPolicy, QueueLogging, set_event_policy
+
+logging.getLogger("pydglab_ws").setLevel(logging.DEBUG)
+# 转发的消息只记录 1%，且每秒最多 20 条
+set_event_policy("server.relay", EventPolicy(sample=0.01, max_per_second=20))
+with QueueLogging():
+    async with DGLabWSServer("0.0.0.0", 5678, 60):
+        await asyncio.Future()
+```
+"""
+import logging
+import logging.handlers
+import math
+import queue
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+from .codec import get_json_codec
+
+__all__ = (
+    "LOGGER_NAME",
+    "EventPolicy",
+    "EventLogger",
+    "JSONFormatter",
+    "QueueLogging",
+    "get_event_policy",
+    "set_event_policy"
+)
+
+LOGGER_NAME = "pydglab_ws"
+"""所有日志记录器的上级记录器名称"""
+
+# 未配置日志时不输出，避免 WARNING 级别的事件经由 logging.lastResort 输出到 stderr
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+@dataclass(frozen=True)
+class EventPolicy:
+    """
+    日志事件的采样和速率限制策略
+
+    :ivar sample: 采样比例 [0, 1]，按计数均匀采样，例如 ``0.01`` 时每 100 条记录 1 条
+    :ivar max_per_second: 每秒最多记录的条数，为 ``None`` 时不限制，允许短时间内突发 ``max(max_per_second, 1)`` 条
+    """
+    sample: float = 1.0
+    max_per_second: Optional[float] = None
+
+
+_DEFAULT_POLICY = EventPolicy()
+
+_policies: Dict[str, EventPolicy] = {
+    "server.relay": EventPolicy(sample=0.01, max_per_second=100),
+    "server.non_json": EventPolicy(max_per_second=10),
+    "server.invalid_source": EventPolicy(max_per_second=10),
+    "server.incompatible_relationship": EventPolicy(max_per_second=10),
+    "server.bind_failed": EventPolicy(max_per_second=10),
+    "client.ret_code": EventPolicy(max_per_second=10),
+    "client.break": EventPolicy(max_per_second=10),
+    "client.bind_failed": EventPolicy(max_per_second=10)
+}
+"""事件名称到策略的映射，默认只对高频事件和每条消息都可能触发的事件进行限制"""
+
+
+class _EventState:
+    """单个事件的采样计数和令牌桶状态"""
+    __slots__ = ("policy", "count", "tokens", "updated_at", "dropped")
+
+    def __init__(self, policy: EventPolicy):
+        self.policy = policy
+        self.count = 0
+        self.tokens = max(policy.max_per_second or 0, 1)
+        self.updated_at = time.monotonic()
+        self.dropped = 0
+
+    def accept(self) -> bool:
+        policy = self.policy
+        self.count += 1
+        if policy.sample < 1 and \
+                math.floor(self.count * policy.sample) == math.floor((self.count - 1) * policy.sample):
+            self.dropped += 1
+            return False
+        if (rate := policy.max_per_second) is not None:
+            now = time.monotonic()
+            self.tokens = min(self.tokens + (now - self.updated_at) * rate, max(rate, 1))
+            self.updated_at = now
+            if self.tokens < 1:
+                self.dropped += 1
+                return False
+            self.tokens -= 1
+        return True
+
+
+_states: Dict[str, _EventState] = {}
+
+
+def get_event_policy(event: str) -> EventPolicy:
+    """
+    获取日志事件的策略
+
+    :param event: 事件名称
+    """
+    return _policies.get(event, _DEFAULT_POLICY)
+
+
+def set_event_policy(event: str, policy: Optional[EventPolicy]):
+    """
+    设置日志事件的策略，会重置该事件的采样计数
+
+    :param event: 事件名称，例如 ``server.relay``
+    :param policy: 策略，为 ``None`` 时不进行采样和速率限制
+    """
+    if policy is None:
+        _policies.pop(event, None)
+    else:
+        _policies[event] = policy
+    _states.pop(event, None)
+
+
+class EventLogger:
+    """
+    记录结构化日志事件
+
+    :param name: 日志记录器名称，例如 ``pydglab_ws.server``
+    """
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def log(self, level: int, event: str, msg: str, *args: Any, **fields: Any):
+        """
+        记录日志事件
+
+        ``msg`` 与 ``args`` 按 :mod:`logging` 的方式延迟格式化，``fields`` 作为 ``record.fields`` 原样保存，
+        被策略丢弃的事件数量会记录在下一条输出的日志的 ``record.dropped`` 中
+
+        :param level: 日志级别
+        :param event: 事件名称
+        :param msg: 日志消息
+        :param args: 日志消息的格式化参数
+        :param fields: 结构化字段
+        """
+        if self.logger.isEnabledFor(level):
+            self._emit(level, event, msg, args, fields)
+
+    def _emit(self, level: int, event: str, msg: str, args: tuple, fields: Dict[str, Any]):
+        state = _states.get(event)
+        if state is None:
+            state = _states[event] = _EventState(get_event_policy(event))
+        if not state.accept():
+            return
+        dropped, state.dropped = state.dropped, 0
+        # 日志记录中的位置为调用 log / debug / info / warning 的位置
+        self.logger.log(
+            level,
+            msg,
+            *args,
+            extra={"event": event, "fields": fields, "dropped": dropped},
+            stacklevel=3
+        )
+
+    def debug(self, event: str, msg: str, *args: Any, **fields: Any):
+        """以 ``DEBUG`` 级别记录日志事件，参数见 :meth:`log`"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, event, msg, args, fields)
+
+    def info(self, event: str, msg: str, *args: Any, **fields: Any):
+        """以 ``INFO`` 级别记录日志事件，参数见 :meth:`log`"""
+        if self.logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, event, msg, args, fields)
+
+    def warning(self, event: str, msg: str, *args: Any, **fields: Any):
+        """以 ``WARNING`` 级别记录日志事件，参数见 :meth:`log`"""
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, event, msg, args, fields)
+
+
+def _field_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    将日志记录格式化为单行 JSON，包含时间、级别、记录器名称、事件名称、消息和结构化字段
+
+    不能直接编码为 JSON 的字段值（例如 ``UUID``、枚举）会转换为字符串
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage()
+        }
+        for key, value in getattr(record, "fields", {}).items():
+            data[key] = _field_value(value)
+        if dropped := getattr(record, "dropped", 0):
+            data["dropped"] = dropped
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return get_json_codec().dumps(data)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """队列已满时丢弃日志，且不在调用线程中格式化"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 日志只在同一进程的线程间传递，格式化留给后台线程
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # 停止时队列可能已满，等待后台线程取出日志后再放入结束标记
+        self.queue.put(self._sentinel)
+
+
+class QueueLogging:
+    """
+    将 ``pydglab_ws`` 的日志放入有界队列，由后台线程交给实际的处理器输出，记录日志时不会阻塞事件循环
+
+    可作为上下文管理器使用，退出时输出队列中剩余的日志
+
+    :param handlers: 实际输出日志的处理器，默认为输出到 ``stderr`` 的 ``StreamHandler``，
+        使用 [`JSONFormatter`][pydglab_ws.log.JSONFormatter]
+    :param max_size: 队列长度上限，队列已满时丢弃新的日志
+    :param logger_name: 日志记录器名称
+    """
+
+    def __init__(self, *handlers: logging.Handler, max_size: int = 10000, logger_name: str = LOGGER_NAME):
+        if not handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(JSONFormatter())
+            handlers = (handler,)
+        self._logger = logging.getLogger(logger_name)
+        self._handler = _NonBlockingQueueHandler(queue.Queue(max_size))
+        self._listener = _QueueListener(self._handler.queue, *handlers, respect_handler_level=True)
+        self._propagate = self._logger.propagate
+        self._started = False
+
+    @property
+    def dropped(self) -> int:
+        """因队列已满而丢弃的日志数量"""
+        return self._handler.dropped
+
+    def start(self):
+        """开始将日志放入队列，并启动后台线程"""
+        if self._started:
+            return
+        self._listener.start()
+        self._logger.addHandler(self._handler)
+        # 避免与上级记录器的处理器重复输出
+        self._propagate, self._logger.propagate = self._logger.propagate, False
+        self._started = True
+
+    def stop(self):
+        """停止将日志放入队列，输出队列中剩余的日志后停止后台线程"""
+        if not self._started:
+            return
+        self._logger.removeHandler(self._handler)
+        self._logger.propagate = self._propagate
+        self._listener.stop()
+        self._started = False
+
+    def __enter__(self) -> "QueueLogging":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
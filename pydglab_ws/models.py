@@ -2,7 +2,7 @@
 此处定义了一些 Pydantic 模型，使用 Pydantic V2
 """
 from enum import IntEnum
-from typing import Optional, Any, Union
+from typing import Optional, Any, Union, NamedTuple
 
 from pydantic import BaseModel, UUID4, ConfigDict, field_serializer, AliasGenerator, model_validator, \
     field_validator
@@ -11,7 +11,7 @@ from pydantic_core.core_schema import SerializerFunctionWrapHandler, FieldSerial
 
 from .enums import MessageType, RetCode, MessageDataHead
 
-__all__ = ("WS_MESSAGE_MAX_LENGTH", "WebSocketMessage", "StrengthData")
+__all__ = ("WS_MESSAGE_MAX_LENGTH", "WebSocketMessage", "StrengthData", "StrengthRecord")
 
 WS_MESSAGE_MAX_LENGTH = 1950
 """WebSocket 消息最大长度"""
@@ -100,3 +100,29 @@ class StrengthData(BaseModel):
     b: int
     a_limit: int
     b_limit: int
+
+    def to_record(self) -> "StrengthRecord":
+        """转换为 [`StrengthRecord`][pydglab_ws.models.StrengthRecord]"""
+        return StrengthRecord(self.a, self.b, self.a_limit, self.b_limit)
+
+
+class StrengthRecord(NamedTuple):
+    """
+    强度数据，不可变、可哈希，比较和创建的开销远小于 [`StrengthData`][pydglab_ws.models.StrengthData]
+
+    字段与 ``StrengthData`` 相同，可通过 [`StrengthData.to_record`][pydglab_ws.models.StrengthData.to_record] 转换后比较；
+    终端设置 [`strength_records`][pydglab_ws.client.base.DGLabClient.strength_records] 后收到的强度数据为该类型
+
+    :ivar a: A 通道强度
+    :ivar b: B 通道强度
+    :ivar a_limit: A 通道强度上限
+    :ivar b_limit: B 通道强度上限
+    """
+    a: int
+    b: int
+    a_limit: int
+    b_limit: int
+
+    def to_model(self) -> StrengthData:
+        """转换为 [`StrengthData`][pydglab_ws.models.StrengthData]"""
+        return StrengthData(a=self.a, b=self.b, a_limit=self.a_limit, b_limit=self.b_limit)
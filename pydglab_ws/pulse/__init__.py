@@ -0,0 +1,3 @@
+from .array import *
+from .prepared import *
+from .library import *
@@ -0,0 +1,56 @@
+"""
+波形操作数据的编码，不依赖 ``pydglab_ws.utils``，供 :mod:`pydglab_ws.utils` 与 :mod:`pydglab_ws.pulse` 共同使用
+"""
+from typing import List, Union, Tuple
+
+from .array import PulseArray
+from ..codec import get_json_codec
+from ..enums import Channel, MessageDataHead
+from ..exceptions import InvalidPulseOperation
+from ..models import WS_MESSAGE_MAX_LENGTH
+from ..typing import PulseOperation
+
+# {"type":"msg","clientId":"","targetId":"","message":"pulse-A:[]"} - 65bit
+# {"type":"msg","clientId":"`32bit`","targetId":"`32bit`","message":"pulse-A:[]"} - 129bit
+# \"`16bit`\", - 21bit
+# {"type":"msg","clientId":"`32bit`","targetId":"`32bit`","message":"pulse-A:[\"`16bit`\",\"`16bit`\"]"}
+PULSE_DATA_MAX_LENGTH = (WS_MESSAGE_MAX_LENGTH - 129 + 1) // 21  # 86
+"""
+波形操作列表最大长度，计算结果为 ``86``
+
+``(WS_MESSAGE_MAX_LENGTH - 129 + 1) // 21``
+"""
+
+
+def dump_pulse_operation(pulse: PulseOperation) -> str:
+    """
+    生成波形操作的数据
+
+    :param pulse: 波形操作数据
+    :return: 返回数据与蓝牙协议类似
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    """
+    try:
+        pulse_bytes = bytes().join(
+            # int.to_bytes Python 3.11 才添加了 length, byteorder 的默认参数值
+            value.to_bytes(
+                length=1,
+                byteorder='big'
+            ) for operation in pulse for value in operation
+        )
+    except (TypeError, AttributeError, OverflowError) as e:
+        raise InvalidPulseOperation(pulse) from e
+    else:
+        return pulse_bytes.hex()
+
+
+def _dump_pulse_operations(pulses: Tuple[Union[PulseOperation, PulseArray], ...]) -> List[str]:
+    """生成多条波形操作的数据，传入单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray] 时整批编码"""
+    if len(pulses) == 1 and isinstance(pulses[0], PulseArray):
+        return pulses[0].to_hex()
+    return [dump_pulse_operation(pulse) for pulse in pulses]
+
+
+def _dump_add_pulses(channel: Channel, dumped: List[str]) -> str:
+    """由已编码的波形操作数据生成下放波形操作的数据"""
+    return f"{MessageDataHead.PULSE.value}-{channel.name}:{get_json_codec().dumps(dumped)}"
@@ -0,0 +1,138 @@
+"""
+基于 NumPy 的波形操作数据数组，需要安装可选依赖 ``numpy``
+"""
+from typing import Iterable, List, Iterator, Union, Any, overload
+
+from ..exceptions import InvalidPulseOperation
+from ..typing import PulseOperation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = (
+    "PULSE_FREQUENCY_RANGE",
+    "PULSE_STRENGTH_RANGE",
+    "PulseArray"
+)
+
+PULSE_FREQUENCY_RANGE = (10, 240)
+"""波形频率的范围"""
+
+PULSE_STRENGTH_RANGE = (0, 100)
+"""波形强度的范围"""
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("PulseArray requires numpy, install it with: pip install pydglab-ws[numpy]")
+
+
+class PulseArray:
+    """
+    波形操作数据数组，内部为 ``N×8`` 的 ``uint8`` 数组，每行依次为 4 个波形频率和 4 个波形强度
+
+    - 创建时对整个数组进行范围校验（频率 [10, 240]，强度 [0, 100]），也可以选择截断到范围内
+    - 可直接传入 [`dump_add_pulses`][pydglab_ws.utils.dump_add_pulses]、
+      [`DGLabClient.add_pulses`][pydglab_ws.client.base.DGLabClient.add_pulses] 等，
+      整批数据一次性编码为十六进制
+    - 可迭代，每项为 [`PulseOperation`][pydglab_ws.typing.PulseOperation]
+
+    示例：
+    ```python3
+    pulses = PulseArray([((10, 10, 20, 30), (0, 5, 10, 50))] * 10)
+    await client.add_pulses(Channel.A, pulses)
+    ```
+
+    :param data: 波形操作数据，可以是 [`PulseOperation`][pydglab_ws.typing.PulseOperation] 的序列，
+        或形状为 ``(N, 8)``、``(N, 2, 4)`` 的数组
+    :param clamp: 为 ``True`` 时将超出范围的值截断到范围内，否则抛出异常
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    :raise ImportError: 未安装 ``numpy``
+    """
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Union[Iterable[PulseOperation], "np.ndarray", "PulseArray"], clamp: bool = False):
+        _require_numpy()
+        if isinstance(data, PulseArray):
+            self._data = data._data
+            return
+        try:
+            source = np.asarray(data if isinstance(data, np.ndarray) else list(data))
+            # 直接转换为整数会截断浮点数，与逐条编码时的校验不一致
+            if source.size and not (np.issubdtype(source.dtype, np.integer) or source.dtype == np.bool_):
+                raise TypeError(f"Pulse data must be integers, got {source.dtype}")
+            array = source.astype(np.int64).reshape(-1, 8)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise InvalidPulseOperation(data) from e
+        frequency, strength = array[:, :4], array[:, 4:]
+        if clamp:
+            np.clip(frequency, *PULSE_FREQUENCY_RANGE, out=frequency)
+            np.clip(strength, *PULSE_STRENGTH_RANGE, out=strength)
+        else:
+            invalid = (
+                    (frequency < PULSE_FREQUENCY_RANGE[0]) | (frequency > PULSE_FREQUENCY_RANGE[1])
+            ).any(axis=1) | (
+                    (strength < PULSE_STRENGTH_RANGE[0]) | (strength > PULSE_STRENGTH_RANGE[1])
+            ).any(axis=1)
+            if invalid.any():
+                raise InvalidPulseOperation(self._to_pulse(array[invalid.argmax()]))
+        self._data = array.astype(np.uint8)
+        self._data.flags.writeable = False
+
+    @staticmethod
+    def _to_pulse(row: "np.ndarray") -> PulseOperation:
+        values = row.tolist()
+        return tuple(values[:4]), tuple(values[4:])
+
+    @classmethod
+    def _from_array(cls, array: "np.ndarray") -> "PulseArray":
+        """直接使用已校验的数组创建，不再进行校验"""
+        pulse_array = cls.__new__(cls)
+        pulse_array._data = array
+        return pulse_array
+
+    @property
+    def data(self) -> "np.ndarray":
+        """只读的 ``N×8`` ``uint8`` 数组"""
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @overload
+    def __getitem__(self, item: int) -> PulseOperation:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> "PulseArray":
+        ...
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[PulseOperation, "PulseArray"]:
+        if isinstance(item, slice):
+            return self._from_array(self._data[item])
+        return self._to_pulse(self._data[item])
+
+    def __iter__(self) -> Iterator[PulseOperation]:
+        return iter(self.to_pulses())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PulseArray):
+            return np.array_equal(self._data, other._data)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PulseArray({self.to_pulses()!r})"
+
+    def to_pulses(self) -> List[PulseOperation]:
+        """转换为 [`PulseOperation`][pydglab_ws.typing.PulseOperation] 列表"""
+        return [(tuple(row[:4]), tuple(row[4:])) for row in self._data.tolist()]
+
+    def to_hex(self) -> List[str]:
+        """
+        将整批数据一次性编码为十六进制，结果与对每条数据调用
+        [`dump_pulse_operation`][pydglab_ws.utils.dump_pulse_operation] 相同
+        """
+        dumped = self._data.tobytes().hex()
+        return [dumped[i:i + 16] for i in range(0, len(dumped), 16)]
@@ -0,0 +1,666 @@
+"""
+将 DG-Lab App 导出的波形数据 ``appPulseData.json`` 转换为波形操作数据，需要安装可选依赖 ``numpy``
+
+- 波形频率通过预先计算的查找表转换，插值计算使用 NumPy 向量化
+- 多个波形可通过进程池并行转换
+- 按波形内容的哈希值缓存转换结果，再次运行时只转换发生变化的波形，也只重写发生变化的输出文件
+- 读取、转换和写入都可以流式进行，内存占用与波形数量无关
+
+也可以作为命令行工具使用：``python -m pydglab_ws.pulse.convert appPulseData.json -o output``
+"""
+import argparse
+import filecmp
+import hashlib
+import itertools
+import json
+import math
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List, Tuple, Any, Dict, Optional, Union, Iterable, Sequence, Iterator, TextIO, Deque, Set
+
+from pydantic import BaseModel, RootModel, field_validator
+
+from .array import _require_numpy
+from .library import write_pulse_library
+from ..typing import PulseOperation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = (
+    "PointData",
+    "PulseData",
+    "PulseDataTable",
+    "FREQUENCY_LUT",
+    "read_pulse_data_from_json",
+    "iter_pulse_data_from_json",
+    "ms_to_frequency",
+    "parse_frequency",
+    "parse_part_time",
+    "parse_sleep_time",
+    "parse_strength_data",
+    "generate_frequency",
+    "generate_strength",
+    "convert_pulse_data",
+    "pulse_data_hash",
+    "ConvertCache",
+    "iter_convert_pulse_datas",
+    "convert_pulse_datas",
+    "write_pulse_data_outputs",
+    "main"
+)
+
+
+class PointData(BaseModel):
+    """波形小节中的强度点"""
+    x: int
+    y: float
+    anchor: bool
+
+
+class PulseData(BaseModel):
+    """
+    App 导出的波形数据
+
+    | AX	| 脉冲频率 0-83
+    | JX	| 小节时长 0-100
+    | L	    | 休息时长 0-100
+    | JIEX	| 启用小节 0-1
+    | PCX	| 脉冲频率变化规律 1-4
+    | BX	| 节内渐变第二参数 0-83
+    | CX	| 元内渐变第二参数 0-83
+
+    """
+    BG_A0: int
+    BG_A1: int
+    BG_A2: int
+    BG_B0: int
+    BG_B1: int
+    BG_B2: int
+    BG_C0: int
+    BG_C1: int
+    BG_C2: int
+    BG_J0: int
+    BG_J1: int
+    BG_J2: int
+    BG_JIE1: int
+    BG_JIE2: int
+    BG_L: int
+    BG_PC0: int
+    BG_PC1: int
+    BG_PC2: int
+    BG_ZY: int
+    BG_bg_createTime: str
+    BG_bg_id: int
+    BG_bg_updateTime: str
+    BG_classic: int
+    BG_defaultName: int
+    BG_playRate: int
+    BG_pluseID: str
+    BG_points1: List[PointData]
+    BG_points2: List[PointData]
+    BG_points3: List[PointData]
+    BG_waveName: str
+    BG_waveNameEn: str
+
+    @field_validator(
+        "BG_points1",
+        "BG_points2",
+        "BG_points3",
+        mode="before"
+    )
+    @classmethod
+    def validate_points(cls, value: Any):
+        if isinstance(value, str):
+            return json.loads(value)
+        else:
+            return value
+
+
+class PulseDataTable(RootModel):
+    """App 导出的所有波形数据"""
+    root: List[PulseData]
+
+
+class _CustomPulseDataJSONEncoder(json.JSONEncoder):
+    """每个波形占一行的 JSON 编码"""
+
+    def iterencode(self, obj, *args, **kwargs):
+        if isinstance(obj, dict):
+            items = []
+            for key, value in obj.items():
+                items.append(f"\n{' ' * self.indent}{self.encode(key)}: {self.encode(value)}")
+            return '{' + ','.join(items) + '\n}'
+        else:
+            return super().iterencode(obj, *args, **kwargs)
+
+    def encode(self, o: Any):
+        if isinstance(o, list) or isinstance(o, tuple):
+            return '[' + ', '.join(self.encode(element) for element in o) + ']'
+        else:
+            return super().encode(o)
+
+
+def read_pulse_data_from_json(path: Union[str, Path]) -> List[PulseData]:
+    """
+    读取 App 导出的波形数据
+
+    :param path: ``appPulseData.json`` 的路径
+    """
+    with Path(path).open(encoding="utf-8") as f:
+        return PulseDataTable.model_validate_json(f.read()).root
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(f: TextIO, chunk_size: int) -> Iterator[Any]:
+    """从文件中分块读取 JSON 数组，通过 ``JSONDecoder.raw_decode`` 逐个解析并返回其中的元素"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def read() -> bool:
+        """读取下一块数据，丢弃已解析的部分"""
+        nonlocal buffer, pos, eof
+        if not eof:
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                return True
+            eof = True
+        return False
+
+    def peek() -> str:
+        """跳过空白字符，返回下一个字符，文件结束时返回空字符串"""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read():
+                return ""
+
+    if peek() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    if peek() == "]":
+        return
+    while True:
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if read():
+                    continue
+                raise
+            # 位于末尾的数字可能还未读取完整
+            if end == len(buffer) and read():
+                continue
+            break
+        pos = end
+        yield value
+        char = peek()
+        if char == ",":
+            pos += 1
+            peek()
+        elif char == "]":
+            return
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+
+
+def iter_pulse_data_from_json(path: Union[str, Path], chunk_size: int = 2 ** 16) -> Iterator[PulseData]:
+    """
+    流式读取 App 导出的波形数据，逐个解析并返回，内存占用与文件大小无关
+
+    :param path: ``appPulseData.json`` 的路径
+    :param chunk_size: 每次读取的字符数
+    :raise json.JSONDecodeError: JSON 格式错误
+    :raise pydantic.ValidationError: 波形数据不合法
+    """
+    with Path(path).open(encoding="utf-8") as f:
+        for value in _iter_json_array(f, chunk_size):
+            yield PulseData.model_validate(value)
+
+
+def ms_to_frequency(data: int) -> int:
+    """将脉冲周期（毫秒）转换为波形频率"""
+    if 10 <= data <= 100:
+        return data
+    elif 101 <= data <= 600:
+        return round((data - 100) / 5 + 100)
+    elif 601 <= data <= 1000:
+        return round((data - 600) / 10 + 200)
+    else:
+        return 10
+
+
+_FREQUENCY_BOUNDARY_MULTIPLE_PAIR = ((40, 1), (15, 2), (4, 5), (10, 10), (6, 100 / 3), (4, 50), (4, 100))
+# 每一段的累计边界、累计值和边界
+_FREQUENCY_SEGMENTS = tuple(zip(
+    itertools.accumulate(boundary for boundary, _ in _FREQUENCY_BOUNDARY_MULTIPLE_PAIR),
+    itertools.accumulate(boundary * multiple for boundary, multiple in _FREQUENCY_BOUNDARY_MULTIPLE_PAIR),
+    (boundary for boundary, _ in _FREQUENCY_BOUNDARY_MULTIPLE_PAIR)
+))
+
+
+def parse_frequency(data: int) -> int:
+    """将 App 中的脉冲频率 [0, 83] 转换为脉冲周期（毫秒）"""
+    accumulate, frequency_value, multiple = _FREQUENCY_SEGMENTS[-1]
+    for accumulate, frequency_value, multiple in _FREQUENCY_SEGMENTS:
+        if accumulate >= data:
+            break
+    return round(frequency_value - (accumulate - data) * multiple)
+
+
+FREQUENCY_LUT = tuple(ms_to_frequency(parse_frequency(data)) for data in range(84))
+"""App 中的脉冲频率 [0, 83] 到波形频率的查找表"""
+
+
+def _frequency(data: int) -> int:
+    """将 App 中的脉冲频率转换为波形频率"""
+    if 0 <= data < len(FREQUENCY_LUT):
+        return FREQUENCY_LUT[data]
+    return ms_to_frequency(parse_frequency(data))
+
+
+_PART_TIME = {
+    0: 0.1,
+    6: 0.2,
+    20: 0.9,
+    22: 1.0,
+    25: 1.2,
+    33: 1.8,
+    35: 2.0,
+    36: 2.1,
+    39: 2.3,
+    40: 2.4,
+    41: 2.5,
+    44: 2.8,
+    45: 2.9,
+    53: 3.7,
+}
+
+
+def parse_part_time(data: int) -> float:
+    """
+    将 App 中的小节时长转换为秒
+
+    :raise KeyError: 未知的小节时长
+    """
+    try:
+        return _PART_TIME[data]
+    except KeyError:
+        raise KeyError(f"parse_part_time: {data} not in known values") from None
+
+
+def parse_sleep_time(data: int) -> float:
+    """将 App 中的休息时长转换为秒"""
+    return (data // 10) / 10
+
+
+def parse_strength_data(data: float) -> int:
+    """将 App 中强度点的 ``y`` [0, 20] 转换为波形强度"""
+    return round((100 / 20) * data)
+
+
+def _interpolate(count: int, start: float, end: float) -> List[int]:
+    """
+    在 ``[0, count)`` 上从 ``start`` 到 ``end`` 线性插值并取整，最后一个值固定为 ``end``，
+    ``count`` 不大于 1 时只有 ``end``
+    """
+    if count <= 1:
+        return [round(end)]
+    values = start + (end - start) * np.arange(count, dtype=np.float64) / count
+    values[-1] = end
+    return np.rint(values).astype(np.int64).tolist()
+
+
+def _chunks(values: List[int]) -> List[Tuple[int, ...]]:
+    """每 4 个值为一组"""
+    return [tuple(values[i:i + 4]) for i in range(0, len(values), 4)]
+
+
+def generate_frequency(pcx: int, point_num: int, ax: int, bx: int, cx: int) -> List[Tuple[int, ...]]:
+    """
+    生成波形小节的波形频率操作数据
+
+    :param pcx: 脉冲频率变化规律 [1, 4]
+    :param point_num: 强度点数量
+    :param ax: 脉冲频率
+    :param bx: 节内渐变第二参数
+    :param cx: 元内渐变第二参数
+    :raise KeyError: 未知的脉冲频率变化规律
+    """
+    if pcx == 1:
+        return [(_frequency(ax),) * 4] * point_num
+    elif pcx == 2:
+        return _chunks(_interpolate(point_num * 4, _frequency(ax), _frequency(bx)))
+    elif pcx == 3:
+        return [tuple(_interpolate(4, _frequency(ax), _frequency(cx)))] * point_num
+    elif pcx == 4:
+        return [(frequency,) * 4 for frequency in _interpolate(point_num, _frequency(ax), _frequency(cx))]
+    raise KeyError(pcx)
+
+
+def generate_strength(point_datas: List[PointData]) -> List[Tuple[int, ...]]:
+    """
+    生成波形小节的波形强度操作数据
+
+    :param point_datas: 强度点
+    """
+    strength_data = []
+    for index, point in enumerate(point_datas):
+        current_strength = parse_strength_data(point.y)
+        if point.anchor:
+            strength_data.append((current_strength,) * 4)
+        else:
+            last_point = point_datas[index - 1]
+            strength_data.extend(
+                _chunks(
+                    _interpolate(
+                        (point.x - last_point.x) * 4,
+                        parse_strength_data(last_point.y),
+                        current_strength
+                    )
+                )
+            )
+    return strength_data
+
+
+def _generate_operations_from_part(
+        ax: int,
+        bx: int,
+        cx: int,
+        pcx: int,
+        jx: int,
+        point_datas: List[PointData]
+) -> List[PulseOperation]:
+    """生成波形小节的波形操作数据"""
+    frequencies = generate_frequency(pcx, len(point_datas), ax, bx, cx)
+    strength = generate_strength(point_datas)
+    operations = list(zip(frequencies, strength))
+    repeat = math.ceil(parse_part_time(jx) / len(point_datas) * 0.1)
+    return operations * repeat
+
+
+def convert_pulse_data(pulse_data: PulseData) -> List[PulseOperation]:
+    """
+    将 App 导出的单个波形转换为波形操作数据
+
+    :param pulse_data: App 导出的波形数据
+    :raise ImportError: 未安装 ``numpy``
+    """
+    _require_numpy()
+    parts = [
+        (pulse_data.BG_A0, pulse_data.BG_B0, pulse_data.BG_C0, pulse_data.BG_PC0, pulse_data.BG_J0,
+         pulse_data.BG_points1)
+    ]
+    if pulse_data.BG_JIE1:
+        parts.append(
+            (pulse_data.BG_A1, pulse_data.BG_B1, pulse_data.BG_C1, pulse_data.BG_PC1, pulse_data.BG_J1,
+             pulse_data.BG_points2)
+        )
+    if pulse_data.BG_JIE2:
+        parts.append(
+            (pulse_data.BG_A2, pulse_data.BG_B2, pulse_data.BG_C2, pulse_data.BG_PC2, pulse_data.BG_J2,
+             pulse_data.BG_points3)
+        )
+    operations = []
+    for part in parts:
+        operations.extend(_generate_operations_from_part(*part))
+    sleep_time = parse_sleep_time(pulse_data.BG_L)
+    operations.extend([((0, 0, 0, 0), (0, 0, 0, 0))] * round(sleep_time * 1000 / 100))
+    return operations
+
+
+def pulse_data_hash(pulse_data: PulseData) -> str:
+    """
+    计算 App 导出的波形数据的哈希值，内容相同的波形哈希值相同
+
+    :param pulse_data: App 导出的波形数据
+    """
+    return hashlib.sha256(pulse_data.model_dump_json().encode("utf-8")).hexdigest()
+
+
+class ConvertCache:
+    """
+    按波形数据哈希值缓存的转换结果
+
+    每个转换结果保存为缓存目录中的一个 JSON 文件，读写时不需要将整个缓存加载到内存中
+
+    :param path: 缓存目录，不存在时自动创建
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._used: Set[str] = set()
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.path.glob("*.json"))
+
+    def __contains__(self, key: str) -> bool:
+        return self._entry(key).exists()
+
+    def get(self, key: str) -> Optional[List[PulseOperation]]:
+        """
+        获取缓存的转换结果，缓存不存在或已损坏时返回 ``None``
+
+        :param key: :func:`pulse_data_hash` 计算的哈希值
+        """
+        try:
+            with self._entry(key).open(encoding="utf-8") as f:
+                pulses = [(tuple(pulse[0]), tuple(pulse[1])) for pulse in json.load(f)]
+        except (OSError, ValueError, TypeError, IndexError):
+            return None
+        self._used.add(key)
+        return pulses
+
+    def put(self, key: str, pulses: List[PulseOperation]):
+        """
+        缓存转换结果
+
+        :param key: :func:`pulse_data_hash` 计算的哈希值
+        :param pulses: 转换结果
+        """
+        with self._entry(key).open("w", encoding="utf-8") as f:
+            json.dump(pulses, f, separators=(",", ":"))
+        self._used.add(key)
+
+    def prune(self) -> int:
+        """
+        移除创建本对象后未被读写过的缓存
+
+        :return: 移除的缓存数量
+        """
+        removed = 0
+        for entry in self.path.glob("*.json"):
+            if entry.stem not in self._used:
+                entry.unlink()
+                removed += 1
+        return removed
+
+
+def iter_convert_pulse_datas(
+        pulse_datas: Iterable[PulseData],
+        workers: Optional[int] = None,
+        cache: Optional[ConvertCache] = None
+) -> Iterator[Tuple[str, List[PulseOperation], bool]]:
+    """
+    依次转换多个 App 导出的波形，按输入顺序逐个返回转换结果
+
+    使用进程池时，同时转换的波形数量不超过进程数量的 4 倍，输入可以是
+    :func:`iter_pulse_data_from_json` 等生成器，内存占用与输入的波形数量无关
+
+    :param pulse_datas: App 导出的波形数据
+    :param workers: 进程池的进程数量，为 ``None`` 时为 CPU 数量，为 ``1`` 时在当前进程中转换
+    :param cache: 转换结果缓存，缓存中已有的波形不再转换
+    :return: 生成器，每项为波形名称、波形操作数据、是否经过转换（而不是来自缓存）
+    :raise ImportError: 未安装 ``numpy``
+    """
+    _require_numpy()
+    workers = workers or os.cpu_count() or 1
+    with ExitStack() as stack:
+        executor: Optional[ProcessPoolExecutor] = None
+        window: Deque[Tuple[str, str, Union[List[PulseOperation], "Future[List[PulseOperation]]"]]] = deque()
+
+        def pop() -> Tuple[str, List[PulseOperation], bool]:
+            name, key, result = window.popleft()
+            if not isinstance(result, Future):
+                return name, result, False
+            pulses = result.result()
+            if cache is not None:
+                cache.put(key, pulses)
+            return name, pulses, True
+
+        for pulse_data in pulse_datas:
+            key = pulse_data_hash(pulse_data) if cache is not None else ""
+            if cache is not None and (pulses := cache.get(key)) is not None:
+                window.append((pulse_data.BG_waveName, key, pulses))
+            elif workers == 1:
+                pulses = convert_pulse_data(pulse_data)
+                if cache is not None:
+                    cache.put(key, pulses)
+                # 不使用进程池时，窗口中只会有缓存的结果，且已全部返回
+                yield pulse_data.BG_waveName, pulses, True
+                continue
+            else:
+                if executor is None:
+                    executor = stack.enter_context(ProcessPoolExecutor(workers))
+                window.append((pulse_data.BG_waveName, key, executor.submit(convert_pulse_data, pulse_data)))
+            while len(window) > workers * 4 or (window and not isinstance(window[0][2], Future)):
+                yield pop()
+        while window:
+            yield pop()
+
+
+def convert_pulse_datas(
+        pulse_datas: Iterable[PulseData],
+        workers: Optional[int] = None,
+        cache: Optional[ConvertCache] = None
+) -> Tuple[Dict[str, List[PulseOperation]], List[str]]:
+    """
+    转换多个 App 导出的波形，参考 :func:`iter_convert_pulse_datas`
+
+    :param pulse_datas: App 导出的波形数据
+    :param workers: 进程池的进程数量，为 ``None`` 时为 CPU 数量，为 ``1`` 时在当前进程中转换
+    :param cache: 转换结果缓存，缓存中已有的波形不再转换
+    :return: 波形名称与波形操作数据，以及此次实际转换的波形名称
+    :raise ImportError: 未安装 ``numpy``
+    """
+    results: Dict[str, List[PulseOperation]] = {}
+    changed: List[str] = []
+    for name, pulses, converted in iter_convert_pulse_datas(pulse_datas, workers, cache):
+        results[name] = pulses
+        if converted:
+            changed.append(name)
+    return results, changed
+
+
+def write_pulse_data_outputs(
+        results: Iterable[Tuple[str, List[PulseOperation], bool]],
+        output: Union[str, Path]
+) -> int:
+    """
+    逐个写入转换结果：每个波形的 ``<波形名称>.json``、所有波形的 ``customPulseData.json`` 和二进制波形库
+    ``customPulseData.dgpl``，已存在且未发生变化的文件不会被重写
+
+    ``customPulseData.json`` 和 ``customPulseData.dgpl`` 先写入临时文件，与已有文件的内容不同时才替换，
+    因此波形被删除或顺序改变时，即使所有波形都没有变化也会重写
+
+    :param results: 每项为波形名称、波形操作数据、是否发生变化，例如 :func:`iter_convert_pulse_datas` 的结果
+    :param output: 输出目录
+    :return: 写入的文件数量
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    json_path = output / "customPulseData.json"
+    library_path = output / "customPulseData.dgpl"
+    json_temp_path = json_path.with_name(f"{json_path.name}.tmp")
+    library_temp_path = library_path.with_name(f"{library_path.name}.tmp")
+    encoder = _CustomPulseDataJSONEncoder(indent=4, ensure_ascii=False)
+    written = 0
+
+    with json_temp_path.open("w", encoding="utf-8") as json_file:
+        def waveforms() -> Iterator[Tuple[str, List[PulseOperation]]]:
+            nonlocal written
+            json_file.write("{")
+            for index, (name, pulses, changed) in enumerate(results):
+                path = output / f"{name}.json"
+                if changed or not path.exists():
+                    with path.open("w", encoding="utf-8") as file:
+                        json.dump(pulses, file)
+                    written += 1
+                # 与 _CustomPulseDataJSONEncoder.iterencode 的结果一致
+                json_file.write(f"{',' if index else ''}\n{' ' * 4}{encoder.encode(name)}: {encoder.encode(pulses)}")
+                yield name, pulses
+            json_file.write("\n}")
+
+        write_pulse_library(library_temp_path, waveforms())
+
+    for temp_path, path in (json_temp_path, json_path), (library_temp_path, library_path):
+        if path.exists() and filecmp.cmp(temp_path, path, shallow=False):
+            temp_path.unlink()
+        else:
+            os.replace(temp_path, path)
+            written += 1
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """
+    命令行入口，以流式读取、转换和写入波形，内存占用与 ``appPulseData.json`` 的大小无关
+
+    :param argv: 命令行参数，为 ``None`` 时使用 ``sys.argv``
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m pydglab_ws.pulse.convert",
+        description="Convert DG-Lab App waveforms (appPulseData.json) into pulse operations"
+    )
+    parser.add_argument("input", nargs="?", default="appPulseData.json", help="path of appPulseData.json")
+    parser.add_argument("-o", "--output", default=".", help="output directory")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="directory of the conversion cache, defaults to .pulse_data_cache in the output directory"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="convert every waveform again")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    cache = None if args.no_cache else ConvertCache(args.cache or output / ".pulse_data_cache")
+    total = converted = 0
+
+    def results() -> Iterator[Tuple[str, List[PulseOperation], bool]]:
+        nonlocal total, converted
+        for name, pulses, changed in iter_convert_pulse_datas(
+                iter_pulse_data_from_json(args.input),
+                args.workers,
+                cache
+        ):
+            total += 1
+            converted += changed
+            yield name, pulses, changed or cache is None
+
+    written = write_pulse_data_outputs(results(), output)
+    if cache is not None:
+        cache.prune()
+    print(f"{total} waveforms, {converted} converted, {written} files written")
+
+
+if __name__ == "__main__":
+    main()
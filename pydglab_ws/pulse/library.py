@@ -0,0 +1,231 @@
+"""
+二进制波形库文件的读写
+
+文件结构（小端序）：
+
+- 文件头，共 24 字节：魔数 ``DGPL``、格式版本 (``uint16``)、保留 (``uint16``)、波形数量 (``uint64``)、索引偏移 (``uint64``)
+- 波形数据：每条波形操作数据固定 8 字节，依次为 4 个波形频率和 4 个波形强度，各波形的数据连续存放
+- 索引：每个波形依次为数据偏移 (``uint64``)、波形操作数据数量 (``uint32``)、名称长度 (``uint16``)、UTF-8 编码的名称
+"""
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Tuple, Mapping, Iterable, Union, List, Iterator, Optional
+
+from .array import PulseArray, _require_numpy
+from .prepared import PreparedPulses
+from ..exceptions import InvalidPulseOperation, InvalidPulseLibrary
+from ..typing import PulseOperation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = (
+    "PULSE_LIBRARY_MAGIC",
+    "PULSE_LIBRARY_VERSION",
+    "PulseLibrary",
+    "write_pulse_library",
+    "convert_pulse_data_json"
+)
+
+PULSE_LIBRARY_MAGIC = b"DGPL"
+"""波形库文件的魔数"""
+
+PULSE_LIBRARY_VERSION = 1
+"""波形库文件的格式版本"""
+
+_HEADER = struct.Struct("<4sHHQQ")
+_INDEX_ENTRY = struct.Struct("<QIH")
+_PULSE_SIZE = 8
+
+
+def _dump_pulses(pulses: Union[Iterable[PulseOperation], PulseArray]) -> bytes:
+    """将波形数据编码为固定宽度的二进制数据"""
+    if isinstance(pulses, PulseArray):
+        return pulses.data.tobytes()
+    dumped = bytearray()
+    for pulse in pulses:
+        try:
+            pulse_bytes = bytes(value for operation in pulse for value in operation)
+        except (TypeError, ValueError) as e:
+            raise InvalidPulseOperation(pulse) from e
+        if len(pulse_bytes) != _PULSE_SIZE:
+            raise InvalidPulseOperation(pulse)
+        dumped += pulse_bytes
+    return bytes(dumped)
+
+
+def write_pulse_library(
+        path: Union[str, Path],
+        waveforms: Union[
+            Mapping[str, Union[Iterable[PulseOperation], PulseArray]],
+            Iterable[Tuple[str, Union[Iterable[PulseOperation], PulseArray]]]
+        ]
+):
+    """
+    将多个波形写入二进制波形库文件
+
+    :param path: 文件路径
+    :param waveforms: 波形名称与波形数据，也可以是逐个返回波形名称和波形数据的可迭代对象，写入时逐个读取
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    """
+    if isinstance(waveforms, Mapping):
+        waveforms = waveforms.items()
+    index = bytearray()
+    count = 0
+    with Path(path).open("wb") as f:
+        f.write(bytes(_HEADER.size))
+        offset = _HEADER.size
+        for name, pulses in waveforms:
+            count += 1
+            dumped = _dump_pulses(pulses)
+            f.write(dumped)
+            encoded_name = name.encode("utf-8")
+            index += _INDEX_ENTRY.pack(offset, len(dumped) // _PULSE_SIZE, len(encoded_name))
+            index += encoded_name
+            offset += len(dumped)
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(PULSE_LIBRARY_MAGIC, PULSE_LIBRARY_VERSION, 0, count, offset))
+
+
+def convert_pulse_data_json(json_path: Union[str, Path], library_path: Union[str, Path]) -> int:
+    """
+    将 ``scripts/pulse_data_db.py`` 导出的 ``customPulseData.json`` 转换为二进制波形库文件
+
+    :param json_path: JSON 文件路径
+    :param library_path: 波形库文件路径
+    :return: 波形数量
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    """
+    with Path(json_path).open(encoding="utf-8") as f:
+        waveforms: Dict[str, List[PulseOperation]] = json.load(f)
+    write_pulse_library(library_path, waveforms)
+    return len(waveforms)
+
+
+class PulseLibrary(Mapping[str, memoryview]):
+    """
+    通过内存映射读取二进制波形库文件
+
+    打开时只读取文件头和索引，波形数据在使用时才从内存映射中读取：
+
+    - 按名称获取的是形状为 ``(N, 8)`` 的只读 ``memoryview``，不会复制数据（空波形为一维的空 ``memoryview``）
+    - :meth:`array` 返回共享内存的 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]（需要安装 ``numpy``）
+    - :meth:`prepared` 返回 [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]，可直接下发
+
+    示例：
+    ```python3
+    with PulseLibrary("customPulseData.dgpl") as library:
+        await client.add_pulses(Channel.A, library.prepared("呼吸"))
+    ```
+
+    :param path: 文件路径
+    :raise InvalidPulseLibrary: [`InvalidPulseLibrary`][pydglab_ws.exceptions.InvalidPulseLibrary]
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = Path(path)
+        with self._path.open("rb") as f:
+            try:
+                self._mmap: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # 空文件无法映射
+                raise InvalidPulseLibrary(self._path, "file too short") from e
+        try:
+            self._index = self._read_index()
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _read_index(self) -> Dict[str, Tuple[int, int]]:
+        """读取文件头和索引"""
+        if len(self._mmap) < _HEADER.size:
+            raise InvalidPulseLibrary(self._path, "file too short")
+        magic, version, _, count, offset = _HEADER.unpack_from(self._mmap)
+        if magic != PULSE_LIBRARY_MAGIC:
+            raise InvalidPulseLibrary(self._path, "bad magic")
+        if version != PULSE_LIBRARY_VERSION:
+            raise InvalidPulseLibrary(self._path, f"unsupported version {version}")
+        index: Dict[str, Tuple[int, int]] = {}
+        try:
+            for _ in range(count):
+                data_offset, length, name_length = _INDEX_ENTRY.unpack_from(self._mmap, offset)
+                offset += _INDEX_ENTRY.size
+                name = self._mmap[offset:offset + name_length].decode("utf-8")
+                offset += name_length
+                if data_offset + length * _PULSE_SIZE > len(self._mmap):
+                    raise InvalidPulseLibrary(self._path, f"data of {name!r} out of range")
+                index[name] = data_offset, length
+        except (struct.error, UnicodeDecodeError) as e:
+            raise InvalidPulseLibrary(self._path, "bad index") from e
+        return index
+
+    def __enter__(self) -> "PulseLibrary":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        关闭内存映射
+
+        :raise BufferError: 之前返回的 ``memoryview`` 或 ``PulseArray`` 尚未释放
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __getitem__(self, name: str) -> memoryview:
+        offset, length = self._index[name]
+        view = memoryview(self._mmap)[offset:offset + length * _PULSE_SIZE]
+        # memoryview 不支持形状中含有 0
+        return view.cast("B", (length, _PULSE_SIZE)) if length else view
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def pulses(self, name: str) -> List[PulseOperation]:
+        """
+        获取波形的 [`PulseOperation`][pydglab_ws.typing.PulseOperation] 列表
+
+        :param name: 波形名称
+        """
+        offset, length = self._index[name]
+        data = self._mmap[offset:offset + length * _PULSE_SIZE]
+        return [
+            (tuple(data[i:i + 4]), tuple(data[i + 4:i + 8]))
+            for i in range(0, len(data), _PULSE_SIZE)
+        ]
+
+    def array(self, name: str) -> PulseArray:
+        """
+        获取与文件共享内存的只读 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]，不会进行范围校验
+
+        :param name: 波形名称
+        :raise ImportError: 未安装 ``numpy``
+        """
+        _require_numpy()
+        offset, length = self._index[name]
+        array = np.frombuffer(self._mmap, dtype=np.uint8, count=length * _PULSE_SIZE, offset=offset)
+        return PulseArray._from_array(array.reshape(length, _PULSE_SIZE))
+
+    def prepared(self, name: str) -> PreparedPulses:
+        """
+        获取波形对应的 [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
+
+        :param name: 波形名称
+        """
+        offset, length = self._index[name]
+        dumped = self._mmap[offset:offset + length * _PULSE_SIZE].hex()
+        return PreparedPulses._from_hex([dumped[i:i + 16] for i in range(0, len(dumped), 16)])
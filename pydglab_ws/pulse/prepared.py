@@ -0,0 +1,211 @@
+"""
+预先编码的波形数据，以及按波形内容缓存的 LRU 缓存
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple, Dict, List, Union
+
+from ._encode import PULSE_DATA_MAX_LENGTH, _dump_pulse_operations, _dump_add_pulses
+from .array import PulseArray
+from ..enums import Channel
+from ..exceptions import InvalidPulseOperation, PulseDataTooLong
+from ..typing import PulseOperation
+
+__all__ = (
+    "PreparedPulses",
+    "PulseCacheStats",
+    "PulseCache"
+)
+
+
+class PreparedPulses:
+    """
+    预先编码的波形数据
+
+    创建时一次性完成波形数据的十六进制编码，以及两个通道的消息内容，
+    之后可直接传入 [`DGLabClient.add_pulses`][pydglab_ws.client.base.DGLabClient.add_pulses]、
+    [`dump_add_pulses`][pydglab_ws.utils.dump_add_pulses] 等，不再重复编码
+
+    示例：
+    ```python3
+    prepared = PreparedPulses(*PULSE_DATA["呼吸"])
+    await client.add_pulses(Channel.A, prepared)
+    ```
+
+    :param pulses: 波形操作数据，或单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    """
+    __slots__ = ("_hex", "_messages", "_chunks")
+
+    def __init__(self, *pulses: Union[PulseOperation, PulseArray, "PreparedPulses"]):
+        if len(pulses) == 1 and isinstance(pulses[0], PreparedPulses):
+            self._init(list(pulses[0].hex))
+        else:
+            self._init(_dump_pulse_operations(pulses))
+
+    def _init(self, dumped: List[str]):
+        self._hex: Tuple[str, ...] = tuple(dumped)
+        self._messages: Dict[Channel, str] = {
+            channel: _dump_add_pulses(channel, dumped) for channel in Channel
+        }
+        self._chunks: Dict[Tuple[Channel, int], List[str]] = {}
+
+    @classmethod
+    def _from_hex(cls, dumped: List[str]) -> "PreparedPulses":
+        """直接使用已编码的波形操作数据创建，不再进行校验"""
+        prepared = cls.__new__(cls)
+        prepared._init(dumped)
+        return prepared
+
+    @property
+    def hex(self) -> Tuple[str, ...]:
+        """每条波形操作数据的十六进制编码"""
+        return self._hex
+
+    def __len__(self) -> int:
+        return len(self._hex)
+
+    def __repr__(self) -> str:
+        return f"PreparedPulses({list(self._hex)!r})"
+
+    def message(self, channel: Channel, max_length: int = PULSE_DATA_MAX_LENGTH) -> str:
+        """
+        获取下放波形操作的数据，可作为 WebSocket 消息中的 ``message``
+
+        :param channel: 通道选择
+        :param max_length: 波形操作列表最大长度，默认为 [`PULSE_DATA_MAX_LENGTH`][pydglab_ws.utils.PULSE_DATA_MAX_LENGTH]
+        :raise PulseDataTooLong: 波形操作数据过长
+        """
+        if (pulses_length := len(self._hex)) > max_length:
+            raise PulseDataTooLong(pulses_length)
+        return self._messages[channel]
+
+    def chunks(self, channel: Channel, max_length: int = PULSE_DATA_MAX_LENGTH) -> List[str]:
+        """
+        获取按 ``max_length`` 拆分后的多条下放波形操作的数据，结果会被缓存
+
+        :param channel: 通道选择
+        :param max_length: 每条数据的波形操作列表最大长度，默认为 [`PULSE_DATA_MAX_LENGTH`][pydglab_ws.utils.PULSE_DATA_MAX_LENGTH]
+        """
+        key = channel, max_length
+        if (chunks := self._chunks.get(key)) is None:
+            if len(self._hex) <= max_length:
+                chunks = [self._messages[channel]] if self._hex else []
+            else:
+                chunks = [
+                    _dump_add_pulses(channel, list(self._hex[i:i + max_length]))
+                    for i in range(0, len(self._hex), max_length)
+                ]
+            self._chunks[key] = chunks
+        return chunks.copy()
+
+
+def _pulse_key(pulse: PulseOperation) -> bytes:
+    """单条波形操作数据的字节，频率与强度各 4 个字节"""
+    try:
+        frequency, strength = pulse
+        data = bytes((*frequency, *strength))
+    except (TypeError, ValueError) as e:
+        raise InvalidPulseOperation(pulse) from e
+    if len(data) != 8 or len(frequency) != 4:
+        raise InvalidPulseOperation(pulse)
+    return data
+
+
+@dataclass
+class PulseCacheStats:
+    """
+    波形缓存统计
+
+    :ivar hits: 命中次数
+    :ivar misses: 未命中次数
+    :ivar evictions: 因超出容量而移除的数量
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率，尚未查询时为 ``0``"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PulseCache:
+    """
+    按波形内容缓存 [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses] 的 LRU 缓存
+
+    内容相同的波形只编码一次，超出容量时移除最久未使用的波形
+
+    示例：
+    ```python3
+    cache = PulseCache(max_size=64)
+    await client.add_pulses(Channel.A, cache.prepare(*PULSE_DATA["呼吸"]))
+    print(cache.stats.hit_rate)
+    ```
+
+    :param max_size: 最多缓存的波形数量
+    :param max_pulses: 所有缓存的波形操作数据总数上限，为 ``None`` 时不限制
+    """
+
+    def __init__(self, max_size: int = 128, max_pulses: int = None):
+        self.max_size = max_size
+        self.max_pulses = max_pulses
+        self._cache: "OrderedDict[bytes, PreparedPulses]" = OrderedDict()
+        self._pulses = 0
+        self._stats = PulseCacheStats()
+
+    @property
+    def stats(self) -> PulseCacheStats:
+        """缓存统计"""
+        return self._stats
+
+    @property
+    def pulses(self) -> int:
+        """当前缓存的波形操作数据总数"""
+        return self._pulses
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _key(pulses: Tuple[Union[PulseOperation, PulseArray], ...]) -> bytes:
+        """
+        波形内容的键，与 [`PulseArray.data`][pydglab_ws.pulse.array.PulseArray.data] 的字节相同，
+        因此以元组、列表或 [`PulseArray`][pydglab_ws.pulse.array.PulseArray] 传入相同的内容时使用同一个缓存
+
+        :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+        """
+        if len(pulses) == 1 and isinstance(pulses[0], PulseArray):
+            return pulses[0].data.tobytes()
+        return b"".join(map(_pulse_key, pulses))
+
+    def prepare(self, *pulses: Union[PulseOperation, PulseArray]) -> PreparedPulses:
+        """
+        获取波形对应的 [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]，未缓存时编码并放入缓存
+
+        :param pulses: 波形操作数据，或单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]
+        :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+        """
+        key = self._key(pulses)
+        if (prepared := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            self._stats.hits += 1
+            return prepared
+        self._stats.misses += 1
+        prepared = PreparedPulses(*pulses)
+        self._cache[key] = prepared
+        self._pulses += len(prepared)
+        while len(self._cache) > self.max_size or (
+                self.max_pulses is not None and self._pulses > self.max_pulses and len(self._cache) > 1
+        ):
+            _, evicted = self._cache.popitem(last=False)
+            self._pulses -= len(evicted)
+            self._stats.evictions += 1
+        return prepared
+
+    def clear(self):
+        """清空缓存，统计不会被重置"""
+        self._cache.clear()
+        self._pulses = 0
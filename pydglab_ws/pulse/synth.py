@@ -0,0 +1,195 @@
+"""
+按参数合成波形，需要安装可选依赖 ``numpy``
+
+波形强度和波形频率分别由包络描述，包络为以时间（秒）数组为参数、返回同形状数值数组的函数，也可以直接使用数值表示常量。
+:func:`synthesize` 按块向量化计算，并逐条返回 [`PulseOperation`][pydglab_ws.typing.PulseOperation]，
+持续时间不限时为无限长的迭代器，可直接用于
+[`DGLabClient.stream_pulses`][pydglab_ws.client.base.DGLabClient.stream_pulses]
+
+示例：
+```python3
+from itertools import islice
+
+from pydglab_ws.pulse.synth import synthesize, sine, sweep
+
+# 强度在 [20, 80] 之间以 2 秒为周期变化，频率在 5 秒内从 10 扫到 100
+pulses = synthesize(sine(2, 20, 80), sweep(10, 100, 5))
+await client.add_pulses(Channel.A, *islice(pulses, 50))
+await client.stream_pulses(Channel.A, pulses)
+```
+"""
+import math
+from typing import Callable, Union, Iterator, Optional
+
+from .array import PULSE_FREQUENCY_RANGE, PULSE_STRENGTH_RANGE, _require_numpy
+from ..typing import PulseOperation
+from ..utils import PULSE_OPERATION_DURATION
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = (
+    "Envelope",
+    "sine",
+    "triangle",
+    "square",
+    "sweep",
+    "burst",
+    "noise",
+    "synthesize"
+)
+
+Envelope = Union[Callable[["np.ndarray"], "np.ndarray"], float]
+"""包络，以时间（秒）数组为参数的函数，或常量"""
+
+_SAMPLES_PER_OPERATION = 4
+_SAMPLE_DURATION = PULSE_OPERATION_DURATION / _SAMPLES_PER_OPERATION
+
+
+def _phase(t: "np.ndarray", period: float, phase: float) -> "np.ndarray":
+    """周期内的相位 [0, 1)"""
+    return np.mod(t / period + phase, 1.0)
+
+
+def sine(period: float, low: float = 0, high: float = 100, phase: float = 0) -> Envelope:
+    """
+    正弦包络，从 ``low`` 开始
+
+    :param period: 周期（秒）
+    :param low: 最小值
+    :param high: 最大值
+    :param phase: 初始相位，以周期为单位 [0, 1)
+    """
+    _require_numpy()
+
+    def envelope(t: "np.ndarray") -> "np.ndarray":
+        return low + (high - low) * (1 - np.cos(2 * np.pi * _phase(t, period, phase))) / 2
+
+    return envelope
+
+
+def triangle(period: float, low: float = 0, high: float = 100, phase: float = 0) -> Envelope:
+    """
+    三角波包络，从 ``low`` 开始
+
+    :param period: 周期（秒）
+    :param low: 最小值
+    :param high: 最大值
+    :param phase: 初始相位，以周期为单位 [0, 1)
+    """
+    _require_numpy()
+
+    def envelope(t: "np.ndarray") -> "np.ndarray":
+        return low + (high - low) * (1 - np.abs(1 - 2 * _phase(t, period, phase)))
+
+    return envelope
+
+
+def square(period: float, low: float = 0, high: float = 100, duty: float = 0.5, phase: float = 0) -> Envelope:
+    """
+    方波包络，每个周期先为 ``high``，持续 ``duty`` 比例的时间后为 ``low``
+
+    :param period: 周期（秒）
+    :param low: 最小值
+    :param high: 最大值
+    :param duty: 占空比 [0, 1]
+    :param phase: 初始相位，以周期为单位 [0, 1)
+    """
+    _require_numpy()
+
+    def envelope(t: "np.ndarray") -> "np.ndarray":
+        return np.where(_phase(t, period, phase) < duty, high, low)
+
+    return envelope
+
+
+def sweep(start: float, end: float, duration: float, log: bool = False) -> Envelope:
+    """
+    扫频包络，在 ``duration`` 秒内从 ``start`` 变化到 ``end``，之后保持 ``end``
+
+    :param start: 起始值
+    :param end: 结束值
+    :param duration: 持续时间（秒）
+    :param log: 是否按对数变化（等比），否则线性变化，``start`` 和 ``end`` 需要大于 0
+    """
+    _require_numpy()
+
+    def envelope(t: "np.ndarray") -> "np.ndarray":
+        ratio = np.clip(t / duration, 0, 1) if duration > 0 else np.ones_like(t)
+        if log:
+            return start * np.power(end / start, ratio)
+        return start + (end - start) * ratio
+
+    return envelope
+
+
+def burst(on: float, off: float, high: float = 100, low: float = 0) -> Envelope:
+    """
+    脉冲串包络，每次持续 ``on`` 秒的 ``high`` 后间隔 ``off`` 秒的 ``low``
+
+    :param on: 每次持续时间（秒）
+    :param off: 间隔时间（秒）
+    :param high: 持续期间的值
+    :param low: 间隔期间的值
+    """
+    return square(on + off, low, high, on / (on + off))
+
+
+def noise(low: float = 0, high: float = 100, seed: Optional[int] = None) -> Envelope:
+    """
+    均匀分布的随机包络，每次计算的结果不同
+
+    :param low: 最小值
+    :param high: 最大值
+    :param seed: 随机数种子，相同的种子按相同顺序计算时结果相同
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+
+    def envelope(t: "np.ndarray") -> "np.ndarray":
+        return rng.uniform(low, high, t.shape)
+
+    return envelope
+
+
+def _evaluate(envelope: Envelope, t: "np.ndarray", value_range: tuple) -> "np.ndarray":
+    """计算包络，并取整、截断到范围内"""
+    values = envelope(t) if callable(envelope) else np.full(t.shape, envelope, dtype=np.float64)
+    return np.clip(np.rint(values), *value_range).astype(np.uint8)
+
+
+def synthesize(
+        strength: Envelope,
+        frequency: Envelope = PULSE_FREQUENCY_RANGE[0],
+        duration: Optional[float] = None,
+        block_size: int = 100
+) -> Iterator[PulseOperation]:
+    """
+    按包络合成波形，逐条返回波形操作数据
+
+    每条波形操作数据的 4 组值对应 4 个 25 毫秒的时刻，强度和频率会取整并截断到有效范围内
+
+    :param strength: 波形强度包络
+    :param frequency: 波形频率包络
+    :param duration: 持续时间（秒），为 ``None`` 时不限
+    :param block_size: 每次向量化计算的波形操作数据数量
+    :return: 波形操作数据的迭代器
+    :raise ImportError: 未安装 ``numpy``
+    """
+    _require_numpy()
+    total = math.inf if duration is None else round(duration / PULSE_OPERATION_DURATION)
+    start = 0
+    while start < total:
+        count = int(min(block_size, total - start))
+        t = np.arange(
+            start * _SAMPLES_PER_OPERATION,
+            (start + count) * _SAMPLES_PER_OPERATION,
+            dtype=np.float64
+        ).reshape(count, _SAMPLES_PER_OPERATION) * _SAMPLE_DURATION
+        frequencies = _evaluate(frequency, t, PULSE_FREQUENCY_RANGE).tolist()
+        strengths = _evaluate(strength, t, PULSE_STRENGTH_RANGE).tolist()
+        for frequency_row, strength_row in zip(frequencies, strengths):
+            yield tuple(frequency_row), tuple(strength_row)
+        start += count
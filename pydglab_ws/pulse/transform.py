@@ -0,0 +1,230 @@
+"""
+波形变换：强度缩放、频率映射、混合和 A/B 声像
+
+- :func:`scale_strength`、:func:`remap_frequency` 通过 256 项的查找表逐字节变换，
+  对 [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses] 直接在已编码的数据上进行，不需要重新校验和编码，
+  也不需要安装 ``numpy``
+- :func:`mix`、:func:`pan` 在 [`PulseArray`][pydglab_ws.pulse.array.PulseArray] 上向量化计算，需要安装可选依赖 ``numpy``
+
+示例：
+```python3
+from pydglab_ws.pulse.synth import sine
+from pydglab_ws.pulse.transform import scale_strength, pan
+
+comfort = scale_strength(PreparedPulses(*PULSE_DATA["呼吸"]), 0.6, high=80)
+await client.add_pulses(Channel.A, comfort)
+
+# 在 A、B 通道之间以 4 秒为周期来回移动
+channel_a, channel_b = pan(PULSE_DATA["潮汐"], sine(4, 0, 1))
+```
+"""
+from typing import Callable, Iterable, Tuple, Union, TypeVar
+
+from .array import PULSE_FREQUENCY_RANGE, PULSE_STRENGTH_RANGE, PulseArray, _require_numpy
+from .prepared import PreparedPulses
+from .synth import Envelope, _SAMPLE_DURATION, _SAMPLES_PER_OPERATION
+from ..typing import PulseOperation
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+__all__ = (
+    "strength_table",
+    "frequency_table",
+    "scale_strength",
+    "remap_frequency",
+    "mix",
+    "pan"
+)
+
+_Pulses = Union[PulseArray, PreparedPulses, Iterable[PulseOperation]]
+_T = TypeVar("_T", PulseArray, PreparedPulses)
+
+_FREQUENCY_SLICE = slice(0, 4)
+_STRENGTH_SLICE = slice(4, 8)
+
+
+def _table(function: Callable[[int], float], value_range: Tuple[int, int]) -> bytes:
+    """按函数生成 256 项的查找表，结果取整并截断到范围内"""
+    low, high = value_range
+    return bytes(min(max(round(function(value)), low), high) for value in range(256))
+
+
+def strength_table(factor: float = 1, offset: float = 0, low: int = 0, high: int = 100) -> bytes:
+    """
+    生成波形强度的查找表，第 ``i`` 项为强度 ``i`` 变换后的值 ``i * factor + offset``，取整并截断到 [``low``, ``high``]
+
+    :param factor: 缩放倍数
+    :param offset: 缩放后加上的偏移量
+    :param low: 最小值，不小于 0
+    :param high: 最大值，不大于 100
+    """
+    value_range = max(low, PULSE_STRENGTH_RANGE[0]), min(high, PULSE_STRENGTH_RANGE[1])
+    return _table(lambda value: value * factor + offset, value_range)
+
+
+def frequency_table(low: int = 10, high: int = 240, source: Tuple[int, int] = PULSE_FREQUENCY_RANGE) -> bytes:
+    """
+    生成波形频率的查找表，将 ``source`` 范围内的频率线性映射到 [``low``, ``high``]，取整并截断到该范围
+
+    :param low: 映射后的最小值，不小于 10
+    :param high: 映射后的最大值，不大于 240
+    :param source: 原频率范围
+    """
+    source_low, source_high = source
+    value_range = max(low, PULSE_FREQUENCY_RANGE[0]), min(high, PULSE_FREQUENCY_RANGE[1])
+    ratio = (high - low) / (source_high - source_low) if source_high != source_low else 0
+    return _table(lambda value: low + (value - source_low) * ratio, value_range)
+
+
+def _translate(pulses: _Pulses, table: bytes, columns: slice) -> Union[PulseArray, PreparedPulses]:
+    """使用查找表变换 ``columns`` 对应的 4 个值"""
+    if isinstance(pulses, PreparedPulses):
+        data = bytearray.fromhex("".join(pulses.hex))
+        for column in range(columns.start, columns.stop):
+            data[column::8] = data[column::8].translate(table)
+        dumped = data.hex()
+        return PreparedPulses._from_hex([dumped[i:i + 16] for i in range(0, len(dumped), 16)])
+    _require_numpy()
+    array = pulses.data if isinstance(pulses, PulseArray) else PulseArray(pulses).data
+    result = array.copy()
+    result[:, columns] = np.frombuffer(table, dtype=np.uint8)[array[:, columns]]
+    result.flags.writeable = False
+    return PulseArray._from_array(result)
+
+
+def scale_strength(
+        pulses: Union[_T, Iterable[PulseOperation]],
+        factor: float = 1,
+        offset: float = 0,
+        low: int = 0,
+        high: int = 100
+) -> Union[_T, PulseArray]:
+    """
+    缩放波形强度，变换方式见 :func:`strength_table`
+
+    :param pulses: [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]、
+        [`PulseArray`][pydglab_ws.pulse.array.PulseArray] 或波形操作数据的可迭代对象
+    :param factor: 缩放倍数
+    :param offset: 缩放后加上的偏移量，注意非零的偏移量也会改变强度为 0 的部分
+    :param low: 最小值
+    :param high: 最大值
+    :return: 传入 ``PreparedPulses`` 时返回 ``PreparedPulses``，否则返回 ``PulseArray``
+    :raise ImportError: 传入的不是 ``PreparedPulses`` 且未安装 ``numpy``
+    """
+    return _translate(pulses, strength_table(factor, offset, low, high), _STRENGTH_SLICE)
+
+
+def remap_frequency(
+        pulses: Union[_T, Iterable[PulseOperation]],
+        low: int = 10,
+        high: int = 240,
+        source: Tuple[int, int] = PULSE_FREQUENCY_RANGE
+) -> Union[_T, PulseArray]:
+    """
+    将波形频率线性映射到新的范围，变换方式见 :func:`frequency_table`
+
+    :param pulses: [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]、
+        [`PulseArray`][pydglab_ws.pulse.array.PulseArray] 或波形操作数据的可迭代对象
+    :param low: 映射后的最小值
+    :param high: 映射后的最大值
+    :param source: 原频率范围
+    :return: 传入 ``PreparedPulses`` 时返回 ``PreparedPulses``，否则返回 ``PulseArray``
+    :raise ImportError: 传入的不是 ``PreparedPulses`` 且未安装 ``numpy``
+    """
+    return _translate(pulses, frequency_table(low, high, source), _FREQUENCY_SLICE)
+
+
+def _as_array(pulses: Union[PulseArray, Iterable[PulseOperation]]) -> "np.ndarray":
+    return pulses.data if isinstance(pulses, PulseArray) else PulseArray(pulses).data
+
+
+def _to_pulse_array(frequency: "np.ndarray", strength: "np.ndarray") -> PulseArray:
+    """由取整前的频率和强度创建，截断到范围内"""
+    result = np.concatenate((
+        np.clip(np.rint(frequency), *PULSE_FREQUENCY_RANGE),
+        np.clip(np.rint(strength), *PULSE_STRENGTH_RANGE)
+    ), axis=1).astype(np.uint8)
+    result.flags.writeable = False
+    return PulseArray._from_array(result)
+
+
+def mix(
+        a: Union[PulseArray, Iterable[PulseOperation]],
+        b: Union[PulseArray, Iterable[PulseOperation]],
+        mode: str = "max",
+        ratio: float = None
+) -> PulseArray:
+    """
+    混合两个波形，较短的波形在末尾补充强度为 0 的数据
+
+    - ``"max"``：强度取较大值，频率取强度较大的一方（相同时取 ``a``）
+    - ``"sum"``：强度相加并截断到 100，频率同上
+    - ``"crossfade"``：强度和频率按比例混合，``ratio`` 为 ``b`` 所占的比例；
+      为 ``None`` 时比例在整个波形内从 0 线性变化到 1，即从 ``a`` 渐变到 ``b``
+
+    :param a: 波形 A
+    :param b: 波形 B
+    :param mode: 混合方式，``"max"``、``"sum"`` 或 ``"crossfade"``
+    :param ratio: ``"crossfade"`` 时 ``b`` 所占的比例 [0, 1]
+    :raise ValueError: 混合方式不合法
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    :raise ImportError: 未安装 ``numpy``
+    """
+    _require_numpy()
+    if mode not in ("max", "sum", "crossfade"):
+        raise ValueError(f"Unknown mix mode: {mode!r}")
+    a, b = _as_array(a), _as_array(b)
+    length = max(len(a), len(b))
+    frequency_a, frequency_b = (np.empty((length, 4)) for _ in range(2))
+    strength_a, strength_b = (np.zeros((length, 4)) for _ in range(2))
+    frequency_a[:len(a)], strength_a[:len(a)] = a[:, _FREQUENCY_SLICE], a[:, _STRENGTH_SLICE]
+    frequency_b[:len(b)], strength_b[:len(b)] = b[:, _FREQUENCY_SLICE], b[:, _STRENGTH_SLICE]
+    # 补充的部分使用另一方的频率
+    frequency_a[len(a):] = frequency_b[len(a):]
+    frequency_b[len(b):] = frequency_a[len(b):]
+
+    if mode == "crossfade":
+        if ratio is None:
+            weight = np.linspace(0, 1, length * _SAMPLES_PER_OPERATION).reshape(length, 4)
+        else:
+            weight = np.full((length, 4), ratio, dtype=np.float64)
+        return _to_pulse_array(
+            frequency_a * (1 - weight) + frequency_b * weight,
+            strength_a * (1 - weight) + strength_b * weight
+        )
+    frequency = np.where(strength_b > strength_a, frequency_b, frequency_a)
+    strength = np.maximum(strength_a, strength_b) if mode == "max" else strength_a + strength_b
+    return _to_pulse_array(frequency, strength)
+
+
+def pan(
+        pulses: Union[PulseArray, Iterable[PulseOperation]],
+        position: Envelope = 0.5,
+        constant_power: bool = False
+) -> Tuple[PulseArray, PulseArray]:
+    """
+    将一个波形按声像位置分配到 A、B 两个通道，频率不变，强度按位置分配
+
+    :param pulses: 波形数据
+    :param position: 声像位置 [0, 1]，0 时全部在 A 通道，1 时全部在 B 通道；
+        也可以是 [`pydglab_ws.pulse.synth`][pydglab_ws.pulse.synth] 中的包络，以每个 25 毫秒时刻的时间（秒）计算
+    :param constant_power: 为 ``True`` 时按等功率分配（``cos`` / ``sin``），否则线性分配
+    :return: A 通道和 B 通道的波形数据
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    :raise ImportError: 未安装 ``numpy``
+    """
+    _require_numpy()
+    array = _as_array(pulses)
+    frequency, strength = array[:, _FREQUENCY_SLICE], array[:, _STRENGTH_SLICE].astype(np.float64)
+    if callable(position):
+        t = np.arange(len(array) * _SAMPLES_PER_OPERATION, dtype=np.float64).reshape(-1, 4) * _SAMPLE_DURATION
+        position = position(t)
+    position = np.clip(np.broadcast_to(position, strength.shape), 0, 1)
+    if constant_power:
+        gain_a, gain_b = np.cos(position * np.pi / 2), np.sin(position * np.pi / 2)
+    else:
+        gain_a, gain_b = 1 - position, position
+    return _to_pulse_array(frequency, strength * gain_a), _to_pulse_array(frequency, strength * gain_b)
@@ -0,0 +1,334 @@
+"""
+惰性求值的波形表达式
+
+[`Waveform`][pydglab_ws.pulse.waveform.Waveform] 描述如何由波形操作数据组合出新的波形（拼接、重复、按时间截取、时间拉伸、强度缩放），
+只在迭代时按块计算，重复不会复制数据，无限重复也只占用固定的内存
+
+示例：
+```python3
+from pydglab_ws.pulse.waveform import Waveform
+
+breath = Waveform.of(PULSE_DATA["呼吸"])
+tide = Waveform.of(PULSE_DATA["潮汐"])
+# 呼吸 3 次后接潮汐的前 2 秒，强度减半，然后无限循环
+session = (breath * 3 + tide.slice(0, 2)).scale(0.5).repeat()
+await client.stream_pulses(Channel.A, session)
+```
+"""
+import math
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from itertools import islice
+from typing import Sequence, Iterator, List, Optional, Union, Callable, Iterable, Tuple
+
+from .transform import strength_table
+from ..typing import PulseOperation
+from ..utils import PULSE_OPERATION_DURATION, PULSE_DATA_APP_MAX_LENGTH
+
+__all__ = ("Waveform",)
+
+_Length = Union[int, float, None]
+"""波形长度，无限长时为 ``math.inf``，未知时为 ``None``"""
+
+
+class Waveform(ABC):
+    """
+    惰性求值的波形表达式
+
+    - 通过 :meth:`of`, :meth:`generate` 创建，通过 ``+``、``*`` 和各方法组合，组合时不会计算波形数据
+    - 可迭代，每项为 [`PulseOperation`][pydglab_ws.typing.PulseOperation]，
+      也可以通过 :meth:`chunks` 按固定大小分块获取
+    - 长度可确定时可通过 ``len()`` 获取，长度不限或未知时会抛出 ``TypeError``
+    """
+    _length: _Length = None
+
+    @staticmethod
+    def of(pulses: Sequence[PulseOperation]) -> "Waveform":
+        """
+        由波形操作数据序列创建
+
+        :param pulses: 波形操作数据序列，例如列表或 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]，不会被复制
+        """
+        return _Source(pulses)
+
+    @staticmethod
+    def generate(factory: Callable[[], Iterable[PulseOperation]], length: _Length = None) -> "Waveform":
+        """
+        由生成波形操作数据的函数创建，每次迭代时调用一次 ``factory``
+
+        :param factory: 返回波形操作数据可迭代对象的函数，例如
+            ``lambda: synthesize(sine(1), duration=10)``
+        :param length: 波形长度，无限长时为 ``math.inf``，未知时为 ``None``；已知时迭代不会超过该长度
+        """
+        return _Generated(factory, length)
+
+    @property
+    def length(self) -> Optional[int]:
+        """波形操作数据数量，长度不限或未知时为 ``None``"""
+        return self._length if self._length is not None and self._length != math.inf else None
+
+    @property
+    def infinite(self) -> bool:
+        """是否为无限长"""
+        return self._length == math.inf
+
+    @property
+    def duration(self) -> Optional[float]:
+        """持续时间（秒），长度不限或未知时为 ``None``"""
+        return self.length * PULSE_OPERATION_DURATION if self.length is not None else None
+
+    def __len__(self) -> int:
+        if (length := self.length) is None:
+            raise TypeError("Waveform length is infinite or unknown")
+        return length
+
+    def __iter__(self) -> Iterator[PulseOperation]:
+        for block in self._blocks(0):
+            yield from block
+
+    def chunks(self, size: int = PULSE_DATA_APP_MAX_LENGTH) -> Iterator[List[PulseOperation]]:
+        """
+        按固定大小分块获取波形操作数据，最后一块可能较短
+
+        :param size: 每块的波形操作数据数量
+        """
+        chunk: List[PulseOperation] = []
+        for block in self._blocks(0):
+            while block:
+                needed = size - len(chunk)
+                chunk.extend(block[:needed])
+                block = block[needed:]
+                if len(chunk) == size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    @abstractmethod
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        """从第 ``start`` 条开始，按块返回波形操作数据，块的大小不固定"""
+        ...
+
+    def __add__(self, other: "Waveform") -> "Waveform":
+        if not isinstance(other, Waveform):
+            return NotImplemented
+        return _Concat((self, other))
+
+    def __mul__(self, times: int) -> "Waveform":
+        if not isinstance(times, int):
+            return NotImplemented
+        return self.repeat(times)
+
+    __rmul__ = __mul__
+
+    def repeat(self, times: Optional[int] = None) -> "Waveform":
+        """
+        重复波形
+
+        :param times: 重复次数，为 ``None`` 时无限重复
+        """
+        return _Repeat(self, times)
+
+    def __getitem__(self, item: slice) -> "Waveform":
+        """按波形操作数据的序号截取，不支持负数和步长"""
+        if not isinstance(item, slice) or item.step not in (None, 1):
+            raise TypeError("Waveform only supports slices without step")
+        start, stop = item.start or 0, item.stop
+        if start < 0 or (stop is not None and stop < 0):
+            raise ValueError("Waveform slices must not be negative")
+        return _Slice(self, start, stop)
+
+    def slice(self, start: float = 0, end: Optional[float] = None) -> "Waveform":
+        """
+        按时间截取，时间按每条波形操作数据的持续时间取整
+
+        :param start: 开始时间（秒）
+        :param end: 结束时间（秒），为 ``None`` 时截取到末尾
+        """
+        return self[
+            round(start / PULSE_OPERATION_DURATION):
+            round(end / PULSE_OPERATION_DURATION) if end is not None else None
+        ]
+
+    def stretch(self, factor: float) -> "Waveform":
+        """
+        时间拉伸，``factor`` 大于 1 时重复波形操作数据以放慢，小于 1 时跳过波形操作数据以加快
+
+        :param factor: 拉伸倍数，大于 0
+        """
+        if factor <= 0:
+            raise ValueError("Stretch factor must be positive")
+        return _Stretch(self, factor)
+
+    def scale(self, factor: float) -> "Waveform":
+        """
+        缩放波形强度，结果取整并截断到 [0, 100]
+
+        :param factor: 缩放倍数
+        """
+        return _Scale(self, factor)
+
+
+class _Source(Waveform):
+    def __init__(self, pulses: Sequence[PulseOperation]):
+        self._pulses = pulses
+        self._length = len(pulses)
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        for i in range(start, len(self._pulses), PULSE_DATA_APP_MAX_LENGTH):
+            yield list(self._pulses[i:i + PULSE_DATA_APP_MAX_LENGTH])
+
+
+class _Generated(Waveform):
+    def __init__(self, factory: Callable[[], Iterable[PulseOperation]], length: _Length):
+        self._factory = factory
+        self._length = length
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        iterator = iter(self._factory())
+        if self._length is not None and self._length != math.inf:
+            iterator = islice(iterator, self._length)
+        iterator = islice(iterator, start, None)
+        while block := list(islice(iterator, PULSE_DATA_APP_MAX_LENGTH)):
+            yield block
+
+
+def _skip(blocks: Iterator[List[PulseOperation]], count: int) -> Tuple[Iterator[List[PulseOperation]], int]:
+    """跳过最多 ``count`` 条波形操作数据，返回剩余的块和实际跳过的数量"""
+    skipped = 0
+    for block in blocks:
+        if skipped + len(block) > count:
+            def rest(first: List[PulseOperation] = block[count - skipped:]):
+                yield first
+                yield from blocks
+
+            return rest(), count
+        skipped += len(block)
+    return iter(()), skipped
+
+
+class _Concat(Waveform):
+    def __init__(self, parts: Tuple[Waveform, ...]):
+        # 展开嵌套的拼接
+        self._parts = tuple(
+            part for waveform in parts
+            for part in (waveform._parts if isinstance(waveform, _Concat) else (waveform,))
+        )
+        lengths = [part._length for part in self._parts]
+        if math.inf in lengths:
+            self._length = math.inf if all(length is not None for length in lengths) else None
+        elif None in lengths:
+            self._length = None
+        else:
+            self._length = sum(lengths)
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        for part in self._parts:
+            if start == 0:
+                yield from part._blocks(0)
+            elif part.length is not None and start >= part.length:
+                start -= part.length
+            elif part._length is not None:
+                yield from part._blocks(start)
+                start = 0
+            else:
+                blocks, skipped = _skip(part._blocks(0), start)
+                start -= skipped
+                yield from blocks
+
+
+class _Repeat(Waveform):
+    def __init__(self, waveform: Waveform, times: Optional[int]):
+        self._waveform = waveform
+        self._times = times
+        if waveform._length == 0 or times == 0:
+            self._length = 0
+        elif times is None:
+            self._length = math.inf if waveform._length is not None else None
+        elif waveform._length is None:
+            self._length = None
+        else:
+            self._length = waveform._length * times
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        if self._length == 0:
+            return
+        length = self._waveform.length
+        count = 0
+        if length is not None:
+            count, start = divmod(start, length)
+        while self._times is None or count < self._times:
+            if length is not None:
+                yield from self._waveform._blocks(start)
+                start = 0
+            else:
+                # 长度未知时只能逐块跳过
+                blocks, skipped = _skip(self._waveform._blocks(0), start)
+                start -= skipped
+                produced = skipped > 0
+                for block in blocks:
+                    produced = True
+                    yield block
+                if not produced:
+                    # 波形为空，避免无限循环
+                    return
+            count += 1
+
+
+class _Slice(Waveform):
+    def __init__(self, waveform: Waveform, start: int, stop: Optional[int]):
+        self._waveform = waveform
+        self._start = start
+        self._stop = stop
+        if waveform._length is not None:
+            end = waveform._length if stop is None else min(stop, waveform._length)
+            self._length = math.inf if end == math.inf else max(end - start, 0)
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        remaining = None if self._stop is None else self._stop - self._start - start
+        if remaining is not None and remaining <= 0:
+            return
+        for block in self._waveform._blocks(self._start + start):
+            if remaining is not None:
+                block = block[:remaining]
+                remaining -= len(block)
+            yield block
+            if remaining == 0:
+                return
+
+
+class _Stretch(Waveform):
+    def __init__(self, waveform: Waveform, factor: float):
+        self._waveform = waveform
+        self._factor = Fraction(factor).limit_denominator(10 ** 6)
+        if waveform.length is not None:
+            self._length = math.ceil(waveform.length * self._factor)
+        else:
+            self._length = waveform._length
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        # 输出的第 j 条为原波形的第 floor(j / factor) 条
+        factor = self._factor
+        index = math.floor(start / factor)
+        position = start
+        for block in self._waveform._blocks(index):
+            stretched = []
+            for pulse in block:
+                index += 1
+                end = math.ceil(index * factor)
+                stretched.extend([pulse] * (end - position))
+                position = max(position, end)
+            if stretched:
+                yield stretched
+
+
+class _Scale(Waveform):
+    def __init__(self, waveform: Waveform, factor: float):
+        self._waveform = waveform
+        self._factor = factor
+        self._length = waveform._length
+
+    def _blocks(self, start: int) -> Iterator[List[PulseOperation]]:
+        table = strength_table(self._factor)
+        for block in self._waveform._blocks(start):
+            yield [(frequency, tuple(table[value] for value in strength)) for frequency, strength in block]
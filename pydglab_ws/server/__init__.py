@@ -1 +1,3 @@
+from .admin import *
 from .server import *
+from .slow_consumer import *
@@ -0,0 +1,270 @@
+"""
+只读的管理接口，通过 WebSocket 服务端的 ``process_request`` 在同一端口上响应 HTTP ``GET`` 请求
+
+接口路径以 ``admin_path``（例如 ``/admin``）为前缀，均返回 JSON：
+
+- ``/health``：事件循环延迟、连接数、绑定数、运行时间，设置了慢消费者策略时还包括慢消费者统计
+- ``/connections?offset=0&limit=50``：分页列出 WebSocket 连接和本地终端，包括队列深度和最后活动时间
+- ``/bindings?offset=0&limit=50``：分页列出绑定关系
+- ``/bindings/<id>``：查看某个绑定关系的双方详情，``id`` 可以是 ``clientId`` 或 ``targetId``
+
+所有数据都直接从服务端的只读视图中读取，不会复制服务端的映射
+
+示例：
+```python3
+async with DGLabWSServer("0.0.0.0", 5678, 60, admin_path="/admin", admin_token="secret"):
+    await asyncio.Future()
+```
+
+```shell
+curl -H "Authorization: Bearer secret" "http://127.0.0.1:5678/admin/connections?limit=10"
+```
+"""
+import asyncio
+import hmac
+import time
+from dataclasses import asdict
+from http import HTTPStatus
+from itertools import islice, chain
+from typing import Optional, Callable, Any, Tuple, List, Dict, Iterable, TYPE_CHECKING
+from urllib.parse import urlsplit, parse_qs
+from uuid import UUID
+
+from websockets import WebSocketServerProtocol
+from websockets.datastructures import Headers
+
+from ..codec import get_json_codec
+
+if TYPE_CHECKING:
+    from .server import DGLabWSServer
+
+__all__ = ("DGLabAdmin",)
+
+_HTTPResponse = Tuple[HTTPStatus, List[Tuple[str, str]], bytes]
+
+_DEFAULT_PAGE_LIMIT = 50
+_MAX_PAGE_LIMIT = 500
+
+
+class DGLabAdmin:
+    """
+    [`DGLabWSServer`][pydglab_ws.server.server.DGLabWSServer] 的只读管理接口
+
+    一般不需要直接创建，在创建服务端时传入 ``admin_path`` 即可启用，
+    之后可通过 [`DGLabWSServer.admin`][pydglab_ws.server.server.DGLabWSServer.admin] 获取
+
+    :param server: 服务端
+    :param path: 接口路径前缀，例如 ``/admin``
+    :param token: 访问令牌，请求需要带有 ``Authorization: Bearer <token>`` 请求头，
+        管理接口与 WebSocket 服务端使用同一端口，会暴露所有连接的 ID 和地址，因此必须设置
+    :param lag_interval: 事件循环延迟的采样间隔（秒）
+    :param process_request: 原有的 ``process_request``，不属于管理接口的请求会交给它处理
+    :raise ValueError: 未设置访问令牌
+    """
+
+    def __init__(
+            self,
+            server: "DGLabWSServer",
+            path: str = "/admin",
+            token: str = None,
+            lag_interval: float = 0.5,
+            process_request: Optional[Callable[[str, Headers], Any]] = None
+    ):
+        if not token:
+            raise ValueError("admin_token is required when admin_path is set")
+        self._server = server
+        self._path = "/" + path.strip("/")
+        self._authorization = f"Bearer {token}".encode()
+        self._lag_interval = lag_interval
+        self._process_request = process_request
+        self._loop_lag = 0.0
+        self._max_loop_lag = 0.0
+        self._started_at: Optional[float] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._routes: Dict[str, Callable[[Dict[str, List[str]]], _HTTPResponse]] = {
+            "/health": self._health,
+            "/connections": self._connections,
+            "/bindings": self._bindings
+        }
+
+    @property
+    def path(self) -> str:
+        """接口路径前缀"""
+        return self._path
+
+    @property
+    def loop_lag(self) -> float:
+        """最近一次采样的事件循环延迟（秒）"""
+        return self._loop_lag
+
+    @property
+    def max_loop_lag(self) -> float:
+        """启动以来事件循环延迟的最大值（秒）"""
+        return self._max_loop_lag
+
+    def start(self):
+        """开始采样事件循环延迟，由服务端在启动时调用"""
+        self._started_at = asyncio.get_running_loop().time()
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._lag_monitor())
+
+    def stop(self):
+        """停止采样事件循环延迟，由服务端在关闭时调用"""
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+
+    async def _lag_monitor(self):
+        """事件循环延迟采样器，延迟为实际休眠时间超出预期的部分"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._lag_interval)
+            self._loop_lag = max(loop.time() - start - self._lag_interval, 0.0)
+            self._max_loop_lag = max(self._max_loop_lag, self._loop_lag)
+
+    async def process_request(self, path: str, request_headers: Headers) -> Optional[_HTTPResponse]:
+        """
+        作为 :class:`websockets.server.serve` 的 ``process_request`` 参数使用
+
+        :param path: 请求路径，包含查询参数
+        :param request_headers: 请求头
+        :return: 管理接口的 HTTP 响应，不属于管理接口时返回原有 ``process_request`` 的结果或 ``None``
+        """
+        url = urlsplit(path)
+        if url.path != self._path and not url.path.startswith(self._path + "/"):
+            if self._process_request is None:
+                return None
+            response = self._process_request(path, request_headers)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+        # 按字节比较，请求头中含有非 ASCII 字符时也不会抛出异常
+        authorization = request_headers.get("Authorization", "").encode("utf-8", "surrogateescape")
+        if not hmac.compare_digest(authorization, self._authorization):
+            return self._response(HTTPStatus.UNAUTHORIZED, {"error": "unauthorized"})
+        route = url.path[len(self._path):].rstrip("/") or "/health"
+        query = parse_qs(url.query)
+        try:
+            if handler := self._routes.get(route):
+                return handler(query)
+            if route.startswith("/bindings/"):
+                return self._binding_detail(route[len("/bindings/"):])
+        except ValueError as e:
+            return self._response(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        return self._response(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    @staticmethod
+    def _response(status: HTTPStatus, body: Any) -> _HTTPResponse:
+        return (
+            status,
+            [("Content-Type", "application/json; charset=utf-8"), ("Cache-Control", "no-store")],
+            get_json_codec().dumps(body).encode()
+        )
+
+    @staticmethod
+    def _page(query: Dict[str, List[str]], total: int, items: Iterable[Any]) -> Dict[str, Any]:
+        """按 ``offset``、``limit`` 查询参数截取，只遍历到所需的最后一项"""
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(_DEFAULT_PAGE_LIMIT)])[0])
+        except ValueError:
+            raise ValueError("offset and limit must be integers") from None
+        if offset < 0 or not 0 < limit <= _MAX_PAGE_LIMIT:
+            raise ValueError(f"offset must be non-negative and limit must be in [1, {_MAX_PAGE_LIMIT}]")
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "items": list(islice(items, offset, offset + limit))
+        }
+
+    def _idle(self, uuid: UUID) -> Optional[float]:
+        """距离最后活动的时间（秒）"""
+        last_activity = self._server.last_activity.get(uuid)
+        if last_activity is None:
+            return None
+        return round(time.monotonic() - last_activity, 3)
+
+    def _connection(self, uuid: UUID) -> Optional[Dict[str, Any]]:
+        """WebSocket 连接或本地终端的详情"""
+        server = self._server
+        bound_to = server.client_id_to_target_id_view.get(uuid) or server.target_id_to_client_id_view.get(uuid)
+        info: Dict[str, Any] = {
+            "id": str(uuid),
+            "bound_to": str(bound_to) if bound_to else None,
+            "idle": self._idle(uuid)
+        }
+        websocket: Optional[WebSocketServerProtocol] = server.uuid_to_ws_view.get(uuid)
+        if websocket is not None:
+            transport = websocket.transport
+            info.update(
+                kind="websocket",
+                degraded=server.is_degraded(uuid),
+                remote_address=list(websocket.remote_address) if websocket.remote_address else None,
+                state=websocket.state.name,
+                latency=round(websocket.latency, 6),
+                queue_depth=len(websocket.messages),
+                write_buffer=transport.get_write_buffer_size() if transport is not None else 0
+            )
+        elif (queue := server.local_client_queues.get(uuid)) is not None:
+            info.update(
+                kind="local",
+                queue_depth=queue.qsize(),
+                queue_max=queue.maxsize
+            )
+        else:
+            return None
+        return info
+
+    def _health(self, _query: Dict[str, List[str]]) -> _HTTPResponse:
+        server = self._server
+        loop = asyncio.get_running_loop()
+        slow_consumer_stats = server.slow_consumer_stats
+        return self._response(HTTPStatus.OK, {
+            "status": "ok",
+            "uptime": round(loop.time() - self._started_at, 3) if self._started_at is not None else None,
+            "loop_lag": round(self._loop_lag, 6),
+            "max_loop_lag": round(self._max_loop_lag, 6),
+            "lag_interval": self._lag_interval,
+            "connections": len(server.uuid_to_ws_view),
+            "local_clients": len(server.local_client_queues),
+            "bindings": len(server.client_id_to_target_id_view),
+            "slow_consumers": asdict(slow_consumer_stats) if slow_consumer_stats is not None else None
+        })
+
+    def _connections(self, query: Dict[str, List[str]]) -> _HTTPResponse:
+        server = self._server
+        ids = chain(server.uuid_to_ws_view, server.local_client_queues)
+        total = len(server.uuid_to_ws_view) + len(server.local_client_queues)
+        return self._response(HTTPStatus.OK, self._page(query, total, map(self._connection, ids)))
+
+    def _binding(self, client_id: UUID, target_id: UUID) -> Dict[str, Any]:
+        return {
+            "client_id": str(client_id),
+            "target_id": str(target_id),
+            "client_idle": self._idle(client_id),
+            "target_idle": self._idle(target_id)
+        }
+
+    def _bindings(self, query: Dict[str, List[str]]) -> _HTTPResponse:
+        bindings = self._server.client_id_to_target_id_view
+        items = (self._binding(client_id, target_id) for client_id, target_id in bindings.items())
+        return self._response(HTTPStatus.OK, self._page(query, len(bindings), items))
+
+    def _binding_detail(self, uuid_text: str) -> _HTTPResponse:
+        try:
+            uuid = UUID(uuid_text)
+        except ValueError:
+            raise ValueError(f"Invalid id: {uuid_text!r}") from None
+        server = self._server
+        if (target_id := server.client_id_to_target_id_view.get(uuid)) is not None:
+            client_id = uuid
+        elif (client_id := server.target_id_to_client_id_view.get(uuid)) is not None:
+            target_id = uuid
+        else:
+            return self._response(HTTPStatus.NOT_FOUND, {"error": "binding not found"})
+        return self._response(HTTPStatus.OK, {
+            "client": self._connection(client_id),
+            "target": self._connection(target_id)
+        })
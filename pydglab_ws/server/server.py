@@ -1,18 +1,26 @@
 import asyncio
+import time
 from asyncio import Task
-from typing import Union, Optional, Sequence, Dict, Callable, Coroutine, Any, Set, Literal, Tuple
+from types import MappingProxyType
+from typing import Union, Optional, Sequence, Dict, Callable, Coroutine, Any, Set, Literal, Tuple, Mapping
 from uuid import uuid4
 
 from pydantic import UUID4
-from websockets import WebSocketServerProtocol, ConnectionClosedError
+from websockets import WebSocketServerProtocol, ConnectionClosedError, ConnectionClosed
 from websockets.server import serve as ws_serve
 
+from .admin import DGLabAdmin
+from .slow_consumer import SlowConsumerPolicy, SlowConsumerStats, _SlowConsumerGuard
 from ..client.local import DGLabLocalClient
+from ..codec import get_json_codec
 from ..enums import MessageDataHead, RetCode, MessageType
+from ..log import EventLogger
 from ..models import WebSocketMessage
 
 __all__ = ["DGLabWSServer"]
 
+_log = EventLogger("pydglab_ws.server")
+
 
 class DGLabWSServer:
     """
@@ -21,6 +29,12 @@ class DGLabWSServer:
     :param host: WebSocket 服务器绑定的接口
     :param port: 监听端口
     :param heartbeat_interval: 心跳包发送间隔（秒）
+    :param admin_path: 只读管理接口的路径前缀，例如 ``/admin``，为 ``None`` 时不启用，
+        见 [`DGLabAdmin`][pydglab_ws.server.admin.DGLabAdmin]
+    :param admin_token: 管理接口的访问令牌，设置 ``admin_path`` 时必须设置，
+        请求需要带有 ``Authorization: Bearer <token>`` 请求头
+    :param slow_consumer_policy: 慢消费者策略，设置后将对无法及时接收消息的连接进行降级和断开，
+        见 [`SlowConsumerPolicy`][pydglab_ws.server.slow_consumer.SlowConsumerPolicy]
     :param kwargs: :class:`websockets.server.serve` 的其他参数
     """
 
@@ -29,8 +43,20 @@ class DGLabWSServer:
             host: Union[str, Sequence[str]],
             port: Optional[int] = None,
             heartbeat_interval: float = None,
+            admin_path: Optional[str] = None,
+            admin_token: Optional[str] = None,
+            slow_consumer_policy: Optional[SlowConsumerPolicy] = None,
             **kwargs
     ):
+        self._admin: Optional[DGLabAdmin] = None
+        if admin_path is not None:
+            self._admin = DGLabAdmin(
+                self,
+                admin_path,
+                admin_token,
+                process_request=kwargs.pop("process_request", None)
+            )
+            kwargs["process_request"] = self._admin.process_request
         self._serve = ws_serve(
             self._ws_handler,
             host=host,
@@ -38,9 +64,17 @@ class DGLabWSServer:
             **kwargs
         )
         self._client_id_to_queue: Dict[UUID4, asyncio.Queue] = {}
+        self._local_clients: Dict[UUID4, DGLabLocalClient] = {}
         self._uuid_to_ws: Dict[UUID4, WebSocketServerProtocol] = {}
         self._client_id_to_target_id: Dict[UUID4, UUID4] = {}
         self._target_id_to_client_id: Dict[UUID4, UUID4] = {}
+        self._last_activity: Dict[UUID4, float] = {}
+        """终端 / App 最后一次发送消息的时间"""
+        self._client_id_to_queue_view = MappingProxyType(self._client_id_to_queue)
+        self._uuid_to_ws_view = MappingProxyType(self._uuid_to_ws)
+        self._client_id_to_target_id_view = MappingProxyType(self._client_id_to_target_id)
+        self._target_id_to_client_id_view = MappingProxyType(self._target_id_to_client_id)
+        self._last_activity_view = MappingProxyType(self._last_activity)
         self._message_type_to_handler: Dict[
             MessageType,
             Callable[
@@ -65,6 +99,10 @@ class DGLabWSServer:
         """新连接建立时 与 连接断开时"""
         self._heartbeat_interval = heartbeat_interval
         self._heartbeat_task: Optional[Task] = None
+        self._slow_consumers: Optional[_SlowConsumerGuard] = None
+        if slow_consumer_policy is not None:
+            self._slow_consumers = _SlowConsumerGuard(slow_consumer_policy, self._evict_slow_consumer)
+        self._slow_consumer_task: Optional[Task] = None
 
     @property
     def heartbeat_interval(self) -> Optional[float]:
@@ -85,31 +123,62 @@ class DGLabWSServer:
         await self._serve.__aenter__()
         if self.heartbeat_enabled:
             self._heartbeat_task = asyncio.create_task(self._heartbeat_sender())
+        if self._slow_consumers is not None:
+            self._slow_consumer_task = asyncio.create_task(self._slow_consumers.monitor())
+        if self._admin is not None:
+            self._admin.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.heartbeat_enabled:
             self._heartbeat_task.cancel()
+        if self._slow_consumer_task is not None:
+            self._slow_consumer_task.cancel()
+        if self._admin is not None:
+            self._admin.stop()
+        # 停止本地终端的后台任务，避免服务端关闭后仍在运行
+        await asyncio.gather(*(client.close() for client in self._local_clients.values()))
         await self._serve.__aexit__(exc_type, exc_val, exc_tb)
 
+    @property
+    def admin(self) -> Optional[DGLabAdmin]:
+        """只读管理接口，未启用时为 ``None``"""
+        return self._admin
+
+    @property
+    def slow_consumer_stats(self) -> Optional[SlowConsumerStats]:
+        """慢消费者统计，未设置慢消费者策略时为 ``None``"""
+        return self._slow_consumers.stats if self._slow_consumers is not None else None
+
+    def is_degraded(self, uuid: UUID4) -> bool:
+        """
+        WebSocket 连接是否因无法及时接收消息而被降级
+
+        :param uuid: 终端 / App 的 ID
+        """
+        return self._slow_consumers is not None \
+            and (websocket := self._uuid_to_ws.get(uuid)) is not None \
+            and self._slow_consumers.degraded(websocket)
+
     @property
     def client_id_to_target_id(self) -> Dict[UUID4, UUID4]:
         """
-        ``client_id`` 到 ``target_id`` 的映射
+        ``client_id`` 到 ``target_id`` 的映射，每次获取都会复制，不需要修改时可使用 :attr:`client_id_to_target_id_view`
         """
         return self._client_id_to_target_id.copy()
 
     @property
     def target_id_to_client_id(self) -> Dict[UUID4, UUID4]:
         """
-        ``target_id`` 到 ``client_id`` 的映射
+        ``target_id`` 到 ``client_id`` 的映射，每次获取都会复制，不需要修改时可使用 :attr:`target_id_to_client_id_view`
         """
         return self._target_id_to_client_id.copy()
 
     @property
     def uuid_to_ws(self) -> Dict[UUID4, WebSocketServerProtocol]:
         """
-        所有的 WebSocket 客户端 ID（包含终端与 App）到 WebSocket 连接对象的映射
+        所有的 WebSocket 客户端 ID（包含终端与 App）到 WebSocket 连接对象的映射，
+        每次获取都会复制，不需要修改时可使用 :attr:`uuid_to_ws_view`
         """
         return self._uuid_to_ws.copy()
 
@@ -120,6 +189,41 @@ class DGLabWSServer:
         """
         return set(self._client_id_to_queue.keys())
 
+    @property
+    def client_id_to_target_id_view(self) -> Mapping[UUID4, UUID4]:
+        """
+        ``client_id`` 到 ``target_id`` 映射的只读视图，不会复制，内容随服务端状态变化
+        """
+        return self._client_id_to_target_id_view
+
+    @property
+    def target_id_to_client_id_view(self) -> Mapping[UUID4, UUID4]:
+        """
+        ``target_id`` 到 ``client_id`` 映射的只读视图，不会复制，内容随服务端状态变化
+        """
+        return self._target_id_to_client_id_view
+
+    @property
+    def uuid_to_ws_view(self) -> Mapping[UUID4, WebSocketServerProtocol]:
+        """
+        WebSocket 客户端 ID 到 WebSocket 连接对象映射的只读视图，不会复制，内容随服务端状态变化
+        """
+        return self._uuid_to_ws_view
+
+    @property
+    def local_client_queues(self) -> Mapping[UUID4, asyncio.Queue]:
+        """
+        本地终端 ID 到其消息队列映射的只读视图，不会复制，内容随服务端状态变化
+        """
+        return self._client_id_to_queue_view
+
+    @property
+    def last_activity(self) -> Mapping[UUID4, float]:
+        """
+        终端 / App ID 到其最后一次发送消息（或建立连接）时间的只读视图，时间为 ``time.monotonic()``
+        """
+        return self._last_activity_view
+
     def new_local_client(self, max_queue: int = 2 ** 5) -> DGLabLocalClient:
         """
         创建新的本地终端 [`DGLabLocalClient`][pydglab_ws.client.local.DGLabLocalClient]，记录并返回
@@ -127,16 +231,18 @@ class DGLabWSServer:
         :return: 创建好的本地终端对象
         """
         client_id = uuid4()
-        return DGLabLocalClient(
+        self._last_activity[client_id] = time.monotonic()
+        self._local_clients[client_id] = client = DGLabLocalClient(
             client_id,
             self._message_handler,
             self._client_id_to_queue.setdefault,
             max_queue
         )
+        return client
 
     async def remove_local_client(self, client_id: UUID4) -> bool:
         """
-        移除已连接的本地终端，并通知 App 终端已掉线
+        移除已连接的本地终端，停止其后台任务，并通知 App 终端已掉线
 
         :param client_id: 要移除的本地终端 [`DGLabLocalClient`][pydglab_ws.client.local.DGLabLocalClient] 的 ID
         :return: 如果该终端并没有与服务端连接，返回 ``False``，否则返回 ``True``
@@ -146,6 +252,10 @@ class DGLabWSServer:
         except KeyError:
             return False
         else:
+            self._last_activity.pop(client_id, None)
+            if client := self._local_clients.pop(client_id, None):
+                await client.close()
+            _log.info("server.local_client_removed", "Local client %s removed", client_id, client_id=client_id)
             if client_id in self._client_id_to_target_id:
                 target_id = self._client_id_to_target_id.pop(client_id)
                 self._target_id_to_client_id.pop(target_id)
@@ -168,16 +278,52 @@ class DGLabWSServer:
         """
         发送 WebSocket 消息
 
+        设置了慢消费者策略时按策略发送，某个目标连接已断开时不影响向其他目标发送，
+        见 [`SlowConsumerPolicy`][pydglab_ws.server.slow_consumer.SlowConsumerPolicy]
+
         :param message: 要发送的消息
         :param wss: 发送目标连接
         """
+        data = None
         for websocket in wss:
             if websocket is not None:
-                await websocket.send(message.model_dump_json(by_alias=True, context={"separators": (",", ":")}))
+                if data is None:
+                    data = get_json_codec().dump_message(message)
+                if self._slow_consumers is not None:
+                    await self._slow_consumers.send(websocket, message, data)
+                else:
+                    await websocket.send(data)
         if to_local_client:
             if queue := self._client_id_to_queue.get(message.client_id):
                 await queue.put(message)
 
+    async def _evict_slow_consumer(self, uuid: UUID4, websocket: WebSocketServerProtocol):
+        """
+        断开无法及时接收消息的连接：尽量向其发送 ``break`` 消息后关闭连接，
+        连接关闭后按掉线处理，通知绑定的另一方
+
+        :param uuid: 终端 / App 的 ID
+        :param websocket: 连接对象
+        """
+        if (client_id := self._target_id_to_client_id.get(uuid)) is not None:
+            target_id = uuid
+        else:
+            client_id, target_id = uuid, self._client_id_to_target_id.get(uuid)
+        message = WebSocketMessage(
+            type=MessageType.BREAK,
+            client_id=client_id,
+            target_id=target_id,
+            message=RetCode.CLIENT_DISCONNECTED
+        )
+        try:
+            await asyncio.wait_for(
+                websocket.send(get_json_codec().dump_message(message)),
+                self._slow_consumers.policy.send_timeout
+            )
+        except (asyncio.TimeoutError, ConnectionClosed):
+            pass
+        await websocket.close(1008, "slow consumer")
+
     async def _heartbeat_sender(self):
         """
         心跳包发送器
@@ -185,7 +331,15 @@ class DGLabWSServer:
         注意此处 ``client_id`` 为心跳包接收方 ID，``target_id`` 为绑定方
         """
         while True:
-            for uuid, websocket in self._uuid_to_ws.items():
+            # 发送期间连接可能断开，遍历副本
+            connections = list(self._uuid_to_ws.items())
+            _log.debug(
+                "server.heartbeat",
+                "Sending heartbeats to %d connections",
+                len(connections),
+                connections=len(connections)
+            )
+            for uuid, websocket in connections:
                 await self._send(
                     WebSocketMessage(
                         type=MessageType.HEARTBEAT,
@@ -205,6 +359,17 @@ class DGLabWSServer:
         # 登记 WebSocket 客户端
         uuid = uuid4()
         self._uuid_to_ws[uuid] = websocket
+        self._last_activity[uuid] = time.monotonic()
+        if self._slow_consumers is not None:
+            self._slow_consumers.register(uuid, websocket)
+        _log.info(
+            "server.connect",
+            "Connection %s opened from %s",
+            uuid,
+            websocket.remote_address,
+            client_id=uuid,
+            remote_address=websocket.remote_address
+        )
         await self._send(
             WebSocketMessage(
                 type=MessageType.BIND,
@@ -224,9 +389,17 @@ class DGLabWSServer:
         # 响应消息
         try:
             async for message in websocket:
+                self._last_activity[uuid] = time.monotonic()
                 try:
-                    parsed_message = WebSocketMessage.model_validate_json(message)
+                    parsed_message = get_json_codec().load_message(message)
                 except ValueError:
+                    _log.warning(
+                        "server.non_json",
+                        "Rejected non-JSON message from %s",
+                        uuid,
+                        client_id=uuid,
+                        size=len(message)
+                    )
                     await self._send(
                         WebSocketMessage(
                             type=MessageType.MSG,
@@ -242,6 +415,18 @@ class DGLabWSServer:
         # 掉线处理
         # 与官方标准相比，补充了解绑操作
         self._uuid_to_ws.pop(uuid)
+        self._last_activity.pop(uuid, None)
+        if self._slow_consumers is not None:
+            self._slow_consumers.forget(websocket)
+        _log.info(
+            "server.disconnect",
+            "Connection %s closed with code %s",
+            uuid,
+            websocket.close_code,
+            client_id=uuid,
+            code=websocket.close_code,
+            bound_to=self._client_id_to_target_id.get(uuid) or self._target_id_to_client_id.get(uuid)
+        )
         # 第三方终端掉线
         if notice_id := self._client_id_to_target_id.get(uuid):
             self._client_id_to_target_id.pop(uuid)
@@ -287,12 +472,24 @@ class DGLabWSServer:
         消息接收器，接收消息并进行处理
 
         :param message: 收到的已解析的消息
-        :param websocket: 消息来源连接
+        :param websocket: 消息来源连接，来自本地终端时为 ``None``
         """
+        if websocket is None and message.client_id in self._last_activity:
+            self._last_activity[message.client_id] = time.monotonic()
         # 非法消息来源拒绝
         if websocket is not None \
                 and self._uuid_to_ws.get(message.client_id) != websocket \
                 and self._uuid_to_ws.get(message.target_id) != websocket:
+            _log.warning(
+                "server.invalid_source",
+                "Message from %s claims to be between %s and %s",
+                websocket.remote_address,
+                message.client_id,
+                message.target_id,
+                client_id=message.client_id,
+                target_id=message.target_id,
+                remote_address=websocket.remote_address
+            )
             await self._send(
                 WebSocketMessage(
                     type=MessageType.MSG,
@@ -335,6 +532,27 @@ class DGLabWSServer:
             else:
                 msg_to_send.message = RetCode.TARGET_CLIENT_NOT_FOUND
 
+            if msg_to_send.message == RetCode.SUCCESS:
+                _log.info(
+                    "server.bind",
+                    "Bound %s to %s",
+                    message.client_id,
+                    message.target_id,
+                    client_id=message.client_id,
+                    target_id=message.target_id
+                )
+            else:
+                _log.warning(
+                    "server.bind_failed",
+                    "Failed to bind %s to %s: %s",
+                    message.client_id,
+                    message.target_id,
+                    msg_to_send.message,
+                    client_id=message.client_id,
+                    target_id=message.target_id,
+                    ret_code=msg_to_send.message
+                )
+
             client_ws = self._uuid_to_ws.get(message.client_id)
             await self._send(
                 msg_to_send,
@@ -368,21 +586,40 @@ class DGLabWSServer:
             if self._client_id_to_target_id.get(message.client_id) != message.target_id:
                 msg_to_send.type = MessageType.BIND
                 msg_to_send.message = RetCode.INCOMPATIBLE_RELATIONSHIP
+                _log.warning(
+                    "server.incompatible_relationship",
+                    "Rejected message between unbound %s and %s",
+                    message.client_id,
+                    message.target_id,
+                    client_id=message.client_id,
+                    target_id=message.target_id
+                )
                 await self._send(
                     msg_to_send,
                     websocket,
                     to_local_client=websocket is None
                 )
             # 进行转发
-            elif (target_ws := self._uuid_to_ws[message.target_id]) == websocket:
-                client_ws = self._uuid_to_ws.get(message.client_id)
-                await self._send(
-                    msg_to_send,
-                    client_ws,
-                    to_local_client=client_ws is None
-                )
             else:
-                await self._send(msg_to_send, target_ws)
+                target_ws = self._uuid_to_ws[message.target_id]
+                _log.debug(
+                    "server.relay",
+                    "Relaying message between %s and %s",
+                    message.client_id,
+                    message.target_id,
+                    client_id=message.client_id,
+                    target_id=message.target_id,
+                    from_target=target_ws == websocket
+                )
+                if target_ws == websocket:
+                    client_ws = self._uuid_to_ws.get(message.client_id)
+                    await self._send(
+                        msg_to_send,
+                        client_ws,
+                        to_local_client=client_ws is None
+                    )
+                else:
+                    await self._send(msg_to_send, target_ws)
 
             if callback_set := self._message_type_to_callbacks.get(MessageType.MSG):
                 for callback in callback_set:
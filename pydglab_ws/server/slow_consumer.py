@@ -0,0 +1,286 @@
+"""
+慢消费者检测：根据 WebSocket 连接写缓冲区的大小和排空时间，对长时间无法及时接收消息的连接进行降级和断开
+
+写缓冲区指 websockets 和传输层中尚未写入套接字的数据，即 ``transport.get_write_buffer_size()``，
+数据写入套接字后停留在内核发送缓冲区的部分无法跨平台获取，不计入其中，但内核缓冲区满后数据会积压在写缓冲区中
+"""
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Callable, Coroutine, Any, Literal, Tuple, Set, Union
+
+from pydantic import UUID4
+from websockets import WebSocketServerProtocol, ConnectionClosed
+
+from ..enums import MessageType, MessageDataHead
+from ..log import EventLogger
+from ..models import WebSocketMessage
+
+__all__ = ("SlowConsumerPolicy", "SlowConsumerStats")
+
+_log = EventLogger("pydglab_ws.server")
+
+_STRENGTH = MessageDataHead.STRENGTH.value
+_CHANNEL_HEADS = (MessageDataHead.PULSE.value, MessageDataHead.CLEAR.value)
+
+_PendingKey = Union[Tuple[str, str], int]
+
+
+@dataclass
+class SlowConsumerPolicy:
+    """
+    服务端的慢消费者策略
+
+    连接的写缓冲区达到 ``congested_buffer`` 时视为拥塞：
+
+    1. 持续拥塞 ``degrade_after`` 秒后降级，按 ``degrade_mode`` 只发送部分消息
+    2. 持续拥塞 ``evict_after`` 秒后，或单次发送等待超过 ``send_timeout`` 秒时，向其发送 ``break`` 消息并断开连接
+    3. 降级的连接写缓冲区降到 ``recover_buffer`` 以下时恢复
+
+    未降级时消息总是按顺序发送，写缓冲区达到传输层的上限（websockets 的 ``write_limit``）时，
+    发送会等待缓冲区排空，拥塞时等待时间受 ``send_timeout`` 限制
+
+    :ivar congested_buffer: 视为拥塞的写缓冲区大小（字节）
+    :ivar recover_buffer: 降级后恢复的写缓冲区大小（字节）
+    :ivar degrade_after: 持续拥塞多久后降级（秒）
+    :ivar evict_after: 持续拥塞多久后断开（秒）
+    :ivar send_timeout: 拥塞时单次发送等待缓冲区排空的最长时间（秒）
+    :ivar degrade_mode: 降级方式，``"strength_only"`` - 只发送强度数据和控制消息（绑定、断开、心跳、响应码），
+        其他消息丢弃；``"latest_only"`` - 消息暂存，待缓冲区排空后发送，其中心跳、每个通道的波形操作和清空波形队列
+        只保留最新的一条，强度操作、反馈等其他消息不会合并，按顺序全部发送
+    :ivar check_interval: 检查所有连接的间隔（秒），没有新消息时也会按时降级、恢复、断开，并发送暂存的消息
+    """
+    congested_buffer: int = 2 ** 14
+    recover_buffer: int = 2 ** 12
+    degrade_after: float = 1
+    evict_after: float = 10
+    send_timeout: float = 5
+    degrade_mode: Literal["strength_only", "latest_only"] = "strength_only"
+    check_interval: float = 1
+
+
+@dataclass
+class SlowConsumerStats:
+    """
+    服务端的慢消费者统计
+
+    :ivar degraded: 连接被降级的次数
+    :ivar recovered: 连接从降级中恢复的次数
+    :ivar evicted: 因拥塞被断开的连接数
+    :ivar send_timeouts: 发送等待缓冲区排空超时的次数
+    :ivar dropped: 降级后丢弃的消息数
+    :ivar coalesced: 被同类的新消息替换而未发送的消息数
+    """
+    degraded: int = 0
+    recovered: int = 0
+    evicted: int = 0
+    send_timeouts: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+
+
+def _is_essential(message: WebSocketMessage) -> bool:
+    """``strength_only`` 降级时是否仍然发送"""
+    if message.type != MessageType.MSG or not isinstance(message.message, str):
+        return True
+    return message.message.startswith(_STRENGTH)
+
+
+def _coalesce_key(message: WebSocketMessage) -> Optional[Tuple[str, str]]:
+    """
+    ``latest_only`` 降级时可以只保留最新一条的消息：心跳，以及按通道区分的波形操作和清空波形队列
+
+    强度操作（包括相对的增加、减少）和反馈等消息每一条都有意义，返回 ``None``，不进行合并
+    """
+    if message.type == MessageType.HEARTBEAT:
+        return message.type.value, ""
+    value = message.message
+    if message.type != MessageType.MSG or not isinstance(value, str):
+        return None
+    if value.partition("-")[0] in _CHANNEL_HEADS:
+        return message.type.value, value.partition(":")[0]
+    return None
+
+
+def _buffer_size(websocket: WebSocketServerProtocol) -> int:
+    transport = websocket.transport
+    return transport.get_write_buffer_size() if transport is not None else 0
+
+
+class _ConnectionState:
+    __slots__ = ("uuid", "congested_since", "degraded", "pending", "evicting")
+
+    def __init__(self, uuid: UUID4):
+        self.uuid = uuid
+        self.congested_since: Optional[float] = None
+        self.degraded = False
+        self.pending: Dict[_PendingKey, str] = {}
+        """暂存待发送的消息，按最后更新的顺序排列，不合并的消息以序号作为键"""
+        self.evicting = False
+
+
+class _SlowConsumerGuard:
+    """
+    按 [`SlowConsumerPolicy`][pydglab_ws.server.slow_consumer.SlowConsumerPolicy] 发送消息，
+    由 [`DGLabWSServer`][pydglab_ws.server.server.DGLabWSServer] 使用
+
+    :param policy: 慢消费者策略
+    :param evict: 断开连接的回调函数，传入连接 ID 和连接对象
+    """
+
+    def __init__(
+            self,
+            policy: SlowConsumerPolicy,
+            evict: Callable[[UUID4, WebSocketServerProtocol], Coroutine[Any, Any, Any]]
+    ):
+        self.policy = policy
+        self.stats = SlowConsumerStats()
+        self._evict = evict
+        self._states: Dict[WebSocketServerProtocol, _ConnectionState] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._sequence = itertools.count()
+
+    def register(self, uuid: UUID4, websocket: WebSocketServerProtocol):
+        """开始跟踪连接"""
+        self._states[websocket] = _ConnectionState(uuid)
+
+    def forget(self, websocket: WebSocketServerProtocol):
+        """停止跟踪已断开的连接"""
+        self._states.pop(websocket, None)
+
+    def degraded(self, websocket: WebSocketServerProtocol) -> bool:
+        """连接是否处于降级状态"""
+        return (state := self._states.get(websocket)) is not None and state.degraded
+
+    def _update(self, websocket: WebSocketServerProtocol, state: _ConnectionState) -> int:
+        """根据写缓冲区大小更新拥塞状态，返回写缓冲区大小"""
+        policy = self.policy
+        buffer = _buffer_size(websocket)
+        if buffer >= policy.congested_buffer:
+            now = time.monotonic()
+            if state.congested_since is None:
+                state.congested_since = now
+            congested = now - state.congested_since
+            if congested >= policy.evict_after:
+                self._start_evict(websocket, state, "congested", buffer)
+            elif not state.degraded and congested >= policy.degrade_after:
+                state.degraded = True
+                self.stats.degraded += 1
+                _log.warning(
+                    "server.slow_consumer_degraded",
+                    "Connection %s degraded to %s, write buffer %d bytes",
+                    state.uuid,
+                    policy.degrade_mode,
+                    buffer,
+                    client_id=state.uuid,
+                    mode=policy.degrade_mode,
+                    buffer=buffer,
+                    congested=congested
+                )
+        else:
+            state.congested_since = None
+            if state.degraded and buffer <= policy.recover_buffer:
+                state.degraded = False
+                self.stats.recovered += 1
+                _log.info(
+                    "server.slow_consumer_recovered",
+                    "Connection %s recovered",
+                    state.uuid,
+                    client_id=state.uuid,
+                    buffer=buffer
+                )
+        return buffer
+
+    def _start_evict(self, websocket: WebSocketServerProtocol, state: _ConnectionState, reason: str, buffer: int):
+        if state.evicting:
+            return
+        state.evicting = True
+        self.stats.dropped += len(state.pending)
+        state.pending.clear()
+        self.stats.evicted += 1
+        _log.warning(
+            "server.slow_consumer_evicted",
+            "Evicting connection %s (%s), write buffer %d bytes",
+            state.uuid,
+            reason,
+            buffer,
+            client_id=state.uuid,
+            reason=reason,
+            buffer=buffer
+        )
+        task = asyncio.create_task(self._evict(state.uuid, websocket))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def send(self, websocket: WebSocketServerProtocol, message: WebSocketMessage, data: str):
+        """
+        按策略发送消息
+
+        :param websocket: 目标连接
+        :param message: 消息
+        :param data: 已编码的消息
+        """
+        state = self._states.get(websocket)
+        if state is None:
+            # 尚未登记或已断开的连接
+            await self._write(websocket, None, data)
+            return
+        buffer = self._update(websocket, state)
+        if state.evicting:
+            self.stats.dropped += 1
+            return
+        if state.degraded and self.policy.degrade_mode == "strength_only" and not _is_essential(message):
+            self.stats.dropped += 1
+            return
+        if state.pending or (state.degraded and self.policy.degrade_mode == "latest_only"):
+            # 已有暂存的消息时同样暂存，保证按顺序发送
+            key = _coalesce_key(message)
+            if key is None:
+                key = next(self._sequence)
+            elif state.pending.pop(key, None) is not None:
+                self.stats.coalesced += 1
+            state.pending[key] = data
+            await self._flush(websocket, state, buffer)
+            return
+        await self._write(websocket, state, data, buffer)
+
+    async def _flush(self, websocket: WebSocketServerProtocol, state: _ConnectionState, buffer: int):
+        """按顺序发送暂存的消息，``latest_only`` 降级且仍然拥塞时继续暂存"""
+        policy = self.policy
+        while state.pending and not state.evicting:
+            if state.degraded and policy.degrade_mode == "latest_only" and buffer >= policy.congested_buffer:
+                return
+            key = next(iter(state.pending))
+            await self._write(websocket, state, state.pending.pop(key), buffer)
+            buffer = _buffer_size(websocket)
+
+    async def _write(
+            self,
+            websocket: WebSocketServerProtocol,
+            state: Optional[_ConnectionState],
+            data: str,
+            buffer: int = 0
+    ):
+        """发送消息，拥塞时限制等待缓冲区排空的时间"""
+        try:
+            if state is None or buffer < self.policy.congested_buffer:
+                await websocket.send(data)
+            else:
+                await asyncio.wait_for(websocket.send(data), self.policy.send_timeout)
+        except asyncio.TimeoutError:
+            self.stats.send_timeouts += 1
+            self._start_evict(websocket, state, "send timeout", _buffer_size(websocket))
+        except ConnectionClosed:
+            pass
+
+    async def monitor(self):
+        """定期检查所有连接，并发送暂存的消息"""
+        while True:
+            await asyncio.sleep(self.policy.check_interval)
+            for websocket, state in list(self._states.items()):
+                if state.evicting:
+                    continue
+                buffer = self._update(websocket, state)
+                if state.pending and not state.evicting:
+                    await self._flush(websocket, state, buffer)
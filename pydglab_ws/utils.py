@@ -1,36 +1,56 @@
 """
 此处提供一些工具函数
 """
-import json
+from enum import Enum, IntEnum
+from functools import lru_cache
+from typing import Optional, List, Union, Tuple
 
 from pydantic import UUID4
 
-from .enums import StrengthOperationType, Channel, MessageDataHead, FeedbackButton
-from .exceptions import InvalidStrengthData, InvalidFeedbackData, InvalidPulseOperation, PulseDataTooLong
-from .models import StrengthData, WS_MESSAGE_MAX_LENGTH
+from .codec import get_json_codec
+from .enums import StrengthOperationType, Channel, MessageDataHead, FeedbackButton, MessageType, RetCode
+from .exceptions import InvalidStrengthData, InvalidFeedbackData, PulseDataTooLong
+from .models import StrengthData, StrengthRecord, WS_MESSAGE_MAX_LENGTH, WebSocketMessage
+from .pulse._encode import PULSE_DATA_MAX_LENGTH, dump_pulse_operation, _dump_pulse_operations, _dump_add_pulses
+from .pulse.array import PulseArray
+from .pulse.prepared import PreparedPulses
 from .typing import PulseOperation
 
 __all__ = (
     "PULSE_DATA_MAX_LENGTH",
+    "PULSE_QUEUE_MAX_LENGTH",
+    "PULSE_OPERATION_DURATION",
+    "PULSE_DATA_APP_MAX_LENGTH",
+    "pulse_data_max_length",
     "dump_pulse_operation",
+    "dump_pulse_operations",
     "dg_lab_client_qrcode",
     "dump_strength_operation",
     "parse_strength_data",
+    "parse_strength_record",
     "dump_add_pulses",
+    "dump_add_pulses_chunks",
     "dump_clear_pulses",
+    "dump_message_prefix",
+    "dump_message",
     "parse_feedback_data"
 )
 
-# {"type":"msg","clientId":"","targetId":"","message":"pulse-A:[]"} - 65bit
-# {"type":"msg","clientId":"`32bit`","targetId":"`32bit`","message":"pulse-A:[]"} - 129bit
-# \"`16bit`\", - 21bit
-# {"type":"msg","clientId":"`32bit`","targetId":"`32bit`","message":"pulse-A:[\"`16bit`\",\"`16bit`\"]"}
-PULSE_DATA_MAX_LENGTH = (WS_MESSAGE_MAX_LENGTH - 129 + 1) // 21  # 86
-"""
-波形操作列表最大长度，计算结果为 ``86``
+PULSE_QUEUE_MAX_LENGTH = 500
+"""App 中的波形队列最大长度，多余的波形操作数据会被 App 丢弃"""
 
-``(WS_MESSAGE_MAX_LENGTH - 129 + 1) // 21``
-"""
+PULSE_OPERATION_DURATION = 0.1
+"""每条波形操作数据的持续时间（秒）"""
+
+PULSE_DATA_APP_MAX_LENGTH = 100
+"""App 单条消息可接收的波形操作列表最大长度"""
+
+# 波形操作数据在 WebSocket 消息中的长度，包含转义后的引号与逗号：\"`16bit`\",
+_PULSE_OPERATION_DUMPED_LENGTH = 21
+
+
+# 强度数据大多与最近收到的相同，缓存最近解析过的消息
+_STRENGTH_DATA_CACHE_SIZE = 64
 
 
 def parse_strength_data(data: str) -> StrengthData:
@@ -52,6 +72,22 @@ def parse_strength_data(data: str) -> StrengthData:
         raise InvalidStrengthData(data) from e
 
 
+@lru_cache(maxsize=_STRENGTH_DATA_CACHE_SIZE)
+def parse_strength_record(data: str) -> StrengthRecord:
+    """
+    解析消息中的强度数据为 [`StrengthRecord`][pydglab_ws.models.StrengthRecord]，
+    比 :func:`parse_strength_data` 开销更小，相同的消息会返回缓存的同一个对象
+
+    :param data: WebSocket 消息中的 ``message``
+    :raise InvalidStrengthData: [`InvalidStrengthData`][pydglab_ws.exceptions.InvalidStrengthData]
+    """
+    try:
+        a, b, a_limit, b_limit = map(int, data.split("-")[1].split("+")[:4])
+    except (IndexError, ValueError) as e:
+        raise InvalidStrengthData(data) from e
+    return StrengthRecord(a, b, a_limit, b_limit)
+
+
 def parse_feedback_data(data: str) -> FeedbackButton:
     """
     解析消息中的 App 反馈数据
@@ -91,45 +127,140 @@ def dump_clear_pulses(channel: Channel) -> str:
     return f"{MessageDataHead.CLEAR.value}-{channel.value}"
 
 
-def dump_pulse_operation(pulse: PulseOperation) -> str:
+_Pulses = Union[PulseOperation, PulseArray, PreparedPulses]
+
+
+def _pulses_length(pulses: Tuple[_Pulses, ...]) -> int:
+    """波形操作数据的数量，参数与 :func:`dump_pulse_operations` 相同"""
+    if len(pulses) == 1 and isinstance(pulses[0], (PulseArray, PreparedPulses)):
+        return len(pulses[0])
+    return len(pulses)
+
+
+def dump_pulse_operations(*pulses: _Pulses) -> List[str]:
     """
-    生成波形操作的数据
+    生成多条波形操作的数据
 
-    :param pulse: 波形操作数据
-    :return: 返回数据与蓝牙协议类似
+    传入单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray] 时，整批数据一次性编码；
+    传入单个 [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses] 时，直接使用已编码的数据
+
+    :param pulses: 波形操作数据，或单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]、
+        [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
     :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
     """
-    try:
-        pulse_bytes = bytes().join(
-            # int.to_bytes Python 3.11 才添加了 length, byteorder 的默认参数值
-            value.to_bytes(
-                length=1,
-                byteorder='big'
-            ) for operation in pulse for value in operation
-        )
-    except (TypeError, AttributeError, OverflowError) as e:
-        raise InvalidPulseOperation(pulse) from e
-    else:
-        return pulse_bytes.hex()
+    if len(pulses) == 1 and isinstance(pulses[0], PreparedPulses):
+        return list(pulses[0].hex)
+    return _dump_pulse_operations(pulses)
 
 
 def dump_add_pulses(
         channel: Channel,
-        *pulses: PulseOperation
+        *pulses: _Pulses,
+        max_length: int = PULSE_DATA_MAX_LENGTH
 ) -> str:
     """
     生成下放波形操作的数据
 
     :param channel: 通道选择
-    :param pulses: 波形操作数据
+    :param pulses: 波形操作数据，或单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]、
+        [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
+    :param max_length: 波形操作列表最大长度，可通过 :func:`pulse_data_max_length` 按实际的 ID 计算
     :return: 返回数据可作为 WebSocket 消息中的 ``message``
     :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
     :raise PulseDataTooLong: 波形操作数据过长，最大长度应为 [`PULSE_DATA_MAX_LENGTH`][pydglab_ws.utils.PULSE_DATA_MAX_LENGTH]
     """
-    if (pulses_length := len(pulses)) > PULSE_DATA_MAX_LENGTH:
+    if len(pulses) == 1 and isinstance(pulses[0], PreparedPulses):
+        return pulses[0].message(channel, max_length)
+    dumped = dump_pulse_operations(*pulses)
+    if (pulses_length := len(dumped)) > max_length:
         raise PulseDataTooLong(pulses_length)
-    return (f"{MessageDataHead.PULSE.value}-{channel.name}"
-            f":{json.dumps([dump_pulse_operation(pulse) for pulse in pulses], separators=(',', ':'))}")
+    return _dump_add_pulses(channel, dumped)
+
+
+def pulse_data_max_length(client_id: Optional[UUID4], target_id: Optional[UUID4]) -> int:
+    """
+    根据实际的 ``clientId`` 和 ``targetId``，计算单条 WebSocket 消息可容纳的波形操作列表最大长度
+
+    结果不会超过 App 的限制 [`PULSE_DATA_APP_MAX_LENGTH`][pydglab_ws.utils.PULSE_DATA_APP_MAX_LENGTH]
+
+    :param client_id: 终端 ID
+    :param target_id: App ID
+    """
+    empty_message = get_json_codec().dump_message(WebSocketMessage(
+        type=MessageType.MSG,
+        client_id=client_id,
+        target_id=target_id,
+        message=dump_add_pulses(Channel.A)
+    ))
+    # 第一条波形操作数据前没有逗号，因此加一
+    return min(
+        (WS_MESSAGE_MAX_LENGTH - len(empty_message) + 1) // _PULSE_OPERATION_DUMPED_LENGTH,
+        PULSE_DATA_APP_MAX_LENGTH
+    )
+
+
+def dump_add_pulses_chunks(
+        channel: Channel,
+        *pulses: _Pulses,
+        max_length: int = PULSE_DATA_MAX_LENGTH
+) -> List[str]:
+    """
+    生成下放波形操作的数据，波形操作数据过长时，按顺序拆分为尽可能少的多条数据
+
+    :param channel: 通道选择
+    :param pulses: 波形操作数据，长度不限，或单个 [`PulseArray`][pydglab_ws.pulse.array.PulseArray]、
+        [`PreparedPulses`][pydglab_ws.pulse.prepared.PreparedPulses]
+    :param max_length: 每条数据的波形操作列表最大长度，可通过 :func:`pulse_data_max_length` 计算
+    :return: 返回的每条数据都可作为 WebSocket 消息中的 ``message``
+    :raise InvalidPulseOperation: [`InvalidPulseOperation`][pydglab_ws.exceptions.InvalidPulseOperation]
+    """
+    if len(pulses) == 1 and isinstance(pulses[0], PreparedPulses):
+        return pulses[0].chunks(channel, max_length)
+    dumped = dump_pulse_operations(*pulses)
+    return [
+        _dump_add_pulses(channel, dumped[i:i + max_length])
+        for i in range(0, len(dumped), max_length)
+    ]
+
+
+def dump_message_prefix(
+        msg_type: MessageType,
+        client_id: Optional[UUID4],
+        target_id: Optional[UUID4]
+) -> str:
+    """
+    生成 WebSocket 消息中 ``message`` 的值之前的部分，即 ``{"type":...,"message":``
+
+    同一终端在绑定后 ``type``, ``clientId``, ``targetId`` 不再变化，可缓存该结果，
+    再通过 :func:`dump_message` 生成完整的消息
+
+    :param msg_type: :attr:`WebSocketMessage.type`
+    :param client_id: 终端 ID
+    :param target_id: App ID
+    """
+    dumped = get_json_codec().dump_message(WebSocketMessage(
+        type=msg_type,
+        client_id=client_id,
+        target_id=target_id,
+        message=""
+    ))
+    # 去除末尾的 ""}
+    return dumped[:-3]
+
+
+def dump_message(prefix: str, message: Union[str, RetCode, MessageDataHead]) -> str:
+    """
+    根据 :func:`dump_message_prefix` 生成的前缀，生成完整的 WebSocket 消息，
+    结果与 [`WebSocketMessage`][pydglab_ws.models.WebSocketMessage] 的序列化结果一致
+
+    :param prefix: :func:`dump_message_prefix` 的结果
+    :param message: :attr:`WebSocketMessage.message`
+    """
+    if isinstance(message, IntEnum):
+        message = str(message.value)
+    elif isinstance(message, Enum):
+        message = message.value
+    return f"{prefix}{get_json_codec().dumps(message)}}}"
 
 
 def dg_lab_client_qrcode(uri: str, client_id: UUID4) -> str:
@@ -0,0 +1,83 @@
+"""
+比较 WebSocket 终端逐条发送与批量发送六个操作（清空 A/B、设置 A/B 强度、下发 A/B 波形）的耗时
+
+服务端与模拟的 App 运行在子进程中，只统计终端所在进程的 CPU 耗时
+
+运行：``python -m scripts.bench_batch_send``
+"""
+import asyncio
+import multiprocessing
+import time
+
+from websockets.client import connect
+
+from pydglab_ws import DGLabWSServer, DGLabWSConnect, DGLabWSClient, Channel, StrengthOperationType
+from tests.app_simulator import DGLabAppSimulator
+
+HOST = "127.0.0.1"
+PORT = 5679
+URI = f"ws://{HOST}:{PORT}"
+ROUNDS = 1000
+# 每轮之间留出时间让服务端处理完消息，避免测到的是服务端的吞吐量
+ROUND_INTERVAL = 0.002
+PULSES = [((10, 10, 10, 10), (0, 10, 20, 30))] * 10
+
+
+async def sequential(client: DGLabWSClient):
+    await client.clear_pulses(Channel.A)
+    await client.clear_pulses(Channel.B)
+    await client.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+    await client.set_strength(Channel.B, StrengthOperationType.SET_TO, 10)
+    await client.add_pulses(Channel.A, *PULSES)
+    await client.add_pulses(Channel.B, *PULSES)
+
+
+async def batched(client: DGLabWSClient):
+    async with client.batch() as batch:
+        batch.clear_pulses(Channel.A)
+        batch.clear_pulses(Channel.B)
+        batch.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+        batch.set_strength(Channel.B, StrengthOperationType.SET_TO, 10)
+        batch.add_pulses(Channel.A, *PULSES)
+        batch.add_pulses(Channel.B, *PULSES)
+
+
+async def serve(client_ids: multiprocessing.Queue, ready: multiprocessing.Event):
+    async with DGLabWSServer(HOST, PORT, 60):
+        ready.set()
+        async with connect(URI) as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            await app.bind(await asyncio.get_running_loop().run_in_executor(None, client_ids.get))
+            # 持续读取消息，直到终端断开连接
+            async for _ in websocket:
+                pass
+
+
+def run_server(client_ids: multiprocessing.Queue, ready: multiprocessing.Event):
+    asyncio.run(serve(client_ids, ready))
+
+
+async def main():
+    client_ids = multiprocessing.Queue()
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_server, args=(client_ids, ready), daemon=True)
+    server.start()
+    ready.wait()
+    async with DGLabWSConnect(URI) as client:
+        client_ids.put(client.client_id)
+        await client.bind()
+        for name, func in ("sequential", sequential), ("batch", batched):
+            elapsed = 0.0
+            for _ in range(ROUNDS):
+                start = time.process_time()
+                await func(client)
+                elapsed += time.process_time() - start
+                await asyncio.sleep(ROUND_INTERVAL)
+            elapsed /= ROUNDS
+            print(f"{name}: {elapsed * 1e6:.1f} us per reaction")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
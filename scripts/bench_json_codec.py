@@ -0,0 +1,54 @@
+"""
+比较各 JSON 编解码后端的耗时，只测试当前环境中已安装的后端：
+
+- 编码完整的 WebSocket 消息（服务端转发、App 模拟器发送）
+- 编码波形操作列表（``dump_add_pulses``）
+- 解码 JSON（终端接收时的快速判断）
+- 解码并校验完整的 WebSocket 消息
+
+运行：``python -m scripts.bench_json_codec``
+"""
+import timeit
+from uuid import uuid4
+
+from pydglab_ws.codec import available_json_codecs
+from pydglab_ws.enums import MessageType, Channel
+from pydglab_ws.models import WebSocketMessage
+from pydglab_ws.utils import dump_add_pulses, dump_pulse_operations, PULSE_DATA_MAX_LENGTH
+
+NUMBER = 20_000
+
+
+def main():
+    message = WebSocketMessage(
+        type=MessageType.MSG,
+        client_id=uuid4(),
+        target_id=uuid4(),
+        message="strength-10+20+100+100"
+    )
+    pulses = dump_pulse_operations(*[((10, 10, 20, 30), (0, 5, 10, 50))] * PULSE_DATA_MAX_LENGTH)
+    pulses_message = WebSocketMessage(
+        type=MessageType.MSG,
+        client_id=message.client_id,
+        target_id=message.target_id,
+        message=dump_add_pulses(Channel.A, *[((10, 10, 20, 30), (0, 5, 10, 50))] * PULSE_DATA_MAX_LENGTH)
+    )
+    for name, codec_type in available_json_codecs().items():
+        codec = codec_type()
+        raw = codec.dump_message(message)
+        raw_pulses = codec.dump_message(pulses_message)
+        cases = {
+            "dump_message": lambda: codec.dump_message(message),
+            f"dumps ({PULSE_DATA_MAX_LENGTH} pulses)": lambda: codec.dumps(pulses),
+            "loads": lambda: codec.loads(raw),
+            f"loads ({PULSE_DATA_MAX_LENGTH} pulses)": lambda: codec.loads(raw_pulses),
+            "load_message": lambda: codec.load_message(raw),
+        }
+        print(f"{name}:")
+        for case, func in cases.items():
+            duration = timeit.timeit(func, number=NUMBER) / NUMBER
+            print(f"  {case}: {duration * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+测量服务端转发消息时记录 ``server.relay`` 日志事件的耗时：
+
+- 未启用 ``DEBUG`` 级别
+- 启用 ``DEBUG`` 级别，按默认策略采样 1%
+- 启用 ``DEBUG`` 级别，不采样，直接输出到 ``StreamHandler``（写入 ``/dev/null``）
+- 启用 ``DEBUG`` 级别，不采样，通过 ``QueueLogging`` 交给后台线程输出
+
+运行：``python -m scripts.bench_log``
+"""
+import logging
+import os
+import timeit
+from uuid import uuid4
+
+from pydglab_ws.log import EventLogger, EventPolicy, JSONFormatter, QueueLogging, set_event_policy, \
+    get_event_policy
+
+NUMBER = 100_000
+
+_log = EventLogger("pydglab_ws.server")
+CLIENT_ID = uuid4()
+TARGET_ID = uuid4()
+
+
+def relay():
+    _log.debug(
+        "server.relay",
+        "Relaying message between %s and %s",
+        CLIENT_ID,
+        TARGET_ID,
+        client_id=CLIENT_ID,
+        target_id=TARGET_ID,
+        from_target=False
+    )
+
+
+def measure(name: str):
+    duration = timeit.timeit(relay, number=NUMBER)
+    print(f"{name}: {duration / NUMBER * 1e6:.2f} us per event")
+
+
+def main():
+    logger = logging.getLogger("pydglab_ws")
+    default_policy = get_event_policy("server.relay")
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(JSONFormatter())
+
+        logger.setLevel(logging.INFO)
+        measure("disabled")
+
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+        measure("sampled 1%")
+
+        set_event_policy("server.relay", EventPolicy())
+        measure("unsampled, stream handler")
+        logger.removeHandler(handler)
+
+        with QueueLogging(handler, max_size=NUMBER) as queue_logging:
+            set_event_policy("server.relay", EventPolicy())
+            measure("unsampled, queue handler")
+        print(f"queue handler dropped {queue_logging.dropped} events")
+    set_event_policy("server.relay", default_policy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+比较终端未启动消息分发器时两种接收方式的耗时，模拟 App 高频返回强度数据：
+
+- 每条消息都通过 ``WebSocketMessage.model_validate_json`` 完整解析（``DGLabClient`` 的通用做法）
+- 先快速取出 ``type`` 和 ``message``，直接解析强度和反馈数据，跳过不需要的消息（``DGLabWSClient`` 的做法）
+
+运行：``python -m scripts.bench_recv_fast_path``
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+from pydglab_ws.client import DGLabClient, DGLabWSClient
+from pydglab_ws.enums import MessageType, RetCode, FeedbackButton
+from pydglab_ws.models import StrengthData
+from pydglab_ws.utils import dump_message_prefix, dump_message
+
+NUMBER = 50_000
+
+
+class FrameWebSocket:
+    """循环返回预先准备的消息"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+
+    async def recv(self) -> str:
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return frame
+
+
+def make_frames(client_id, target_id):
+    prefix = dump_message_prefix(MessageType.MSG, client_id, target_id)
+    # 强度数据为主，偶尔有心跳和反馈，强度在小范围内变化
+    frames = [dump_message(prefix, f"strength-{i % 10}+{i % 5}+100+100") for i in range(98)]
+    frames.append(dump_message(dump_message_prefix(MessageType.HEARTBEAT, client_id, None), RetCode.SUCCESS))
+    frames.append(dump_message(prefix, "feedback-1"))
+    return frames
+
+
+async def run(fast: bool, targets: tuple) -> float:
+    client_id, target_id = uuid4(), uuid4()
+    websocket = FrameWebSocket(make_frames(client_id, target_id))
+    client = DGLabWSClient(websocket)
+    client._client_id, client._target_id = client_id, target_id
+    recv_data = client._recv_data if fast else lambda x: DGLabClient._recv_data(client, x)
+    start = time.perf_counter()
+    while websocket.index < NUMBER:
+        await recv_data(targets)
+    return (time.perf_counter() - start) / websocket.index
+
+
+async def main():
+    for name, targets in (
+            ("all data", ()),
+            ("strength only", (StrengthData,)),
+            ("feedback only", (FeedbackButton,)),
+    ):
+        full_time = await run(False, targets)
+        fast_time = await run(True, targets)
+        print(
+            f"{name}: full parse {full_time * 1e6:.2f} us/frame, "
+            f"fast path {fast_time * 1e6:.2f} us/frame, "
+            f"{full_time / fast_time:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
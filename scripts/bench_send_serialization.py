@@ -0,0 +1,48 @@
+"""
+比较终端发送消息时两种序列化方式的耗时：
+
+- 每次构建 ``WebSocketMessage`` 并调用 ``model_dump_json``
+- 缓存消息前缀，每次只序列化 ``message``（``DGLabWSClient`` 的做法）
+
+运行：``python -m scripts.bench_send_serialization``
+"""
+import timeit
+from uuid import uuid4
+
+from pydglab_ws.enums import MessageType, Channel, StrengthOperationType
+from pydglab_ws.models import WebSocketMessage
+from pydglab_ws.utils import dump_message_prefix, dump_message, dump_strength_operation, dump_add_pulses
+
+NUMBER = 100_000
+
+
+def main():
+    client_id, target_id = uuid4(), uuid4()
+    prefix = dump_message_prefix(MessageType.MSG, client_id, target_id)
+    messages = {
+        "set_strength": dump_strength_operation(Channel.A, StrengthOperationType.INCREASE, 1),
+        "add_pulses (10)": dump_add_pulses(Channel.A, *[((10, 10, 10, 10), (0, 20, 40, 60))] * 10),
+    }
+    for name, message in messages.items():
+        def pydantic_dump():
+            WebSocketMessage(
+                type=MessageType.MSG,
+                client_id=client_id,
+                target_id=target_id,
+                message=message
+            ).model_dump_json(by_alias=True, context={"separators": (",", ":")})
+
+        def prefix_dump():
+            dump_message(prefix, message)
+
+        pydantic_time = timeit.timeit(pydantic_dump, number=NUMBER) / NUMBER
+        prefix_time = timeit.timeit(prefix_dump, number=NUMBER) / NUMBER
+        print(
+            f"{name}: pydantic {pydantic_time * 1e6:.2f} us, "
+            f"prefix {prefix_time * 1e6:.2f} us, "
+            f"{pydantic_time / prefix_time:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
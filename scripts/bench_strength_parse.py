@@ -0,0 +1,50 @@
+"""
+比较两种强度数据解析方式的耗时和内存分配：
+
+- 每次构建 Pydantic 模型 ``StrengthData``
+- 缓存解析结果，返回 ``StrengthRecord``（``parse_strength_record`` 的做法）
+
+消息中的强度数据大多与最近收到的相同，这里用少量不同的消息循环模拟
+
+运行：``python -m scripts.bench_strength_parse``
+"""
+import timeit
+import tracemalloc
+
+from pydglab_ws.models import StrengthData
+from pydglab_ws.utils import parse_strength_record
+
+NUMBER = 100_000
+MESSAGES = [f"strength-{a}+{a // 2}+100+100" for a in range(20)]
+
+
+def pydantic_parse(data: str) -> StrengthData:
+    values = data.split("-")[1].split("+")
+    return StrengthData(a=int(values[0]), b=int(values[1]), a_limit=int(values[2]), b_limit=int(values[3]))
+
+
+def measure_allocations(parse) -> float:
+    """每条消息的平均内存分配次数"""
+    parse(MESSAGES[0])
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [parse(MESSAGES[i % len(MESSAGES)]) for i in range(NUMBER // 10)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # 结果列表本身的分配不计入
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, "lineno") if stat.count_diff > 0) - 1
+    del results
+    return allocations / (NUMBER // 10)
+
+
+def main():
+    for name, parse in (("pydantic", pydantic_parse), ("cached record", parse_strength_record)):
+        duration = timeit.timeit(lambda: [parse(message) for message in MESSAGES], number=NUMBER // len(MESSAGES))
+        print(
+            f"{name}: {duration / NUMBER * 1e6:.2f} us, "
+            f"{measure_allocations(parse):.2f} live allocations per frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
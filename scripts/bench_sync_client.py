@@ -0,0 +1,71 @@
+"""
+比较同步程序跨线程调用终端操作的开销：
+
+- 每个操作调用一次 ``asyncio.run_coroutine_threadsafe``
+- 通过 ``DGLabSyncClient`` 提交，多个操作共用一次跨线程唤醒并批量发送
+
+分别在终端未绑定（只有跨线程调度的开销）和与 App 绑定后执行，服务端运行在同一后台线程中，
+计时包含等待所有操作完成
+
+运行：``python -m scripts.bench_sync_client``
+"""
+import asyncio
+import time
+
+from websockets.client import connect
+
+from pydglab_ws import DGLabSyncClient, Channel, StrengthOperationType
+from tests.app_simulator import DGLabAppSimulator
+
+HOST = "127.0.0.1"
+PORT = 5680
+URI = f"ws://{HOST}:{PORT}"
+CALLS = 5000
+
+
+async def bind_app(sync_client: DGLabSyncClient):
+    """在后台线程中模拟 App 完成绑定，并持续读取消息"""
+    websocket = await connect(URI, max_queue=None)
+    app = DGLabAppSimulator(websocket)
+    await app.register()
+    await app.bind(sync_client.client_id)
+    asyncio.create_task(websocket.wait_closed())
+
+
+def measure(sync_client: DGLabSyncClient, label: str):
+    client = sync_client.client
+
+    start = time.perf_counter()
+    futures = [
+        asyncio.run_coroutine_threadsafe(
+            client.set_strength(Channel.A, StrengthOperationType.SET_TO, i % 200),
+            sync_client.loop
+        ) for i in range(CALLS)
+    ]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    print(f"[{label}] run_coroutine_threadsafe: {elapsed / CALLS * 1e6:.1f} us per call")
+
+    start = time.perf_counter()
+    futures = [
+        sync_client.set_strength(Channel.A, StrengthOperationType.SET_TO, i % 200)
+        for i in range(CALLS)
+    ]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    print(f"[{label}] DGLabSyncClient: {elapsed / CALLS * 1e6:.1f} us per call")
+
+
+def main():
+    with DGLabSyncClient.local(HOST, PORT) as sync_client:
+        # 未绑定时操作不会被发送，只包含跨线程调度的开销
+        measure(sync_client, "unbound")
+        asyncio.run_coroutine_threadsafe(bind_app(sync_client), sync_client.loop).result()
+        sync_client.bind(5)
+        measure(sync_client, "bound")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from typing import Optional, Literal
 from pydantic import UUID4
 from websockets import WebSocketClientProtocol
 
+from pydglab_ws.codec import get_json_codec
 from pydglab_ws.enums import MessageType, MessageDataHead, FeedbackButton, RetCode
 from pydglab_ws.models import WebSocketMessage, StrengthData
 
@@ -18,11 +19,11 @@ class DGLabAppSimulator:
         self.client_id: Optional[UUID4] = None
 
     async def _send(self, message: WebSocketMessage):
-        await self.websocket.send(message.model_dump_json(by_alias=True, context={"separators": (",", ":")}))
+        await self.websocket.send(get_json_codec().dump_message(message))
 
     async def _recv(self) -> WebSocketMessage:
         raw_message = await self.websocket.recv()
-        return WebSocketMessage.model_validate_json(raw_message)
+        return get_json_codec().load_message(raw_message)
 
     async def _recv_owned(self) -> WebSocketMessage:
         while True:
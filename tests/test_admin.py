@@ -0,0 +1,116 @@
+import asyncio
+import json
+from typing import Tuple, Dict, Any, Optional
+from uuid import uuid4
+
+import pytest
+from websockets.client import connect
+
+from pydglab_ws.server import DGLabWSServer
+from pydglab_ws.server.admin import DGLabAdmin
+from tests.app_simulator import DGLabAppSimulator
+
+ADMIN_HOST = "127.0.0.1"
+ADMIN_PORT = 5679
+ADMIN_TOKEN = "secret"
+
+
+async def http_get(path: str, token: Optional[str] = ADMIN_TOKEN) -> Tuple[int, Dict[str, Any]]:
+    reader, writer = await asyncio.open_connection(ADMIN_HOST, ADMIN_PORT)
+    headers = f"GET {path} HTTP/1.1\r\nHost: {ADMIN_HOST}\r\n"
+    if token is not None:
+        headers += f"Authorization: Bearer {token}\r\n"
+    writer.write(f"{headers}\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body) if body.startswith(b"{") else {}
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint():
+    def process_request(path, _request_headers):
+        if path == "/ping":
+            return 200, [], b"{}"
+
+    async with DGLabWSServer(
+            ADMIN_HOST,
+            ADMIN_PORT,
+            admin_path="/admin",
+            admin_token=ADMIN_TOKEN,
+            process_request=process_request
+    ) as server:
+        assert server.admin is not None
+        # 视图不可修改，且随服务端状态变化
+        with pytest.raises(TypeError):
+            server.uuid_to_ws_view[uuid4()] = None  # type: ignore
+
+        local_clients = [server.new_local_client() for _ in range(3)]
+        async with connect(f"ws://{ADMIN_HOST}:{ADMIN_PORT}") as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            client = local_clients[0]
+            await app.bind(client.client_id)
+            await client.bind()
+            assert server.client_id_to_target_id_view == {client.client_id: app.target_id}
+            assert set(server.last_activity) == {app.target_id, *(c.client_id for c in local_clients)}
+
+            assert (await http_get("/admin/health", token=None))[0] == 401
+            assert (await http_get("/admin/health", token="wrong"))[0] == 401
+            assert (await http_get("/admin/health", token="密钥"))[0] == 401
+            assert (await http_get("/ping"))[0] == 200
+            assert (await http_get("/admin/unknown"))[0] == 404
+            assert (await http_get("/admin/connections?limit=0"))[0] == 400
+
+            status, health = await http_get("/admin/health")
+            assert status == 200
+            assert health["status"] == "ok"
+            assert (health["connections"], health["local_clients"], health["bindings"]) == (1, 3, 1)
+            assert health["loop_lag"] >= 0
+
+            status, page = await http_get("/admin/connections?offset=1&limit=2")
+            assert status == 200
+            assert page["total"] == 4
+            assert (page["offset"], page["limit"]) == (1, 2)
+            assert [item["id"] for item in page["items"]] == [str(c.client_id) for c in local_clients[:2]]
+            assert page["items"][0]["kind"] == "local"
+            assert page["items"][0]["bound_to"] == str(app.target_id)
+            assert page["items"][0]["queue_depth"] == 0
+            assert page["items"][0]["idle"] >= 0
+
+            status, page = await http_get("/admin/connections")
+            websocket_info = page["items"][0]
+            assert websocket_info["kind"] == "websocket"
+            assert websocket_info["id"] == str(app.target_id)
+            assert websocket_info["state"] == "OPEN"
+            assert websocket_info["write_buffer"] >= 0
+
+            status, page = await http_get("/admin/bindings")
+            assert status == 200
+            assert page["total"] == 1
+            assert page["items"][0]["client_id"] == str(client.client_id)
+            assert page["items"][0]["target_id"] == str(app.target_id)
+
+            for uuid in client.client_id, app.target_id:
+                status, detail = await http_get(f"/admin/bindings/{uuid}")
+                assert status == 200
+                assert detail["client"]["id"] == str(client.client_id)
+                assert detail["target"]["id"] == str(app.target_id)
+                assert detail["target"]["kind"] == "websocket"
+            assert (await http_get(f"/admin/bindings/{local_clients[1].client_id}"))[0] == 404
+            assert (await http_get("/admin/bindings/not-a-uuid"))[0] == 400
+
+        await asyncio.sleep(0.1)
+        assert not server.uuid_to_ws_view
+        assert app.target_id not in server.last_activity
+        assert not server.client_id_to_target_id_view
+
+
+def test_admin_requires_token():
+    # 管理接口会暴露所有连接的信息，不允许在没有令牌的情况下启用
+    for token in None, "":
+        with pytest.raises(ValueError):
+            DGLabAdmin(None, "/admin", token)  # type: ignore
+        with pytest.raises(ValueError):
+            DGLabWSServer(ADMIN_HOST, ADMIN_PORT, admin_path="/admin", admin_token=token)
@@ -0,0 +1,113 @@
+import json
+from uuid import uuid4
+
+import pytest
+
+from pydglab_ws.codec import available_json_codecs, get_json_codec, set_json_codec, StdlibJSONCodec, JSONCodec
+from pydglab_ws.enums import MessageType, RetCode, MessageDataHead, Channel, StrengthOperationType
+from pydglab_ws.models import WebSocketMessage
+from pydglab_ws.pulse import PreparedPulses
+from pydglab_ws.utils import dump_add_pulses, dump_message_prefix, dump_message, dump_strength_operation, \
+    pulse_data_max_length
+
+CODEC_NAMES = ("stdlib", "orjson", "msgspec")
+
+TEXTS = [
+    "",
+    "strength-1+2+3+4",
+    "quote \" backslash \\ slash /",
+    "".join(chr(i) for i in range(0x20)) + "\x7f",
+    "中文    😀",
+]
+
+OBJECTS = [
+    *TEXTS,
+    ["0a0a0a0a00000000"] * 3,
+    {"type": "msg", "clientId": "", "nested": [1, -2, True, False, None, {"k": "中"}]},
+    [],
+    {},
+]
+
+MESSAGES = [
+    WebSocketMessage(type=MessageType.BIND, client_id=uuid4(), message=MessageDataHead.TARGET_ID),
+    WebSocketMessage(type=MessageType.HEARTBEAT, client_id=uuid4(), target_id=uuid4(), message=RetCode.SUCCESS),
+    WebSocketMessage(type=MessageType.MSG, message=RetCode.NON_JSON_CONTENT),
+    WebSocketMessage(
+        type=MessageType.MSG,
+        client_id=uuid4(),
+        target_id=uuid4(),
+        message=dump_add_pulses(Channel.A, *[((10, 20, 30, 40), (0, 50, 100, 0))] * 5)
+    ),
+    *(WebSocketMessage(type=MessageType.MSG, client_id=uuid4(), target_id=uuid4(), message=text) for text in TEXTS)
+]
+
+
+@pytest.fixture(params=CODEC_NAMES)
+def codec(request) -> JSONCodec:
+    if request.param not in available_json_codecs():
+        pytest.skip(f"{request.param} is not installed")
+    previous = get_json_codec()
+    yield set_json_codec(request.param)
+    set_json_codec(previous)
+
+
+def test_codec_dumps_loads(codec: JSONCodec):
+    for obj in OBJECTS:
+        dumped = codec.dumps(obj)
+        assert dumped == json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        assert codec.loads(dumped) == obj
+        assert codec.loads(dumped.encode()) == obj
+    for invalid in "", "{", "[1,]", b"\xff":
+        with pytest.raises(ValueError):
+            codec.loads(invalid)
+
+
+def test_codec_messages(codec: JSONCodec):
+    for message in MESSAGES:
+        dumped = codec.dump_message(message)
+        assert dumped == message.model_dump_json(by_alias=True)
+        assert codec.load_message(dumped) == message
+        assert codec.load_message(dumped.encode()) == message
+    for invalid in "not json", "[]", '{"type":"unknown","clientId":"","targetId":"","message":""}':
+        with pytest.raises(ValueError):
+            codec.load_message(invalid)
+
+
+def test_codec_frames(codec: JSONCodec):
+    client_id, target_id = uuid4(), uuid4()
+    pulses = [((10, 10, 20, 30), (0, 5, 10, 50))] * 20
+    frames = [
+        dump_add_pulses(Channel.B, *pulses),
+        PreparedPulses(*pulses).message(Channel.B),
+        dump_message(dump_message_prefix(MessageType.MSG, client_id, target_id), "中文"),
+        dump_message(
+            dump_message_prefix(MessageType.MSG, client_id, target_id),
+            dump_strength_operation(Channel.A, StrengthOperationType.SET_TO, 10)
+        ),
+        dump_message(dump_message_prefix(MessageType.HEARTBEAT, client_id, None), RetCode.SUCCESS),
+        pulse_data_max_length(client_id, target_id),
+    ]
+    set_json_codec(StdlibJSONCodec())
+    assert frames == [
+        dump_add_pulses(Channel.B, *pulses),
+        PreparedPulses(*pulses).message(Channel.B),
+        dump_message(dump_message_prefix(MessageType.MSG, client_id, target_id), "中文"),
+        dump_message(
+            dump_message_prefix(MessageType.MSG, client_id, target_id),
+            dump_strength_operation(Channel.A, StrengthOperationType.SET_TO, 10)
+        ),
+        dump_message(dump_message_prefix(MessageType.HEARTBEAT, client_id, None), RetCode.SUCCESS),
+        pulse_data_max_length(client_id, target_id),
+    ]
+
+
+def test_set_json_codec():
+    previous = get_json_codec()
+    try:
+        assert isinstance(set_json_codec("stdlib"), StdlibJSONCodec)
+        assert get_json_codec().name == "stdlib"
+        with pytest.raises(KeyError):
+            set_json_codec("yaml")
+        assert type(set_json_codec()) is next(iter(available_json_codecs().values()))
+    finally:
+        set_json_codec(previous)
@@ -0,0 +1,141 @@
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from pydglab_ws.pulse import PulseLibrary  # noqa: E402
+from pydglab_ws.pulse.convert import (  # noqa: E402
+    FREQUENCY_LUT, ConvertCache, convert_pulse_datas, iter_convert_pulse_datas, iter_pulse_data_from_json, main,
+    ms_to_frequency, parse_frequency, pulse_data_hash, read_pulse_data_from_json, write_pulse_data_outputs
+)
+
+DATA = Path(__file__).parent / "data"
+
+
+def expected_pulses():
+    with (DATA / "customPulseData.json").open(encoding="utf-8") as f:
+        return {
+            name: [(tuple(pulse[0]), tuple(pulse[1])) for pulse in pulses]
+            for name, pulses in json.load(f).items()
+        }
+
+
+def test_frequency_lut():
+    assert len(FREQUENCY_LUT) == 84
+    assert FREQUENCY_LUT == tuple(ms_to_frequency(parse_frequency(i)) for i in range(84))
+    assert FREQUENCY_LUT[0] == 10
+    assert FREQUENCY_LUT[83] == ms_to_frequency(parse_frequency(83)) == 239
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_pulse_datas(workers):
+    pulse_datas = read_pulse_data_from_json(DATA / "appPulseData.json")
+    results, changed = convert_pulse_datas(pulse_datas, workers)
+    assert results == expected_pulses()
+    assert changed == list(results)
+
+
+def test_iter_pulse_data_from_json(tmp_path):
+    expected = read_pulse_data_from_json(DATA / "appPulseData.json")
+    for chunk_size in 1, 7, 2 ** 16:
+        assert list(iter_pulse_data_from_json(DATA / "appPulseData.json", chunk_size)) == expected
+
+    path = tmp_path / "appPulseData.json"
+    for text in " [ ] ", "[]":
+        path.write_text(text, encoding="utf-8")
+        assert list(iter_pulse_data_from_json(path, 1)) == []
+    for text in "", "{}", "[", "[{}", '[{"BG_A0": 1', "[1 2]":
+        path.write_text(text, encoding="utf-8")
+        with pytest.raises(ValueError):
+            list(iter_pulse_data_from_json(path, 1))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_convert_pulse_datas(tmp_path, workers):
+    expected = expected_pulses()
+    cache = ConvertCache(tmp_path / "cache")
+    results = list(iter_convert_pulse_datas(iter_pulse_data_from_json(DATA / "appPulseData.json"), workers, cache))
+    assert [(name, pulses) for name, pulses, _ in results] == list(expected.items())
+    assert all(converted for _, _, converted in results)
+    results = list(iter_convert_pulse_datas(iter_pulse_data_from_json(DATA / "appPulseData.json"), workers, cache))
+    assert [(name, pulses) for name, pulses, _ in results] == list(expected.items())
+    assert not any(converted for _, _, converted in results)
+
+
+def test_convert_cache(tmp_path):
+    pulse_datas = read_pulse_data_from_json(DATA / "appPulseData.json")
+    cache = ConvertCache(tmp_path / "cache")
+    results, changed = convert_pulse_datas(pulse_datas, 1, cache)
+    assert len(changed) == len(pulse_datas)
+    assert len(cache) == len(pulse_datas)
+
+    cache = ConvertCache(tmp_path / "cache")
+    pulse_datas[0].BG_L = (pulse_datas[0].BG_L + 10) % 100
+    cached_results, changed = convert_pulse_datas(pulse_datas, 1, cache)
+    assert changed == [pulse_datas[0].BG_waveName]
+    assert {name: cached_results[name] for name in list(results)[1:]} == {
+        name: results[name] for name in list(results)[1:]
+    }
+    # 修改前的波形不再使用
+    assert cache.prune() == 1
+    assert len(cache) == len(pulse_datas)
+
+    key = pulse_data_hash(pulse_datas[0])
+    (tmp_path / "cache" / f"{key}.json").write_text("[", encoding="utf-8")
+    assert ConvertCache(tmp_path / "cache").get(key) is None
+
+
+def test_write_pulse_data_outputs(tmp_path):
+    results = expected_pulses()
+
+    def items(changed):
+        return ((name, pulses, name in changed) for name, pulses in results.items())
+
+    assert write_pulse_data_outputs(items(results), tmp_path) == len(results) + 2
+    assert (tmp_path / "customPulseData.json").read_text(encoding="utf-8") == \
+           (DATA / "customPulseData.json").read_text(encoding="utf-8")
+    assert write_pulse_data_outputs(items([]), tmp_path) == 0
+    name = next(iter(results))
+    # 转换结果与已有文件相同时，只重写该波形的文件
+    assert write_pulse_data_outputs(items([name]), tmp_path) == 1
+    (tmp_path / f"{name}.json").unlink()
+    assert write_pulse_data_outputs(items([]), tmp_path) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+    with PulseLibrary(tmp_path / "customPulseData.dgpl") as library:
+        assert {name: library.pulses(name) for name in library} == results
+
+    # 波形顺序改变时，即使没有波形发生变化也会重写汇总文件
+    results = dict(reversed(results.items()))
+    assert write_pulse_data_outputs(items([]), tmp_path) == 2
+    assert list(json.loads((tmp_path / "customPulseData.json").read_text(encoding="utf-8"))) == list(results)
+    with PulseLibrary(tmp_path / "customPulseData.dgpl") as library:
+        assert list(library) == list(results)
+
+
+def test_convert_main(tmp_path, capsys):
+    main([str(DATA / "appPulseData.json"), "-o", str(tmp_path), "-j", "1"])
+    assert "12 converted" in capsys.readouterr().out
+    assert (tmp_path / "customPulseData.json").read_text(encoding="utf-8") == \
+           (DATA / "customPulseData.json").read_text(encoding="utf-8")
+    main([str(DATA / "appPulseData.json"), "-o", str(tmp_path), "-j", "1"])
+    assert "0 converted, 0 files written" in capsys.readouterr().out
+    main([str(DATA / "appPulseData.json"), "-o", str(tmp_path), "-j", "1", "--no-cache"])
+    assert "12 converted, 12 files written" in capsys.readouterr().out
+
+
+def test_convert_main_removed_waveform(tmp_path, capsys):
+    main([str(DATA / "appPulseData.json"), "-o", str(tmp_path), "-j", "1"])
+    capsys.readouterr()
+    # 从导出的波形中删除最后一个，其余波形都来自缓存
+    records = json.loads((DATA / "appPulseData.json").read_text(encoding="utf-8"))
+    removed = records.pop()["BG_waveName"]
+    export_path = tmp_path / "appPulseData.json"
+    export_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    main([str(export_path), "-o", str(tmp_path), "-j", "1"])
+    assert "11 waveforms, 0 converted, 2 files written" in capsys.readouterr().out
+    aggregate = json.loads((tmp_path / "customPulseData.json").read_text(encoding="utf-8"))
+    assert len(aggregate) == 11 and removed not in aggregate
+    with PulseLibrary(tmp_path / "customPulseData.dgpl") as library:
+        assert list(library) == list(aggregate)
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from pydglab_ws.client import LatencyEstimator, ClientLatency
+
+
+def test_latency_estimator():
+    estimator = LatencyEstimator(alpha=0.5, window=4)
+    assert estimator.ewma is None
+    assert estimator.percentile(50) is None
+    for sample in 0.1, 0.2, 0.3, 0.4, 0.5:
+        estimator.add(sample)
+    assert estimator.count == 5
+    assert estimator.last == 0.5
+    assert estimator.ewma == pytest.approx(0.40625)
+    # 只保留最近的 4 个样本
+    assert estimator.percentile(0) == 0.2
+    assert estimator.percentile(50) == 0.3
+    assert estimator.percentile(95) == 0.5
+
+
+def test_client_latency():
+    latency = ClientLatency()
+    assert latency.rtt is None
+    assert latency.one_way is None
+    latency.ping.add(0.02)
+    assert latency.rtt == 0.02
+    assert latency.rtt_percentile(95) == 0.02
+    latency.strength.add(0.1)
+    assert latency.rtt == 0.1
+    assert latency.one_way == 0.05
+
+
+@pytest.mark.asyncio
+async def test_latency_estimator_samples():
+    estimator = LatencyEstimator()
+    generator = estimator.samples()
+    task = asyncio.create_task(generator.__anext__())
+    await asyncio.sleep(0)
+    estimator.add(0.3)
+    assert await task == 0.3
+    await generator.aclose()
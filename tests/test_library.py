@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from pydglab_ws.enums import Channel
+from pydglab_ws.exceptions import InvalidPulseOperation, InvalidPulseLibrary
+from pydglab_ws.pulse import PulseLibrary, write_pulse_library, convert_pulse_data_json
+from pydglab_ws.utils import dump_add_pulses
+
+WAVEFORMS = {
+    "呼吸": [((10, 10, 10, 10), (0, 5, 10, 20)), ((10, 10, 10, 10), (100, 100, 100, 100))],
+    "潮汐": [((10, 20, 30, 240), (i, i, i, i)) for i in range(50)],
+    "空": [],
+    "休息": [((0, 0, 0, 0), (0, 0, 0, 0))] * 3
+}
+
+
+def test_pulse_library(tmp_path):
+    path = tmp_path / "pulses.dgpl"
+    write_pulse_library(path, WAVEFORMS)
+    with PulseLibrary(path) as library:
+        assert len(library) == len(WAVEFORMS)
+        assert list(library) == list(WAVEFORMS)
+        assert "呼吸" in library and "不存在" not in library
+        for name, pulses in WAVEFORMS.items():
+            assert library.pulses(name) == pulses
+            assert len(library.prepared(name)) == len(pulses)
+        view = library["潮汐"]
+        assert view.readonly
+        assert view.shape == (50, 8)
+        assert view.tolist()[1] == [10, 20, 30, 240, 1, 1, 1, 1]
+        view.release()
+        assert library.prepared("潮汐").message(Channel.B) == dump_add_pulses(Channel.B, *WAVEFORMS["潮汐"])
+        with pytest.raises(KeyError):
+            library.prepared("不存在")
+
+
+def test_pulse_library_array(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "pulses.dgpl"
+    write_pulse_library(path, WAVEFORMS)
+    library = PulseLibrary(path)
+    pulse_array = library.array("潮汐")
+    assert pulse_array.to_pulses() == WAVEFORMS["潮汐"]
+    assert not pulse_array.data.flags.writeable
+    # 存在共享内存的数组时无法关闭
+    with pytest.raises(BufferError):
+        library.close()
+    del pulse_array
+    library.close()
+
+
+def test_pulse_library_invalid(tmp_path):
+    with pytest.raises(InvalidPulseOperation):
+        write_pulse_library(tmp_path / "invalid.dgpl", {"invalid": [((10, 10, 10), (0, 0, 0, 0))]})
+    with pytest.raises(InvalidPulseOperation):
+        write_pulse_library(tmp_path / "invalid.dgpl", {"invalid": [((10, 10, 10, 256), (0, 0, 0, 0))]})
+    for data in b"", b"DGPL", b"XXXX" + bytes(20), b"DGPL\x01\x00\x00\x00\x01" + bytes(7) + b"\x18" + bytes(7):
+        path = tmp_path / "invalid.dgpl"
+        path.write_bytes(data)
+        with pytest.raises(InvalidPulseLibrary):
+            PulseLibrary(path)
+
+
+def test_convert_pulse_data_json(tmp_path):
+    json_path = tmp_path / "customPulseData.json"
+    json_path.write_text(json.dumps(WAVEFORMS, ensure_ascii=False), encoding="utf-8")
+    assert convert_pulse_data_json(json_path, tmp_path / "pulses.dgpl") == len(WAVEFORMS)
+    with PulseLibrary(tmp_path / "pulses.dgpl") as library:
+        assert {name: library.pulses(name) for name in library} == WAVEFORMS
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import List
+from uuid import uuid4
+
+import pytest
+from websockets.client import connect
+
+from pydglab_ws.log import EventPolicy, EventLogger, JSONFormatter, QueueLogging, set_event_policy, \
+    get_event_policy, LOGGER_NAME
+from pydglab_ws.server import DGLabWSServer
+
+LOG_HOST = "127.0.0.1"
+LOG_PORT = 5680
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+@pytest.fixture(name="handler")
+def handler_fixture():
+    logger = logging.getLogger("pydglab_ws")
+    handler = ListHandler()
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    yield handler
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def test_event_policy(handler: ListHandler):
+    log = EventLogger("pydglab_ws.test")
+    set_event_policy("test.sampled", EventPolicy(sample=0.25))
+    set_event_policy("test.capped", EventPolicy(max_per_second=5))
+    try:
+        for i in range(100):
+            log.debug("test.sampled", "sampled %d", i, index=i)
+        sampled = [r for r in handler.records if r.event == "test.sampled"]
+        assert len(sampled) == 25
+        assert [r.fields["index"] for r in sampled[:3]] == [3, 7, 11]
+        assert sampled[0].dropped == 3
+        assert sampled[1].getMessage() == "sampled 7"
+
+        for i in range(20):
+            log.info("test.capped", "capped")
+        assert len([r for r in handler.records if r.event == "test.capped"]) == 5
+
+        # 未启用的级别不计入采样
+        logging.getLogger("pydglab_ws").setLevel(logging.INFO)
+        set_event_policy("test.sampled", EventPolicy(sample=0.5))
+        log.debug("test.sampled", "disabled")
+        logging.getLogger("pydglab_ws").setLevel(logging.DEBUG)
+        log.debug("test.sampled", "first")
+        log.debug("test.sampled", "second")
+        assert handler.records[-1].getMessage() == "second"
+        assert handler.records[-1].dropped == 1
+        assert handler.records[-1].funcName == "test_event_policy"
+    finally:
+        set_event_policy("test.sampled", None)
+        set_event_policy("test.capped", None)
+    assert get_event_policy("test.sampled") == EventPolicy()
+
+
+def test_default_config():
+    # 未配置日志时不经由 logging.lastResort 输出
+    assert any(isinstance(h, logging.NullHandler) for h in logging.getLogger(LOGGER_NAME).handlers)
+    for event in "client.ret_code", "client.break", "client.bind_failed", "server.bind_failed", "server.non_json":
+        assert get_event_policy(event).max_per_second is not None
+
+
+def test_json_formatter(handler: ListHandler):
+    uuid = uuid4()
+    EventLogger("pydglab_ws.test").warning("test.json", "Hello %s", "世界", client_id=uuid, size=3)
+    data = json.loads(JSONFormatter().format(handler.records[-1]))
+    assert data["level"] == "WARNING"
+    assert data["logger"] == "pydglab_ws.test"
+    assert data["event"] == "test.json"
+    assert data["message"] == "Hello 世界"
+    assert data["client_id"] == str(uuid)
+    assert data["size"] == 3
+    assert "dropped" not in data
+
+
+def test_queue_logging(handler: ListHandler):
+    released = threading.Event()
+    received: List[logging.LogRecord] = []
+
+    class BlockingHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord):
+            released.wait(5)
+            received.append(record)
+
+    log = EventLogger("pydglab_ws.test")
+    with QueueLogging(BlockingHandler(), max_size=2, logger_name="pydglab_ws.test") as queue_logging:
+        for i in range(10):
+            log.info("test.queue", "queued %d", i)
+        # 日志不会传递到上级记录器
+        assert not [r for r in handler.records if r.event == "test.queue"]
+        released.set()
+    assert queue_logging.dropped >= 10 - 3
+    assert len(received) == 10 - queue_logging.dropped
+    assert received[0].getMessage() == "queued 0"
+    # 停止后恢复原有的传递
+    log.info("test.queue", "direct")
+    assert handler.records[-1].getMessage() == "direct"
+
+
+@pytest.mark.asyncio
+async def test_server_events(handler: ListHandler):
+    async with DGLabWSServer(LOG_HOST, LOG_PORT):
+        async with connect(f"ws://{LOG_HOST}:{LOG_PORT}") as websocket:
+            await websocket.recv()
+            await websocket.send("not json")
+            await websocket.recv()
+        await asyncio.sleep(0.1)
+    events = [r.event for r in handler.records if r.name == "pydglab_ws.server"]
+    assert events == ["server.connect", "server.non_json", "server.disconnect"]
+    assert handler.records[-1].fields["code"] == 1000
@@ -1,17 +1,26 @@
 import asyncio
+import functools
+import itertools
+import json
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Tuple, List, Callable, Coroutine, Literal
+from typing import Tuple, List, Callable, Coroutine, Literal, Any
+from uuid import uuid4
 
 import pytest
 import pytest_asyncio
 from websockets import WebSocketClientProtocol
 from websockets.client import connect
+from websockets.frames import OP_TEXT
 
-from pydglab_ws.client import DGLabWSClient, DGLabLocalClient, DGLabClient, DGLabWSConnect
-from pydglab_ws.enums import FeedbackButton, Channel, MessageType, StrengthOperationType, RetCode
-from pydglab_ws.models import StrengthData
+from pydglab_ws.client import DGLabWSClient, DGLabLocalClient, DGLabClient, DGLabWSConnect, DGLabWSConnectPool, \
+    PoolHealth, ReconnectPolicy, DGLabSyncClient
+from pydglab_ws.enums import FeedbackButton, Channel, MessageType, StrengthOperationType, RetCode, ConnectionState
+from pydglab_ws.exceptions import InvalidPulseOperation, StrengthUnknown
+from pydglab_ws.models import StrengthData, StrengthRecord
 from pydglab_ws.server import DGLabWSServer
+from pydglab_ws.utils import dump_clear_pulses, dump_strength_operation, dump_add_pulses, dump_message_prefix, \
+    dump_message
 from tests.app_simulator import DGLabAppSimulator
 
 WEBSOCKET_HOST = "127.0.0.1"
@@ -667,3 +676,458 @@ async def test_dg_lab_ws_server_remove_local_client(dg_lab_ws_server: DGLabWSSer
         assert await dg_lab_ws_server.remove_local_client(app.target_id) is False
         assert await dg_lab_ws_server.remove_local_client(app.client_id) is True
         assert await app.recv_disconnect() == RetCode.CLIENT_DISCONNECTED
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_client_dispatcher(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    async with DGLabWSConnect(WEBSOCKET_URI) as ws_client:
+        local_client = dg_lab_ws_server.new_local_client()
+        for client in local_client, ws_client:
+            dispatcher = client.start_dispatcher()
+            assert client.start_dispatcher() is dispatcher
+            async with connect(WEBSOCKET_URI) as websocket:
+                app = DGLabAppSimulator(websocket)
+                await app.register()
+                await app.bind(client.client_id)
+                assert await client.bind() == RetCode.SUCCESS
+                assert client.target_id == app.target_id
+
+                # 并发的消费者各自取得目标类型的数据
+                strength_data = StrengthData(a=10, b=20, a_limit=100, b_limit=100)
+                strength_task = asyncio.create_task(client.wait_for_strength(timeout=5))
+                feedback_task = asyncio.create_task(client.wait_for_feedback(FeedbackButton.A2, timeout=5))
+                await app.send_feedback(FeedbackButton.A1)
+                await app.send_feedback(FeedbackButton.A2)
+                await app.send_strength(strength_data)
+                assert await strength_task == strength_data
+                assert await feedback_task == FeedbackButton.A2
+                # 不满足条件的数据仍留在队列中
+                assert await client.recv_data() == FeedbackButton.A1
+
+                # 取消等待不会丢失消息
+                cancelled_task = asyncio.create_task(client.wait_for_strength())
+                await asyncio.sleep(0)
+                cancelled_task.cancel()
+                await app.send_strength(strength_data)
+                assert await client.wait_for_strength(timeout=5) == strength_data
+
+                with pytest.raises(asyncio.TimeoutError):
+                    await client.wait_for_feedback(timeout=0.1)
+
+            assert await client.wait_for_disconnect(timeout=5) == RetCode.CLIENT_DISCONNECTED
+            await client.stop_dispatcher()
+            assert client.dispatcher is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_client_stream_pulses(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    client = dg_lab_ws_server.new_local_client()
+    async with connect(WEBSOCKET_URI) as websocket:
+        app = DGLabAppSimulator(websocket)
+        await app.register()
+        await app.bind(client.client_id)
+        await client.bind()
+
+        async def pulse_source():
+            for i in range(12):
+                yield (10, 10, 10, 10), (i, i, i, i)
+
+        sent = await client.stream_pulses(Channel.A, pulse_source(), lead_time=0.3, interval=0.1)
+        assert sent == 12
+        assert 0 < client.pulse_queue.length(Channel.A) <= 5
+
+        received = []
+        while len(received) < sent:
+            message = await app.recv_msg_type_data()
+            pulses = json.loads(message.message.split(":", 1)[1])
+            # 首次下发量为 (lead_time + interval) / 100ms
+            assert len(pulses) <= 4
+            received.extend(pulses)
+        assert received == [f"0a0a0a0a{i:02x}{i:02x}{i:02x}{i:02x}" for i in range(12)]
+
+        stream_task = asyncio.create_task(
+            client.stream_pulses(Channel.B, itertools.repeat(((10, 10, 10, 10), (0, 0, 0, 0))), lead_time=1)
+        )
+        await asyncio.sleep(0.05)
+        assert 14 <= client.pulse_queue.length(Channel.B) <= 15
+        await client.clear_pulses(Channel.B)
+        assert client.pulse_queue.length(Channel.B) == 0
+        await asyncio.sleep(0.05)
+        # 清空后立即重新补充
+        assert 14 <= client.pulse_queue.length(Channel.B) <= 15
+        stream_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stream_task
+
+
+@pytest.mark.asyncio
+async def test_dg_lab_client_add_pulses_chunked(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    client = dg_lab_ws_server.new_local_client()
+    pulses = [((10, 10, 10, 10), (i % 101, 0, 0, 0)) for i in range(200)]
+    assert await client.add_pulses_chunked(Channel.A, *pulses) == 0
+    async with connect(WEBSOCKET_URI) as websocket:
+        app = DGLabAppSimulator(websocket)
+        await app.register()
+        await app.bind(client.client_id)
+        await client.bind()
+
+        assert await client.add_pulses_chunked(Channel.A, *pulses) == 3
+        received = []
+        for _ in range(3):
+            message = await app.recv_msg_type_data()
+            received.extend(json.loads(message.message.split(":", 1)[1]))
+        assert len(received) == 200
+        assert client.pulse_queue.length(Channel.A) == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_client_batch(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    async with DGLabWSConnect(WEBSOCKET_URI) as ws_client:
+        for client in dg_lab_ws_server.new_local_client(), ws_client:
+            pulses = [((10, 10, 10, 10), (0, 10, 20, 30))] * 10
+            async with client.batch() as batch:
+                batch.clear_pulses(Channel.A)
+                batch.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+            assert batch.results == [False, False]
+
+            async with connect(WEBSOCKET_URI) as websocket:
+                app = DGLabAppSimulator(websocket)
+                await app.register()
+                await app.bind(client.client_id)
+                await client.bind()
+
+                async with client.batch() as batch:
+                    batch.clear_pulses(Channel.A)
+                    batch.clear_pulses(Channel.B)
+                    assert batch.set_strength(Channel.A, StrengthOperationType.SET_TO, 10) == 2
+                    batch.set_strength(Channel.B, StrengthOperationType.SET_TO, 20)
+                    batch.add_pulses(Channel.A, *pulses)
+                    batch.add_pulses(Channel.B, *pulses)
+                    assert len(batch) == 6
+                assert batch.results == [True] * 6
+                assert len(batch) == 0
+                assert [(await app.recv_msg_type_data()).message for _ in range(6)] == [
+                    dump_clear_pulses(Channel.A),
+                    dump_clear_pulses(Channel.B),
+                    dump_strength_operation(Channel.A, StrengthOperationType.SET_TO, 10),
+                    dump_strength_operation(Channel.B, StrengthOperationType.SET_TO, 20),
+                    dump_add_pulses(Channel.A, *pulses),
+                    dump_add_pulses(Channel.B, *pulses),
+                ]
+                assert client.pulse_queue.length(Channel.A) == 10
+                assert client.pulse_queue.length(Channel.B) == 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_client_ramp_strength(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    client = dg_lab_ws_server.new_local_client()
+    assert not await client.ramp_strength(Channel.A, 10, 0.3)
+    async with connect(WEBSOCKET_URI) as websocket:
+        app = DGLabAppSimulator(websocket)
+        await app.register()
+        await app.bind(client.client_id)
+        await client.bind()
+
+        async def recv_values(target: int) -> List[int]:
+            values = []
+            while not values or values[-1] != target:
+                message = await app.recv_msg_type_data()
+                values.append(int(message.message.rsplit("+", 1)[1]))
+            return values
+
+        # 强度未知时不猜测起始强度
+        with pytest.raises(StrengthUnknown):
+            await client.ramp_strength(Channel.A, 10, 0.3)
+        assert not client.ramp.running
+        await app.send_strength(StrengthData(a=0, b=0, a_limit=200, b_limit=200))
+        await client.wait_for_strength(timeout=5)
+
+        client.ramp.max_rate = 20
+        assert await client.ramp_strength(Channel.A, 10, 0.3)
+        values = await recv_values(10)
+        # 只发送有变化的值，且发送频率受限
+        assert values == sorted(set(values))
+        assert len(values) <= 0.3 * 20 + 2
+
+        # 新的渐变取代未完成的渐变
+        superseded = client.ramp.start(Channel.A, 100, 10)
+        assert await client.ramp_strength(Channel.A, 0, 0)
+        assert not await superseded
+        assert (await recv_values(0))[-1] == 0
+
+        # 不超过 App 返回的强度上限
+        await app.send_strength(StrengthData(a=0, b=0, a_limit=5, b_limit=200))
+        await client.wait_for_strength(timeout=5)
+        assert await client.ramp_strength(Channel.A, 20, 0.2)
+        assert (await recv_values(5))[-1] == 5
+        assert not client.ramp.running
+
+        # 移除本地终端时停止渐变
+        assert await client.ramp_strength(Channel.B, 100, 10, wait=False)
+        assert client.ramp.running
+        assert await dg_lab_ws_server.remove_local_client(client.client_id)
+        assert not client.ramp.running
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_sync_client(dg_lab_ws_server: DGLabWSServer):
+    # 同步接口的阻塞调用需在其他线程中执行，避免阻塞运行服务端的事件循环
+    loop = asyncio.get_running_loop()
+
+    def in_thread(func, *args, **kwargs):
+        # asyncio.to_thread 在 Python 3.9 才添加
+        return loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    sync_client = DGLabSyncClient.ws(WEBSOCKET_URI)
+    await in_thread(sync_client.start, 5)
+    try:
+        assert sync_client.running
+        assert not await in_thread(sync_client.bind, 0.1)
+        assert not await in_thread(
+            sync_client.set_strength(Channel.A, StrengthOperationType.SET_TO, 10).result, 5
+        )
+
+        async with connect(WEBSOCKET_URI) as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            await app.bind(sync_client.client_id)
+            assert await in_thread(sync_client.bind, 5)
+
+            futures = [sync_client.set_strength(Channel.A, StrengthOperationType.SET_TO, i) for i in range(1, 11)]
+            futures.append(sync_client.clear_pulses(Channel.B))
+            invalid = sync_client.add_pulses(Channel.A, ((300, 10, 10, 10), (0, 0, 0, 0)))
+            assert await in_thread(lambda: [future.result(5) for future in futures]) == [True] * 11
+            with pytest.raises(InvalidPulseOperation):
+                await in_thread(invalid.result, 5)
+            assert [(await app.recv_msg_type_data()).message for _ in range(11)] == [
+                dump_strength_operation(Channel.A, StrengthOperationType.SET_TO, i) for i in range(1, 11)
+            ] + [dump_clear_pulses(Channel.B)]
+
+            await app.send_feedback(FeedbackButton.A1)
+            assert await in_thread(sync_client.feedback_queue.get, timeout=5) == FeedbackButton.A1
+            strength = StrengthData(a=10, b=0, a_limit=100, b_limit=100)
+            await app.send_strength(strength)
+            assert await in_thread(sync_client.strength_queue.get, timeout=5) == strength
+    finally:
+        await in_thread(sync_client.close, 5)
+    assert not sync_client.running
+    with pytest.raises(RuntimeError):
+        sync_client.clear_pulses(Channel.A)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_client_latency(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    async with DGLabWSConnect(WEBSOCKET_URI) as ws_client:
+        local_client = dg_lab_ws_server.new_local_client()
+        assert await local_client.probe_latency() is None
+        assert isinstance(await ws_client.probe_latency(timeout=5), float)
+        assert ws_client.latency.ping.count == 1
+
+        async with connect(WEBSOCKET_URI) as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            await app.bind(ws_client.client_id)
+            await ws_client.bind()
+
+            await ws_client.set_strength(Channel.A, StrengthOperationType.SET_TO, 10)
+            await app.recv_msg_type_data()
+            await app.send_strength(StrengthData(a=10, b=0, a_limit=100, b_limit=100))
+            await ws_client.wait_for_strength(timeout=5)
+            assert ws_client.latency.strength.count == 1
+            assert ws_client.latency.rtt == ws_client.latency.strength.last
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_ws_connect_pool(dg_lab_ws_server: DGLabWSServer):
+    async with DGLabWSConnectPool(WEBSOCKET_URI, max_concurrency=2, connect_rate=100) as pool:
+        clients = await pool.open(5)
+        assert len(pool.clients) == 5
+        assert all(client.client_id in dg_lab_ws_server.uuid_to_ws for client in clients)
+        assert pool.health == PoolHealth(registered=5)
+
+        async with connect(WEBSOCKET_URI) as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            await app.bind(clients[0].client_id)
+            await clients[0].bind()
+            assert pool.state(clients[0]) == ConnectionState.BOUND
+            assert pool.health.bound == 1
+
+        await clients[1].websocket.close()
+        assert pool.state(clients[1]) == ConnectionState.CLOSED
+        assert await pool.close(clients[1]) is True
+        assert await pool.close(clients[1]) is False
+        assert len(pool.clients) == 4
+    assert not pool.clients
+    assert all(client.websocket.closed for client in clients)
+
+
+@pytest.mark.asyncio
+@pytest.mark.timeout(10)
+async def test_dg_lab_ws_client_reconnect(dg_lab_ws_server: DGLabWSServer):
+    # 创建新的终端和 App，防止干扰到其他测试
+    policy = ReconnectPolicy(initial_delay=0.05, heartbeat_timeout=HEARTBEAT_INTERVAL * 1.5)
+    async with DGLabWSConnect(WEBSOCKET_URI, reconnect_policy=policy) as client:
+        reconnected = []
+        client.add_reconnect_callback(lambda x: reconnected.append(x.client_id))
+        assert client.reconnect_enabled is True
+
+        async with connect(WEBSOCKET_URI) as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            await app.bind(client.client_id)
+            await client.bind()
+
+            received = []
+
+            async def consume():
+                async for data in client.data_generator(FeedbackButton):
+                    received.append(data)
+                    if len(received) == 2:
+                        break
+
+            consumer = asyncio.create_task(consume())
+            await app.send_feedback(FeedbackButton.A1)
+            while not received:
+                await asyncio.sleep(0.01)
+
+            # 连接断开后自动重连，消费者不中断
+            old_client_id = client.client_id
+            await client.websocket.close()
+            assert await app.recv_disconnect() == RetCode.CLIENT_DISCONNECTED
+            while not reconnected:
+                await asyncio.sleep(0.01)
+            assert reconnected == [client.client_id]
+            assert client.client_id != old_client_id
+            assert client.client_id in dg_lab_ws_server.uuid_to_ws
+
+            # App 重新扫码绑定
+            await app.bind(client.client_id)
+            while client.not_bind:
+                await asyncio.sleep(0.01)
+            await app.send_feedback(FeedbackButton.B1)
+            await consumer
+            assert received == [FeedbackButton.A1, FeedbackButton.B1]
+
+        # 连接假死时，超时未收到心跳即判定失效并重连
+        assert client.remove_reconnect_callback(lambda x: None) is False
+        client.websocket.transport.pause_reading()
+        recv_task = asyncio.create_task(client.recv_data())
+        while len(reconnected) < 2:
+            await asyncio.sleep(0.05)
+        recv_task.cancel()
+        stats = client.reconnect_stats
+        assert stats.disconnects == stats.reconnects == 2
+        assert stats.dead_peers == 1
+        assert 0 < stats.last_recovery_time < policy.max_delay
+
+
+class _FrameWebSocket:
+    """按顺序返回预先准备的消息"""
+
+    def __init__(self, frames: List[str]):
+        self.frames = list(frames)
+
+    async def recv(self) -> str:
+        return self.frames.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_dg_lab_ws_client_batch_send():
+    class FrameWriterWebSocket:
+        def __init__(self):
+            self.events: List[Any] = []
+
+        async def ensure_open(self):
+            self.events.append("ensure_open")
+
+        def write_frame_sync(self, fin: bool, opcode: int, data: bytes):
+            self.events.append((fin, opcode, data.decode()))
+
+        async def drain(self):
+            self.events.append("drain")
+
+    websocket = FrameWriterWebSocket()
+    client = DGLabWSClient(websocket)  # type: ignore
+    client._client_id, client._target_id = uuid4(), uuid4()
+    async with client.batch() as batch:
+        batch.clear_pulses(Channel.A)
+        batch.set_strength(Channel.B, StrengthOperationType.SET_TO, 20)
+    # 所有帧写入后只等待一次缓冲区排空
+    prefix = dump_message_prefix(MessageType.MSG, client.client_id, client.target_id)
+    assert websocket.events == [
+        "ensure_open",
+        (True, OP_TEXT, dump_message(prefix, dump_clear_pulses(Channel.A))),
+        (True, OP_TEXT, dump_message(prefix, dump_strength_operation(Channel.B, StrengthOperationType.SET_TO, 20))),
+        "drain"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dg_lab_ws_client_recv_fast_path():
+    client_id, target_id, other_id = uuid4(), uuid4(), uuid4()
+    msg_prefix = dump_message_prefix(MessageType.MSG, client_id, target_id)
+    frames = [
+        dump_message(dump_message_prefix(MessageType.HEARTBEAT, client_id, None), RetCode.SUCCESS),
+        dump_message(msg_prefix, "feedback-1"),
+        dump_message(msg_prefix, "strength-1+2+3+4"),
+        dump_message(dump_message_prefix(MessageType.MSG, other_id, target_id), "strength-9+9+9+9"),
+        # 格式不同的消息完整解析
+        json.dumps({"message": "feedback-2", "targetId": str(target_id), "type": "msg", "clientId": str(client_id)}),
+        dump_message(msg_prefix, RetCode.NON_JSON_CONTENT),
+        dump_message(dump_message_prefix(MessageType.BREAK, client_id, target_id), RetCode.CLIENT_DISCONNECTED),
+    ]
+
+    async def receive_all(fast: bool, *targets: type) -> list:
+        client = DGLabWSClient(_FrameWebSocket(frames))
+        client._client_id, client._target_id = client_id, target_id
+        recv_data = client._recv_data if fast else functools.partial(DGLabClient._recv_data, client)
+        received = []
+        with pytest.raises(IndexError):
+            while True:
+                received.append(await recv_data(targets))
+        # 不需要的强度数据同样会更新通道状态
+        assert client.channel_state.get(Channel.B).limit == 4
+        return received
+
+    assert await receive_all(True) == await receive_all(False) == [
+        RetCode.SUCCESS,
+        FeedbackButton(1),
+        StrengthData(a=1, b=2, a_limit=3, b_limit=4),
+        FeedbackButton(2),
+        RetCode.NON_JSON_CONTENT,
+        RetCode.CLIENT_DISCONNECTED
+    ]
+    for targets in (FeedbackButton,), (RetCode,), (StrengthRecord, FeedbackButton):
+        assert await receive_all(True, *targets) == await receive_all(False, *targets)
+
+
+@pytest.mark.asyncio
+async def test_dg_lab_client_strength_records():
+    client_id, target_id = uuid4(), uuid4()
+    frames = [dump_message(dump_message_prefix(MessageType.MSG, client_id, target_id), "strength-1+2+3+4")] * 4
+    client = DGLabWSClient(_FrameWebSocket(frames))
+    client._client_id, client._target_id = client_id, target_id
+    assert not client.strength_records
+    for recv_data in client._recv_data, functools.partial(DGLabClient._recv_data, client):
+        data = await recv_data(())
+        assert type(data) is StrengthData and data == StrengthData(a=1, b=2, a_limit=3, b_limit=4)
+
+    # 开启后返回缓存的 StrengthRecord，目标类型仍可使用 StrengthData
+    client.strength_records = True
+    for recv_data in client._recv_data, functools.partial(DGLabClient._recv_data, client):
+        data = await recv_data((StrengthData,))
+        assert type(data) is StrengthRecord and data == StrengthRecord(1, 2, 3, 4)
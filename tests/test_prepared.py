@@ -0,0 +1,74 @@
+import pytest
+
+from pydglab_ws.enums import Channel
+from pydglab_ws.exceptions import InvalidPulseOperation, PulseDataTooLong
+from pydglab_ws.pulse import PreparedPulses, PulseCache
+from pydglab_ws.utils import dump_pulse_operations, dump_add_pulses, dump_add_pulses_chunks, _pulses_length
+
+PULSES = [((10, 10, 20, 30), (0, 5, 10, i)) for i in range(50)]
+
+
+def test_prepared_pulses():
+    prepared = PreparedPulses(*PULSES)
+    assert len(prepared) == _pulses_length((prepared,)) == 50
+    assert list(prepared.hex) == dump_pulse_operations(*PULSES) == dump_pulse_operations(prepared)
+    for channel in Channel:
+        assert prepared.message(channel) == dump_add_pulses(channel, *PULSES)
+        assert dump_add_pulses(channel, prepared) == dump_add_pulses(channel, *PULSES)
+        for max_length in 7, 50, 86:
+            assert dump_add_pulses_chunks(channel, prepared, max_length=max_length) == \
+                   dump_add_pulses_chunks(channel, *PULSES, max_length=max_length)
+    with pytest.raises(PulseDataTooLong):
+        dump_add_pulses(Channel.A, prepared, max_length=49)
+    assert dump_add_pulses_chunks(Channel.A, PreparedPulses()) == []
+    with pytest.raises(InvalidPulseOperation):
+        PreparedPulses(((10, 10, 10, 10), (0, 0, 0, 256)))
+
+
+def test_pulse_cache():
+    cache = PulseCache(max_size=2)
+    first = cache.prepare(*PULSES[:10])
+    assert cache.prepare(*PULSES[:10]) is first
+    second = cache.prepare(*PULSES[10:20])
+    # 访问 first 后，second 为最久未使用
+    cache.prepare(*PULSES[:10])
+    cache.prepare(*PULSES[20:30])
+    assert len(cache) == 2
+    assert cache.pulses == 20
+    assert cache.prepare(*PULSES[:10]) is first
+    assert cache.prepare(*PULSES[10:20]) is not second
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 4
+    assert cache.stats.evictions == 2
+    assert cache.stats.hit_rate == pytest.approx(3 / 7)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.pulses == 0
+
+
+def test_pulse_cache_key():
+    cache = PulseCache()
+    # 列表与元组内容相同时使用同一个缓存
+    prepared = cache.prepare([[10, 10, 20, 30], [0, 5, 10, 0]], [[10, 10, 20, 30], [0, 5, 10, 1]])
+    assert cache.prepare(*PULSES[:2]) is prepared
+    assert list(prepared.hex) == dump_pulse_operations(*PULSES[:2])
+    assert len(cache) == 1
+    for pulse in ((10, 10, 10, 10), (0, 0, 0, 256)), ((10.5, 10, 10, 10), (0, 0, 0, 0)), \
+            ((10, 10, 10), (0, 0, 0, 0, 0)), ((10, 10, 10, 10),):
+        with pytest.raises(InvalidPulseOperation):
+            cache.prepare(pulse)
+    assert len(cache) == 1
+
+
+def test_pulse_cache_max_pulses():
+    cache = PulseCache(max_pulses=25)
+    cache.prepare(*PULSES[:10])
+    cache.prepare(*PULSES[10:20])
+    cache.prepare(*PULSES[20:30])
+    assert len(cache) == 2
+    assert cache.pulses == 20
+    # 单个波形超出上限时仍会保留
+    cache.prepare(*PULSES)
+    assert len(cache) == 1
+    assert cache.pulses == 50
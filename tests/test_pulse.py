@@ -0,0 +1,79 @@
+import pytest
+
+from pydglab_ws.enums import Channel
+from pydglab_ws.exceptions import InvalidPulseOperation, PulseDataTooLong
+from pydglab_ws.utils import dump_pulse_operation, dump_add_pulses, dump_add_pulses_chunks
+
+np = pytest.importorskip("numpy")
+
+from pydglab_ws.pulse import PulseArray, PulseCache  # noqa: E402
+
+
+def test_pulse_array():
+    pulses = [((10, 20, 30, 240), (0, 50, 99, 100))] + [((100, 100, 100, 100), (i, i, i, i)) for i in range(10)]
+    pulse_array = PulseArray(pulses)
+    assert len(pulse_array) == 11
+    assert pulse_array.data.shape == (11, 8)
+    assert pulse_array.data.dtype == np.uint8
+    assert list(pulse_array) == pulses
+    assert pulse_array[0] == pulses[0]
+    assert pulse_array[1:3].to_pulses() == pulses[1:3]
+    assert pulse_array.to_hex() == [dump_pulse_operation(pulse) for pulse in pulses]
+    assert PulseArray(np.array(pulses)) == pulse_array
+    assert PulseArray(pulse_array.data.reshape(-1, 2, 4)) == pulse_array
+    with pytest.raises(ValueError):
+        pulse_array.data[0, 0] = 1
+
+
+@pytest.mark.parametrize(
+    "pulse,clamped",
+    [
+        (((9, 10, 10, 10), (0, 0, 0, 0)), ((10, 10, 10, 10), (0, 0, 0, 0))),
+        (((10, 10, 10, 241), (0, 0, 0, 0)), ((10, 10, 10, 240), (0, 0, 0, 0))),
+        (((10, 10, 10, 10), (0, 101, 0, 0)), ((10, 10, 10, 10), (0, 100, 0, 0))),
+        (((10, 10, 10, 10), (-1, 0, 0, 0)), ((10, 10, 10, 10), (0, 0, 0, 0))),
+        (((10, 10, 10, 10), (0, 0, 0, 1000)), ((10, 10, 10, 10), (0, 0, 0, 100))),
+    ]
+)
+def test_pulse_array_range(pulse, clamped):
+    valid = ((10, 10, 10, 10), (0, 0, 0, 0))
+    with pytest.raises(InvalidPulseOperation, match=str(pulse[0][0])):
+        PulseArray([valid, pulse])
+    assert PulseArray([valid, pulse], clamp=True).to_pulses() == [valid, clamped]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [((10, 10, 10), (0, 0, 0, 0))],
+        [(("a", 10, 10, 10), (0, 0, 0, 0))],
+        [((10.7, 10, 10, 10), (0, 10, 20, 30))],
+        np.array([((10, 10, 10, 10), (0, 10, 20, 30.5))]),
+        [((2 ** 70, 10, 10, 10), (0, 0, 0, 0))],
+    ]
+)
+def test_pulse_array_invalid(data):
+    with pytest.raises(InvalidPulseOperation):
+        PulseArray(data)
+
+
+def test_dump_add_pulses_pulse_array():
+    pulses = [((10, 10, 10, 10), (i % 101, 0, 0, 0)) for i in range(200)]
+    pulse_array = PulseArray(pulses)
+    assert dump_add_pulses(Channel.A, PulseArray(pulses[:86])) == dump_add_pulses(Channel.A, *pulses[:86])
+    with pytest.raises(PulseDataTooLong):
+        dump_add_pulses(Channel.A, pulse_array)
+    assert dump_add_pulses_chunks(Channel.B, pulse_array, max_length=89) == \
+           dump_add_pulses_chunks(Channel.B, *pulses, max_length=89)
+
+
+def test_pulse_cache_pulse_array():
+    pulses = [((10, 10, 10, 10), (i, 0, 0, 0)) for i in range(20)]
+    cache = PulseCache()
+    prepared = cache.prepare(PulseArray(pulses))
+    assert cache.prepare(PulseArray(pulses)) is prepared
+    # 以元组传入相同的内容时命中同一个缓存
+    assert cache.prepare(*pulses) is prepared
+    assert prepared.message(Channel.A) == dump_add_pulses(Channel.A, *pulses)
+    assert cache.stats.hits == 2
+    assert len(cache) == 1
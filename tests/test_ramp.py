@@ -0,0 +1,58 @@
+import pytest
+
+from pydglab_ws.client import StrengthRamp, StrengthRampEngine, ChannelStateTracker
+from pydglab_ws.enums import RampCurve, Channel
+from pydglab_ws.exceptions import StrengthUnknown
+from pydglab_ws.models import StrengthData
+
+
+@pytest.mark.parametrize(
+    "curve,expected",
+    [
+        (RampCurve.LINEAR, [0, 25, 50, 75, 100]),
+        (RampCurve.EXPONENTIAL, [0, 3, 12, 36, 100]),
+    ]
+)
+def test_strength_ramp(curve: RampCurve, expected):
+    ramp = StrengthRamp(0, 100, 2, curve, start_time=10)
+    assert [ramp.value(10 + i * 0.5) for i in range(5)] == expected
+    assert ramp.value(9) == 0
+    assert not ramp.finished(11.9)
+    assert ramp.finished(12)
+    assert ramp.value(20) == 100
+
+
+def test_strength_ramp_decrease():
+    ramp = StrengthRamp(80, 20, 1, start_time=0)
+    assert ramp.value(0.5) == 50
+    assert ramp.value(1) == 20
+    assert StrengthRamp(80, 20, 0, start_time=0).value(0) == 20
+
+
+class FailingClient:
+    """发送强度操作时总是失败的终端"""
+    client_id = None
+
+    def __init__(self):
+        self.channel_state = ChannelStateTracker()
+
+    def batch(self):
+        raise ConnectionError
+
+
+@pytest.mark.asyncio
+async def test_strength_ramp_engine_failure():
+    client = FailingClient()
+    engine = StrengthRampEngine(client)  # type: ignore
+    with pytest.raises(StrengthUnknown):
+        engine.start(Channel.A, 10, 1)
+    assert not engine.running
+
+    client.channel_state.update(StrengthData(a=0, b=0, a_limit=200, b_limit=200))
+    waited = engine.start(Channel.A, 10, 1)
+    # 以 wait=False 开始的渐变，失败后没有调用方取出异常，不应由事件循环报告
+    unwaited = engine.start(Channel.B, 10, 1)
+    with pytest.raises(ConnectionError):
+        await waited
+    assert unwaited.done() and not unwaited._log_traceback
+    assert not engine.running
@@ -0,0 +1,257 @@
+import asyncio
+from typing import List, Tuple, Optional
+from uuid import uuid4
+
+import pytest
+from websockets import ConnectionClosed, ConnectionClosedError
+from websockets.client import connect
+
+from pydglab_ws.enums import MessageType, RetCode, Channel, StrengthOperationType
+from pydglab_ws.models import WebSocketMessage
+from pydglab_ws.server import DGLabWSServer, SlowConsumerPolicy
+from pydglab_ws.server.slow_consumer import _SlowConsumerGuard
+from pydglab_ws.utils import dump_strength_operation, dump_clear_pulses, dump_add_pulses
+from tests.app_simulator import DGLabAppSimulator
+
+SLOW_CONSUMER_HOST = "127.0.0.1"
+SLOW_CONSUMER_PORT = 5681
+CLIENT_ID = uuid4()
+TARGET_ID = uuid4()
+WRITE_LIMIT = 2 ** 16
+
+
+class FakeTransport:
+    def __init__(self):
+        self.buffer = 0
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffer
+
+    @staticmethod
+    def get_write_buffer_limits() -> Tuple[int, int]:
+        return WRITE_LIMIT // 4, WRITE_LIMIT
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.sent: List[str] = []
+        self.blocked: Optional[asyncio.Event] = None
+
+    async def send(self, data: str):
+        self.sent.append(data)
+        if self.blocked is not None:
+            await self.blocked.wait()
+
+
+def msg(text: str) -> WebSocketMessage:
+    return WebSocketMessage(type=MessageType.MSG, client_id=CLIENT_ID, target_id=TARGET_ID, message=text)
+
+
+STRENGTH = dump_strength_operation(Channel.A, StrengthOperationType.SET_TO, 10)
+INCREASE_A = dump_strength_operation(Channel.A, StrengthOperationType.INCREASE, 10)
+DECREASE_B = dump_strength_operation(Channel.B, StrengthOperationType.DECREASE, 5)
+PULSE_A = dump_add_pulses(Channel.A, ((10, 10, 10, 10), (0, 10, 20, 30)))
+PULSE_B = dump_add_pulses(Channel.B, ((10, 10, 10, 10), (0, 10, 20, 30)))
+CLEAR_A = dump_clear_pulses(Channel.A)
+
+
+def make_guard(**kwargs) -> Tuple[_SlowConsumerGuard, FakeWebSocket, List]:
+    evicted = []
+
+    async def evict(uuid, websocket):
+        evicted.append((uuid, websocket))
+
+    guard = _SlowConsumerGuard(SlowConsumerPolicy(**kwargs), evict)
+    websocket = FakeWebSocket()
+    guard.register(TARGET_ID, websocket)  # type: ignore
+    return guard, websocket, evicted
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_strength_only():
+    guard, websocket, evicted = make_guard(degrade_after=0, evict_after=60)
+    await guard.send(websocket, msg(PULSE_A), PULSE_A)  # type: ignore
+    assert websocket.sent == [PULSE_A]
+    assert not guard.degraded(websocket)  # type: ignore
+
+    websocket.transport.buffer = 2 ** 15
+    for text in PULSE_A, STRENGTH, "feedback-0":
+        await guard.send(websocket, msg(text), text)  # type: ignore
+    heartbeat = WebSocketMessage(type=MessageType.HEARTBEAT, client_id=TARGET_ID, message=RetCode.SUCCESS)
+    await guard.send(websocket, heartbeat, "heartbeat")  # type: ignore
+    assert guard.degraded(websocket)  # type: ignore
+    assert websocket.sent == [PULSE_A, STRENGTH, "heartbeat"]
+    assert (guard.stats.degraded, guard.stats.dropped) == (1, 2)
+
+    # 缓冲区回落到恢复阈值以下后恢复
+    websocket.transport.buffer = 2 ** 13
+    await guard.send(websocket, msg(PULSE_B), PULSE_B)  # type: ignore
+    assert guard.degraded(websocket)  # type: ignore
+    websocket.transport.buffer = 0
+    await guard.send(websocket, msg(PULSE_B), PULSE_B)  # type: ignore
+    assert not guard.degraded(websocket)  # type: ignore
+    assert websocket.sent[-1] == PULSE_B
+    assert guard.stats.recovered == 1
+    assert not evicted
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_latest_only():
+    guard, websocket, evicted = make_guard(degrade_after=0, evict_after=60, degrade_mode="latest_only")
+    websocket.transport.buffer = 2 ** 15
+    for text in PULSE_A, STRENGTH, CLEAR_A, PULSE_B, PULSE_A + "x", STRENGTH + "x":
+        await guard.send(websocket, msg(text), text)  # type: ignore
+    assert websocket.sent == []
+    assert guard.stats.coalesced == 1
+
+    # 缓冲区排空后，按最后更新的顺序发送，每个通道的波形操作只保留最新的一条，强度操作不合并
+    websocket.transport.buffer = 0
+    await guard.send(websocket, msg(CLEAR_A), CLEAR_A)  # type: ignore
+    assert websocket.sent == [STRENGTH, PULSE_B, PULSE_A + "x", STRENGTH + "x", CLEAR_A]
+    assert guard.stats.coalesced == 2
+
+    # 没有新消息时由定期检查发送暂存的消息
+    websocket.sent.clear()
+    websocket.transport.buffer = 2 ** 15
+    await guard.send(websocket, msg(PULSE_B), PULSE_B)  # type: ignore
+    assert websocket.sent == []
+    websocket.transport.buffer = 0
+    guard.policy.check_interval = 0.01
+    task = asyncio.create_task(guard.monitor())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    assert websocket.sent == [PULSE_B]
+    assert not evicted
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_latest_only_strength():
+    guard, websocket, evicted = make_guard(degrade_after=0, evict_after=60, degrade_mode="latest_only")
+    websocket.transport.buffer = 2 ** 15
+    texts = [INCREASE_A, DECREASE_B, INCREASE_A, "feedback-0", "feedback-0", DECREASE_B]
+    for text in texts:
+        await guard.send(websocket, msg(text), text)  # type: ignore
+    assert websocket.sent == []
+
+    # 不同通道的强度操作、相同的相对操作和反馈都不会合并
+    websocket.transport.buffer = 0
+    guard.policy.check_interval = 0.01
+    task = asyncio.create_task(guard.monitor())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    assert websocket.sent == texts
+    assert guard.stats.coalesced == 0
+    assert not evicted
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_write_limit():
+    guard, websocket, evicted = make_guard(degrade_after=60, evict_after=60)
+    websocket.transport.buffer = WRITE_LIMIT
+    # 未降级时，写缓冲区达到上限也按顺序发送所有波形数据，不进行合并
+    texts = [PULSE_A, PULSE_B, PULSE_A + "x", STRENGTH, PULSE_A + "y"]
+    for text in texts:
+        await guard.send(websocket, msg(text), text)  # type: ignore
+    assert websocket.sent == texts
+    assert not guard.degraded(websocket)  # type: ignore
+    assert guard.stats.coalesced == 0
+    assert not evicted
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_evict():
+    guard, websocket, evicted = make_guard(degrade_after=0, evict_after=0.05, send_timeout=0.05)
+    websocket.transport.buffer = 2 ** 15
+    await guard.send(websocket, msg(STRENGTH), STRENGTH)  # type: ignore
+    await asyncio.sleep(0.06)
+    await guard.send(websocket, msg(STRENGTH), STRENGTH)  # type: ignore
+    await asyncio.sleep(0)
+    assert evicted == [(TARGET_ID, websocket)]
+    assert guard.stats.evicted == 1
+    # 已断开的连接不再发送
+    await guard.send(websocket, msg(STRENGTH), STRENGTH)  # type: ignore
+    assert len(websocket.sent) == 1
+
+    # 发送等待超时
+    guard, websocket, evicted = make_guard(degrade_after=60, evict_after=60, send_timeout=0.05)
+    websocket.transport.buffer = 2 ** 15
+    websocket.blocked = asyncio.Event()
+    await guard.send(websocket, msg(STRENGTH), STRENGTH)  # type: ignore
+    await asyncio.sleep(0)
+    assert guard.stats.send_timeouts == 1
+    assert evicted == [(TARGET_ID, websocket)]
+
+
+class CongestedTransport:
+    """包装真实的传输层，报告已拥塞的写缓冲区"""
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def __getattr__(self, item):
+        return getattr(self._transport, item)
+
+    @staticmethod
+    def get_write_buffer_size() -> int:
+        return 2 ** 15
+
+
+@pytest.mark.asyncio
+async def test_server_evicts_slow_consumer():
+    policy = SlowConsumerPolicy(degrade_after=0, evict_after=0.1, check_interval=0.02)
+    async with DGLabWSServer(SLOW_CONSUMER_HOST, SLOW_CONSUMER_PORT, slow_consumer_policy=policy) as server:
+        client = server.new_local_client()
+        async with connect(f"ws://{SLOW_CONSUMER_HOST}:{SLOW_CONSUMER_PORT}") as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            await app.bind(client.client_id)
+            await client.bind()
+
+            server_ws = server.uuid_to_ws_view[app.target_id]
+            server_ws.transport = CongestedTransport(server_ws.transport)
+            await asyncio.sleep(0.05)
+            assert server.is_degraded(app.target_id)
+            await client.add_pulses(Channel.A, ((10, 10, 10, 10), (0, 10, 20, 30)))
+
+            messages = []
+            with pytest.raises(ConnectionClosedError) as exc_info:
+                while True:
+                    messages.append(await app._recv())
+            assert exc_info.value.rcvd.code == 1008
+            # 降级后波形数据被丢弃，断开前收到 break 消息
+            messages = [m for m in messages if m.type != MessageType.BIND]
+            assert [m.type for m in messages] == [MessageType.BREAK]
+            assert messages[0].client_id == client.client_id
+            assert messages[0].target_id == app.target_id
+
+        assert await client.recv_data() == RetCode.CLIENT_DISCONNECTED
+        assert server.slow_consumer_stats.evicted == 1
+        assert server.slow_consumer_stats.dropped >= 1
+        assert app.target_id not in server.uuid_to_ws_view
+
+
+@pytest.mark.asyncio
+async def test_server_send_to_closed_connection():
+    policy = SlowConsumerPolicy(degrade_after=60, evict_after=60)
+    async with DGLabWSServer(SLOW_CONSUMER_HOST, SLOW_CONSUMER_PORT, slow_consumer_policy=policy) as server:
+        async with connect(f"ws://{SLOW_CONSUMER_HOST}:{SLOW_CONSUMER_PORT}") as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            server_ws = server.uuid_to_ws_view[app.target_id]
+        await asyncio.sleep(0.05)
+        # 已断开的连接不影响向其他目标发送
+        client = server.new_local_client()
+        message = WebSocketMessage(type=MessageType.MSG, client_id=client.client_id, message=STRENGTH)
+        await server._send(message, server_ws, to_local_client=True)
+        assert (await asyncio.wait_for(client._recv(), 1)).message == STRENGTH
+
+    # 未设置慢消费者策略时，与之前相同，向已断开的连接发送会抛出异常
+    async with DGLabWSServer(SLOW_CONSUMER_HOST, SLOW_CONSUMER_PORT) as server:
+        async with connect(f"ws://{SLOW_CONSUMER_HOST}:{SLOW_CONSUMER_PORT}") as websocket:
+            app = DGLabAppSimulator(websocket)
+            await app.register()
+            server_ws = server.uuid_to_ws_view[app.target_id]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ConnectionClosed):
+            await server._send(message, server_ws)
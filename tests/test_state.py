@@ -0,0 +1,120 @@
+from typing import List, Tuple
+
+import pytest
+
+from pydglab_ws.client import ChannelStateTracker
+from pydglab_ws.enums import Channel, StrengthOperationType
+from pydglab_ws.models import StrengthData
+
+SET_TO = StrengthOperationType.SET_TO
+INCREASE = StrengthOperationType.INCREASE
+DECREASE = StrengthOperationType.DECREASE
+
+
+class Recorder:
+    def __init__(self):
+        self.sent: List[Tuple[Channel, StrengthOperationType, int]] = []
+
+    async def __call__(self, channel: Channel, operation_type: StrengthOperationType, value: int):
+        self.sent.append((channel, operation_type, value))
+
+
+@pytest.mark.asyncio
+async def test_channel_state_tracker_disabled():
+    tracker = ChannelStateTracker()
+    recorder = Recorder()
+    tracker.update(StrengthData(a=10, b=0, a_limit=100, b_limit=100))
+    await tracker.submit(Channel.A, SET_TO, 10, recorder)
+    await tracker.submit(Channel.B, DECREASE, 5, recorder)
+    assert recorder.sent == [(Channel.A, SET_TO, 10), (Channel.B, DECREASE, 5)]
+    assert tracker.stats.sent == 2
+    assert tracker.stats.avoided == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "operation,sent",
+    [
+        ((SET_TO, 10), False),
+        ((SET_TO, 11), True),
+        ((SET_TO, 150), True),
+        ((INCREASE, 0), False),
+        ((INCREASE, 1), True),
+        ((DECREASE, 10), True),
+    ]
+)
+async def test_channel_state_tracker_suppress(operation, sent: bool):
+    tracker = ChannelStateTracker(enabled=True)
+    recorder = Recorder()
+    tracker.update(StrengthData(a=10, b=0, a_limit=100, b_limit=0))
+    await tracker.submit(Channel.A, *operation, recorder)
+    assert bool(recorder.sent) is sent
+    assert tracker.stats.suppressed == (0 if sent else 1)
+
+
+@pytest.mark.asyncio
+async def test_channel_state_tracker_limits():
+    tracker = ChannelStateTracker(enabled=True)
+    recorder = Recorder()
+    tracker.update(StrengthData(a=100, b=0, a_limit=100, b_limit=50))
+    await tracker.submit(Channel.A, INCREASE, 5, recorder)
+    await tracker.submit(Channel.A, SET_TO, 150, recorder)
+    await tracker.submit(Channel.B, DECREASE, 1, recorder)
+    assert not recorder.sent
+    await tracker.submit(Channel.B, SET_TO, 60, recorder)
+    await tracker.submit(Channel.B, SET_TO, 50, recorder)
+    assert recorder.sent == [(Channel.B, SET_TO, 60)]
+    assert tracker.expected(Channel.B) == 50
+    assert tracker.stats.suppressed == 4
+
+
+@pytest.mark.asyncio
+async def test_channel_state_tracker_merge():
+    tracker = ChannelStateTracker(enabled=True)
+    sent = []
+    blocked = []
+
+    async def slow_sender(channel: Channel, operation_type: StrengthOperationType, value: int):
+        sent.append((channel, operation_type, value))
+        # 第一个操作发送时，提交后续的操作
+        if not blocked:
+            blocked.append(True)
+            await tracker.submit(Channel.A, INCREASE, 3, slow_sender)
+            await tracker.submit(Channel.A, INCREASE, 4, slow_sender)
+            await tracker.submit(Channel.A, DECREASE, 1, slow_sender)
+            await tracker.submit(Channel.A, SET_TO, 20, slow_sender)
+            await tracker.submit(Channel.A, INCREASE, 5, slow_sender)
+
+    await tracker.submit(Channel.A, SET_TO, 10, slow_sender)
+    assert sent == [(Channel.A, SET_TO, 10), (Channel.A, SET_TO, 25)]
+    assert tracker.stats.requested == 6
+    assert tracker.stats.sent == 2
+    assert tracker.stats.merged == 4
+    assert tracker.expected(Channel.A) == 25
+
+    tracker.update(StrengthData(a=25, b=0, a_limit=200, b_limit=200))
+    tracker.reset()
+    assert tracker.expected(Channel.A) is None
+
+
+@pytest.mark.asyncio
+async def test_channel_state_tracker_send_failure():
+    tracker = ChannelStateTracker(enabled=True)
+    recorder = Recorder()
+
+    async def failing_sender(channel: Channel, operation_type: StrengthOperationType, value: int):
+        # 发送时有另一个操作进入待发送队列，随后发送失败
+        await tracker.submit(Channel.A, INCREASE, 3, failing_sender)
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        await tracker.submit(Channel.A, SET_TO, 10, failing_sender)
+    # 发送失败的操作与排队的操作都保留下来，并已合并
+    assert list(tracker.get(Channel.A).pending) == [(SET_TO, 13)]
+    assert tracker.expected(Channel.A) == 13
+    assert tracker.stats.sent == 0
+
+    await tracker.submit(Channel.A, INCREASE, 2, recorder)
+    assert recorder.sent == [(Channel.A, SET_TO, 15)]
+    assert not tracker.get(Channel.A).pending
+    assert tracker.expected(Channel.A) == 15
@@ -0,0 +1,38 @@
+from itertools import islice
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from pydglab_ws.pulse import PulseArray  # noqa: E402
+from pydglab_ws.pulse.synth import synthesize, sine, triangle, square, sweep, burst, noise  # noqa: E402
+
+
+def test_synthesize():
+    pulses = list(synthesize(50, 100, duration=1))
+    assert pulses == [((100, 100, 100, 100), (50, 50, 50, 50))] * 10
+    # 超出范围的值会被截断
+    assert list(synthesize(200, 1000, duration=0.1)) == [((240, 240, 240, 240), (100, 100, 100, 100))]
+    # 不同的块大小结果相同
+    assert list(synthesize(sine(0.7), sweep(10, 240, 3), 5, 3)) == list(synthesize(sine(0.7), sweep(10, 240, 3), 5))
+    # 不限持续时间时为无限长的迭代器
+    assert len(list(islice(synthesize(sine(1)), 1000))) == 1000
+    PulseArray(list(synthesize(noise(), noise(10, 240), duration=10)))
+
+
+def test_envelopes():
+    assert list(synthesize(sine(0.2), duration=0.2)) == [
+        ((10, 10, 10, 10), (0, 15, 50, 85)), ((10, 10, 10, 10), (100, 85, 50, 15))
+    ]
+    assert list(synthesize(triangle(0.2), duration=0.2)) == [
+        ((10, 10, 10, 10), (0, 25, 50, 75)), ((10, 10, 10, 10), (100, 75, 50, 25))
+    ]
+    assert list(synthesize(square(0.1, 10, 90, 0.25), duration=0.1)) == [((10, 10, 10, 10), (90, 10, 10, 10))]
+    assert list(synthesize(burst(0.05, 0.15), duration=0.2)) == [
+        ((10, 10, 10, 10), (100, 100, 0, 0)), ((10, 10, 10, 10), (0, 0, 0, 0))
+    ]
+    assert list(synthesize(0, sweep(10, 240, 0.175), duration=0.2)) == [
+        ((10, 43, 76, 109), (0, 0, 0, 0)), ((141, 174, 207, 240), (0, 0, 0, 0))
+    ]
+    assert list(synthesize(0, sweep(10, 160, 0.05, log=True), duration=0.1)) == [((10, 40, 160, 160), (0, 0, 0, 0))]
+    assert list(synthesize(noise(seed=1), duration=1)) == list(synthesize(noise(seed=1), duration=1))
@@ -0,0 +1,68 @@
+import pytest
+
+from pydglab_ws import Channel
+from pydglab_ws.pulse import PreparedPulses
+from pydglab_ws.pulse.transform import strength_table, frequency_table, scale_strength, remap_frequency
+
+PULSES = [((10, 20, 30, 240), (0, 25, 50, 100)), ((100, 100, 100, 100), (1, 3, 5, 7))]
+
+
+def test_tables():
+    assert strength_table(0.5)[:8] == bytes([0, 0, 1, 2, 2, 2, 3, 4])
+    assert strength_table(2, 10)[50] == 100
+    assert strength_table(1, -10, 5, 60)[0] == 5
+    assert strength_table(1, 0, 5, 60)[100] == 60
+    assert frequency_table()[10:241] == bytes(range(10, 241))
+    table = frequency_table(50, 100)
+    assert (table[10], table[125], table[240]) == (50, 75, 100)
+
+
+def test_scale_prepared():
+    prepared = PreparedPulses(*PULSES)
+    scaled = scale_strength(prepared, 0.5, 10, high=50)
+    assert isinstance(scaled, PreparedPulses)
+    expected = PreparedPulses(((10, 20, 30, 240), (10, 22, 35, 50)), ((100, 100, 100, 100), (10, 12, 12, 14)))
+    assert scaled.hex == expected.hex
+    assert scaled.message(Channel.B) == expected.message(Channel.B)
+    remapped = remap_frequency(prepared, 10, 125)
+    assert remapped.hex == PreparedPulses(((10, 15, 20, 125), (0, 25, 50, 100)), ((55, 55, 55, 55), (1, 3, 5, 7))).hex
+    assert scale_strength(PreparedPulses(), 2).hex == ()
+    # 原数据不变
+    assert prepared.hex == PreparedPulses(*PULSES).hex
+
+
+def test_pulse_array_transforms():
+    pytest.importorskip("numpy")
+    from pydglab_ws.pulse import PulseArray
+    from pydglab_ws.pulse.transform import mix, pan
+
+    prepared = scale_strength(PreparedPulses(*PULSES), 0.7, 3)
+    assert scale_strength(PULSES, 0.7, 3).to_hex() == list(prepared.hex)
+    assert remap_frequency(PulseArray(PULSES), 20, 30).to_pulses() == [
+        ((20, 20, 21, 30), (0, 25, 50, 100)), ((24, 24, 24, 24), (1, 3, 5, 7))
+    ]
+
+    a = [((10, 10, 10, 10), (10, 50, 90, 0))] * 2
+    b = [((200, 200, 200, 200), (20, 40, 60, 0))]
+    assert mix(a, b).to_pulses() == [
+        ((200, 10, 10, 10), (20, 50, 90, 0)), ((10, 10, 10, 10), (10, 50, 90, 0))
+    ]
+    assert mix(a, b, "sum").to_pulses()[0] == ((200, 10, 10, 10), (30, 90, 100, 0))
+    assert mix(b, a, "sum").to_pulses()[1] == ((10, 10, 10, 10), (10, 50, 90, 0))
+    assert mix(a, b, "crossfade", 0.5).to_pulses() == [
+        ((105, 105, 105, 105), (15, 45, 75, 0)), ((10, 10, 10, 10), (5, 25, 45, 0))
+    ]
+    crossfade = mix(a, [((10, 10, 10, 10), (100, 100, 100, 100))] * 2, "crossfade").to_pulses()
+    assert crossfade[0][1][0] == 10 and crossfade[-1][1][-1] == 100
+    with pytest.raises(ValueError):
+        mix(a, b, "min")
+
+    channel_a, channel_b = pan(PULSES, 0.25)
+    assert channel_a.to_pulses()[0] == ((10, 20, 30, 240), (0, 19, 38, 75))
+    assert channel_b.to_pulses()[0] == ((10, 20, 30, 240), (0, 6, 12, 25))
+    channel_a, channel_b = pan(PULSES, lambda t: t * 10)
+    assert channel_a.to_pulses()[0][1] == (0, 19, 25, 25)
+    assert channel_b.to_pulses()[1][1] == (1, 3, 5, 7)
+    channel_a, channel_b = pan(PULSES, 0.5, constant_power=True)
+    assert channel_a == channel_b
+    assert channel_a.to_pulses()[0][1] == (0, 18, 35, 71)
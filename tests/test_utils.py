@@ -1,13 +1,16 @@
+import json
 from uuid import uuid4
 
 import pytest
 
-from pydglab_ws.enums import FeedbackButton, Channel, StrengthOperationType
-from pydglab_ws.exceptions import InvalidStrengthData, InvalidFeedbackData
-from pydglab_ws.models import StrengthData
+from pydglab_ws.enums import FeedbackButton, Channel, StrengthOperationType, MessageType, RetCode, \
+    MessageDataHead
+from pydglab_ws.exceptions import InvalidStrengthData, InvalidFeedbackData, PulseDataTooLong
+from pydglab_ws.models import StrengthData, StrengthRecord, WebSocketMessage, WS_MESSAGE_MAX_LENGTH
 from pydglab_ws.typing import PulseOperation
-from pydglab_ws.utils import parse_strength_data, parse_feedback_data, dump_strength_operation, dump_clear_pulses, \
-    dump_pulse_operation, dump_add_pulses, dg_lab_client_qrcode
+from pydglab_ws.utils import parse_strength_data, parse_strength_record, parse_feedback_data, dump_strength_operation, dump_clear_pulses, \
+    dump_pulse_operation, dump_add_pulses, dg_lab_client_qrcode, pulse_data_max_length, dump_add_pulses_chunks, \
+    dump_message_prefix, dump_message, PULSE_DATA_MAX_LENGTH, PULSE_DATA_APP_MAX_LENGTH
 
 
 @pytest.mark.parametrize(
@@ -30,6 +33,22 @@ def test_parse_strength_data(data: str, expected):
         assert ret == expected
 
 
+def test_parse_strength_record():
+    assert isinstance(parse_strength_data("strength-10+20+100+200"), StrengthData)
+    record = parse_strength_record("strength-10+20+100+200")
+    assert isinstance(record, StrengthRecord)
+    assert record == StrengthRecord(10, 20, 100, 200)
+    assert parse_strength_record("strength-10+20+100+200") is record
+    assert hash(record) == hash(StrengthRecord(10, 20, 100, 200))
+    assert record.to_model() == StrengthData(a=10, b=20, a_limit=100, b_limit=200)
+    assert record.to_model().to_record() == record
+    # 模型与元组不直接比较，双向结果一致
+    assert StrengthData(a=10, b=20, a_limit=100, b_limit=200) != record
+    assert record != StrengthData(a=10, b=20, a_limit=100, b_limit=200)
+    with pytest.raises(InvalidStrengthData):
+        parse_strength_record("strength-1+2+3")
+
+
 @pytest.mark.parametrize(
     "data,expected",
     [
@@ -168,3 +187,83 @@ def test_dump_add_pulses(args, expected):
 )
 def test_dg_lab_client_qrcode(args, expected):
     assert dg_lab_client_qrcode(*args) == expected
+
+
+@pytest.mark.parametrize(
+    "client_id,target_id",
+    [
+        (uuid4(), uuid4()),
+        (uuid4(), None),
+        (None, None),
+    ]
+)
+def test_pulse_data_max_length(client_id, target_id):
+    max_length = pulse_data_max_length(client_id, target_id)
+    assert PULSE_DATA_MAX_LENGTH <= max_length <= PULSE_DATA_APP_MAX_LENGTH
+
+    def dumped_length(length: int) -> int:
+        return len(
+            WebSocketMessage(
+                type=MessageType.MSG,
+                client_id=client_id,
+                target_id=target_id,
+                message=dump_add_pulses(Channel.B, *[((10, 10, 10, 10), (100, 100, 100, 100))] * length,
+                                        max_length=length)
+            ).model_dump_json(by_alias=True, context={"separators": (",", ":")})
+        )
+
+    # 恰好填满：再多一条就会超出消息长度限制
+    assert dumped_length(max_length) <= WS_MESSAGE_MAX_LENGTH
+    assert max_length == PULSE_DATA_APP_MAX_LENGTH or dumped_length(max_length + 1) > WS_MESSAGE_MAX_LENGTH
+
+
+@pytest.mark.parametrize(
+    "length,max_length,expected_chunks",
+    [
+        (0, 86, 0),
+        (1, 86, 1),
+        (86, 86, 1),
+        (87, 86, 2),
+        (500, 89, 6),
+    ]
+)
+def test_dump_add_pulses_chunks(length: int, max_length: int, expected_chunks: int):
+    pulses = [((10, 10, 10, 10), (i % 101, 0, 0, 0)) for i in range(length)]
+    chunks = dump_add_pulses_chunks(Channel.A, *pulses, max_length=max_length)
+    assert len(chunks) == expected_chunks
+    assert [
+               pulse for chunk in chunks for pulse in json.loads(chunk.split(":", 1)[1])
+           ] == [dump_pulse_operation(pulse) for pulse in pulses]
+    with pytest.raises(PulseDataTooLong):
+        dump_add_pulses(Channel.A, *pulses, max_length=length - 1)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "strength-1+2+10",
+        dump_add_pulses(Channel.A, ((10, 10, 10, 10), (0, 10, 20, 30))),
+        "clear-1",
+        "中文 \"\\/\n\t\x01\x7f",
+        "",
+        "200",
+        RetCode.SUCCESS,
+        MessageDataHead.DG_LAB,
+    ]
+)
+@pytest.mark.parametrize(
+    "msg_type,client_id,target_id",
+    [
+        (MessageType.MSG, uuid4(), uuid4()),
+        (MessageType.BIND, uuid4(), None),
+        (MessageType.HEARTBEAT, None, None),
+    ]
+)
+def test_dump_message(message, msg_type, client_id, target_id):
+    expected = WebSocketMessage(
+        type=msg_type,
+        client_id=client_id,
+        target_id=target_id,
+        message=message
+    ).model_dump_json(by_alias=True, context={"separators": (",", ":")})
+    assert dump_message(dump_message_prefix(msg_type, client_id, target_id), message) == expected
@@ -0,0 +1,85 @@
+import math
+from itertools import islice
+
+import pytest
+
+from pydglab_ws.pulse.waveform import Waveform
+
+PULSES = [((10, 10, 10, 10), (i, i, i, i)) for i in range(100)]
+
+
+def strengths(waveform, count=None):
+    return [pulse[1][0] for pulse in (islice(waveform, count) if count else waveform)]
+
+
+def test_waveform_source():
+    waveform = Waveform.of(PULSES[:7])
+    assert list(waveform) == PULSES[:7]
+    assert len(waveform) == 7
+    assert waveform.duration == pytest.approx(0.7)
+    assert [len(chunk) for chunk in (waveform * 50).chunks()] == [100, 100, 100, 50]
+    assert [len(chunk) for chunk in (waveform * 2).chunks(5)] == [5, 5, 4]
+    # 只能通过 of / generate 和组合方法创建
+    with pytest.raises(TypeError):
+        Waveform()  # type: ignore
+
+
+def test_waveform_concat_repeat():
+    a, b = Waveform.of(PULSES[:7]), Waveform.of(PULSES[7:12])
+    assert strengths(a + b) == list(range(12))
+    assert len(a + b) == 12
+    assert strengths(2 * a) == list(range(7)) * 2
+    assert len(a * 3) == 21
+    forever = a.repeat()
+    assert forever.infinite
+    assert forever.length is None
+    with pytest.raises(TypeError):
+        len(forever)
+    assert strengths(forever, 16) == (list(range(7)) * 3)[:16]
+    assert (forever + b).infinite
+    assert len(Waveform.of([]).repeat()) == 0
+    assert list(Waveform.of([]).repeat()) == []
+
+
+def test_waveform_slice():
+    a = Waveform.of(PULSES[:7])
+    assert strengths((a * 3)[5:17]) == (list(range(7)) * 3)[5:17]
+    assert len((a * 3)[5:17]) == 12
+    assert len((a * 3)[5:100]) == 16
+    assert strengths(a.repeat()[12:20]) == (list(range(7)) * 3)[12:20]
+    assert len(a.repeat()[12:20]) == 8
+    assert a.repeat()[12:].infinite
+    assert strengths(a.slice(0.2, 0.5)) == [2, 3, 4]
+    with pytest.raises(ValueError):
+        a[-1:]
+    with pytest.raises(TypeError):
+        a[::2]
+
+
+def test_waveform_generate():
+    generated = Waveform.generate(lambda: iter(PULSES[:3]))
+    assert generated.length is None
+    assert strengths(generated * 3) == [0, 1, 2] * 3
+    assert strengths((generated * 3)[4:8]) == [1, 2, 0, 1]
+    assert strengths((generated + Waveform.of(PULSES[:7]))[2:6]) == [2, 0, 1, 2]
+    assert list(Waveform.generate(lambda: iter(())).repeat()) == []
+    infinite = Waveform.generate(lambda: iter(lambda: PULSES[1], None), math.inf)
+    assert infinite.infinite
+    assert strengths(infinite[10:20]) == [1] * 10
+    assert len(Waveform.generate(lambda: iter(PULSES), 10)) == 10
+    assert strengths(Waveform.generate(lambda: iter(PULSES), 10)) == list(range(10))
+
+
+def test_waveform_stretch_scale():
+    a = Waveform.of(PULSES[:7])
+    assert strengths(a.stretch(2)) == [i // 2 for i in range(14)]
+    assert len(a.stretch(2)) == 14
+    assert strengths(a.stretch(0.5)) == [0, 2, 4, 6]
+    assert len(a.stretch(0.5)) == 4
+    assert strengths(a.stretch(1.5)) == [math.floor(j / 1.5) for j in range(11)]
+    assert strengths(a.stretch(2)[3:8]) == [1, 2, 2, 3, 3]
+    assert strengths(a.stretch(2).repeat()[10:20]) == ([i // 2 for i in range(14)] * 2)[10:20]
+    with pytest.raises(ValueError):
+        a.stretch(0)
+    assert strengths(Waveform.of(PULSES[40:60]).scale(2)) == [min(i * 2, 100) for i in range(40, 60)]
+    assert strengths(a.scale(0.5)) == [round(i * 0.5) for i in range(7)]